@@ -0,0 +1,177 @@
+"""
+Admission Control
+Ograničava broj istovremenih skupih operacija (upload, OCR, embedding)
+globalno i po korisniku, sa ograničenim redom čekanja
+"""
+
+import asyncio
+import time
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from .config import Config
+from .error_handler import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """Kontroler koji propušta ograničen broj skupih zahteva istovremeno"""
+
+    def __init__(self, name: str = "expensive_work",
+                 max_concurrent: int = 4,
+                 max_per_user: int = 2,
+                 max_queue: int = 20,
+                 queue_timeout: float = 30.0):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_user = max(1, max_per_user)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._condition = asyncio.Condition()
+        self._active = 0
+        self._active_per_user: Dict[str, int] = defaultdict(int)
+        self._waiting = 0
+
+        # Statistike
+        self.stats = {
+            'admitted': 0,
+            'rejected_queue_full': 0,
+            'rejected_timeout': 0,
+            'max_queue_depth': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'total_hold_time': 0.0,
+            'completed': 0
+        }
+
+    def _can_admit(self, user_id: str) -> bool:
+        """Proveri da li ima slobodnog kapaciteta za korisnika"""
+        return (
+            self._active < self.max_concurrent and
+            self._active_per_user[user_id] < self.max_per_user
+        )
+
+    def _estimate_retry_after(self) -> int:
+        """Proceni za koliko sekundi ima smisla pokušati ponovo"""
+        completed = self.stats['completed']
+        avg_hold = self.stats['total_hold_time'] / completed if completed else 1.0
+        # Koliko "talasa" posla je ispred novog zahteva
+        waves = (self._waiting + self._active) / self.max_concurrent
+        return max(1, int(round(avg_hold * max(waves, 1.0))))
+
+    async def acquire(self, user_id: str) -> float:
+        """
+        Zauzmi slot za skupu operaciju
+
+        Args:
+            user_id: Identifikator korisnika (ili klijenta)
+
+        Returns:
+            Vreme čekanja u redu (sekunde)
+
+        Raises:
+            RateLimitError: Ako je red pun ili je isteklo vreme čekanja
+        """
+        start = time.monotonic()
+
+        async with self._condition:
+            if not self._can_admit(user_id):
+                if self._waiting >= self.max_queue:
+                    self.stats['rejected_queue_full'] += 1
+                    retry_after = self._estimate_retry_after()
+                    logger.warning(f"[{self.name}] Red čekanja je pun ({self._waiting}), odbijen zahtev za {user_id}")
+                    raise RateLimitError(
+                        "Server je trenutno preopterećen, pokušajte ponovo kasnije",
+                        retry_after=retry_after,
+                        error_code="ADMISSION_QUEUE_FULL"
+                    )
+
+                self._waiting += 1
+                self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._waiting)
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: self._can_admit(user_id)),
+                        timeout=self.queue_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.stats['rejected_timeout'] += 1
+                    retry_after = self._estimate_retry_after()
+                    logger.warning(f"[{self.name}] Isteklo čekanje u redu za {user_id}")
+                    raise RateLimitError(
+                        "Isteklo je vreme čekanja na obradu, pokušajte ponovo kasnije",
+                        retry_after=retry_after,
+                        error_code="ADMISSION_QUEUE_TIMEOUT"
+                    )
+                finally:
+                    self._waiting -= 1
+
+            self._active += 1
+            self._active_per_user[user_id] += 1
+
+            wait_time = time.monotonic() - start
+            self.stats['admitted'] += 1
+            self.stats['total_wait_time'] += wait_time
+            self.stats['max_wait_time'] = max(self.stats['max_wait_time'], wait_time)
+            return wait_time
+
+    async def release(self, user_id: str, hold_time: float = 0.0):
+        """Oslobodi slot i probudi zahteve koji čekaju"""
+        async with self._condition:
+            self._active = max(0, self._active - 1)
+            self._active_per_user[user_id] -= 1
+            if self._active_per_user[user_id] <= 0:
+                del self._active_per_user[user_id]
+
+            self.stats['completed'] += 1
+            self.stats['total_hold_time'] += hold_time
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, user_id: Optional[str] = None):
+        """
+        Context manager za izvršavanje skupe operacije
+
+        Primer:
+            async with admission_controller.slot(user_id):
+                ...
+        """
+        user_id = user_id or "anonymous"
+        await self.acquire(user_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            await self.release(user_id, time.monotonic() - start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Dohvati metrike admission kontrolera"""
+        admitted = self.stats['admitted']
+        completed = self.stats['completed']
+        return {
+            'name': self.name,
+            'active': self._active,
+            'queue_depth': self._waiting,
+            'active_users': len(self._active_per_user),
+            'max_concurrent': self.max_concurrent,
+            'max_per_user': self.max_per_user,
+            'max_queue': self.max_queue,
+            'queue_timeout': self.queue_timeout,
+            'admitted': admitted,
+            'rejected_queue_full': self.stats['rejected_queue_full'],
+            'rejected_timeout': self.stats['rejected_timeout'],
+            'max_queue_depth': self.stats['max_queue_depth'],
+            'avg_wait_time': self.stats['total_wait_time'] / admitted if admitted else 0.0,
+            'max_wait_time': self.stats['max_wait_time'],
+            'avg_hold_time': self.stats['total_hold_time'] / completed if completed else 0.0
+        }
+
+# Globalna instanca za upload/OCR/embedding posao
+admission_controller = AdmissionController(
+    name="expensive_work",
+    max_concurrent=Config.ADMISSION_MAX_CONCURRENT,
+    max_per_user=Config.ADMISSION_MAX_PER_USER,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT
+)
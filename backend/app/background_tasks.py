@@ -1,5 +1,6 @@
 import asyncio
 import uuid
+import contextvars
 from datetime import datetime
 from typing import Dict, Any, Callable, Optional, List
 from enum import Enum
@@ -11,6 +12,11 @@ import traceback
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Task koji se trenutno izvršava (dostupan funkciji taska za izveštavanje o napretku)
+_current_task: contextvars.ContextVar[Optional["BackgroundTask"]] = contextvars.ContextVar(
+    "current_background_task", default=None
+)
+
 class TaskStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -53,6 +59,7 @@ class BackgroundTaskManager:
         self.tasks: Dict[str, BackgroundTask] = {}
         self.task_queue: List[BackgroundTask] = []
         self.running_tasks: Dict[str, BackgroundTask] = {}
+        self._execution_tasks: set = set()  # Reference na asyncio taskove (da ih GC ne pokupi)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.is_running = False
         self._lock = asyncio.Lock()
@@ -187,7 +194,11 @@ class BackgroundTaskManager:
                 # Uzmi sledeći task iz queue-a
                 task = await self._get_next_task()
                 if task:
-                    await self._execute_task(task)
+                    # Taskovi se izvršavaju paralelno (do max_workers), da dug
+                    # posao (npr. OCR dokumenta) ne blokira ostatak reda
+                    execution = asyncio.create_task(self._execute_task(task))
+                    self._execution_tasks.add(execution)
+                    execution.add_done_callback(self._execution_tasks.discard)
                 else:
                     # Ako nema taskova, sačekaj malo
                     await asyncio.sleep(0.1)
@@ -224,7 +235,11 @@ class BackgroundTaskManager:
             # Izvrši task
             if asyncio.iscoroutinefunction(task.func):
                 # Async funkcija
-                task.result = await task.func(*task.args, **task.kwargs)
+                token = _current_task.set(task)
+                try:
+                    task.result = await task.func(*task.args, **task.kwargs)
+                finally:
+                    _current_task.reset(token)
             else:
                 # Sync funkcija - koristi executor
                 loop = asyncio.get_event_loop()
@@ -238,12 +253,17 @@ class BackgroundTaskManager:
             execution_time = (datetime.utcnow() - task.started_at).total_seconds()
             self._update_avg_execution_time(execution_time)
             
-            task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.utcnow()
-            task.progress = 100.0
-            
-            self.stats['completed_tasks'] += 1
-            logger.info(f"Task završen: {task.task_id} - {execution_time:.2f}s")
+            if task.status == TaskStatus.CANCELLED:
+                # Task je otkazan tokom izvršavanja i prekinuo je rad
+                self.stats['cancelled_tasks'] += 1
+                logger.info(f"Task otkazan tokom izvršavanja: {task.task_id}")
+            else:
+                task.status = TaskStatus.COMPLETED
+                task.progress = 100.0
+                
+                self.stats['completed_tasks'] += 1
+                logger.info(f"Task završen: {task.task_id} - {execution_time:.2f}s")
             
         except Exception as e:
             task.status = TaskStatus.FAILED
@@ -322,4 +342,26 @@ async def get_all_tasks(status_filter: Optional[TaskStatus] = None) -> List[Dict
 
 async def get_task_stats() -> Dict[str, Any]:
     """Dohvati statistike taskova"""
-    return await task_manager.get_stats() 
\ No newline at end of file
+    return await task_manager.get_stats() 
+
+def report_task_progress(progress: float, **metadata) -> bool:
+    """
+    Ažuriraj napredak taska koji se trenutno izvršava
+    
+    Poziva se iz async funkcije taska; van taska nema efekta.
+    
+    Returns:
+        True ako je task otkazan (funkcija treba da prekine rad)
+    """
+    task = _current_task.get()
+    if task is None:
+        return False
+    
+    task.progress = max(0.0, min(100.0, progress))
+    task.metadata.update(metadata)
+    return task.status == TaskStatus.CANCELLED
+
+def is_current_task_cancelled() -> bool:
+    """Da li je task koji se trenutno izvršava otkazan"""
+    task = _current_task.get()
+    return task is not None and task.status == TaskStatus.CANCELLED
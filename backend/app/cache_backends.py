@@ -0,0 +1,352 @@
+"""
+Cache Backends
+In-memory zamena za Redis (fallback tokom prekida, testovi, benchmark-ovi)
+i Redis omotač sa circuit breaker-om
+"""
+
+import asyncio
+import fnmatch
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker
+
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+    CONNECTION_ERRORS: Tuple[type, ...] = (
+        RedisConnectionError, RedisTimeoutError, ConnectionError, TimeoutError, asyncio.TimeoutError, OSError
+    )
+except ImportError:
+    CONNECTION_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError, OSError)
+
+logger = logging.getLogger(__name__)
+
+class InMemoryRedis:
+    """
+    Podskup redis.asyncio API-ja u memoriji procesa
+
+    Podržava komande koje koristi CacheManager: get/set/setex, mget,
+    delete/unlink, exists, expire/ttl, scan, publish/pubsub, pipeline,
+    info i ping. Broj ključeva je ograničen (najstariji se izbacuju).
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max(1, max_keys)
+        # key -> (value, expires_at ili None)
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._subscribers: Dict[str, List["InMemoryPubSub"]] = {}
+        self._stats = {'keyspace_hits': 0, 'keyspace_misses': 0, 'commands': 0, 'evicted_keys': 0}
+        self._started_at = time.time()
+
+    # Interni helper-i
+    def _alive(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        expires_at = item[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+            self._stats['evicted_keys'] += 1
+
+    def flush_sync(self):
+        """Obriši sve (sinhrono)"""
+        self._data.clear()
+
+    # Komande
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Any:
+        self._stats['commands'] += 1
+        if not self._alive(key):
+            self._stats['keyspace_misses'] += 1
+            return None
+        self._stats['keyspace_hits'] += 1
+        return self._data[key][0]
+
+    async def set(self, key: str, value: Any, ex: Optional[float] = None) -> bool:
+        self._stats['commands'] += 1
+        self._store(key, value, ex)
+        return True
+
+    async def setex(self, key: str, ttl: float, value: Any) -> bool:
+        self._stats['commands'] += 1
+        self._store(key, value, ttl)
+        return True
+
+    async def mget(self, keys, *args) -> List[Any]:
+        self._stats['commands'] += 1
+        keys = list(keys) if isinstance(keys, (list, tuple)) else [keys]
+        keys.extend(args)
+        return [self._data[key][0] if self._alive(key) else None for key in keys]
+
+    async def delete(self, *keys: str) -> int:
+        self._stats['commands'] += 1
+        deleted = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                deleted += 1
+        return deleted
+
+    async def unlink(self, *keys: str) -> int:
+        return await self.delete(*keys)
+
+    async def exists(self, *keys: str) -> int:
+        self._stats['commands'] += 1
+        return sum(1 for key in keys if self._alive(key))
+
+    async def expire(self, key: str, ttl: float) -> bool:
+        self._stats['commands'] += 1
+        if not self._alive(key):
+            return False
+        self._data[key] = (self._data[key][0], time.monotonic() + ttl)
+        return True
+
+    async def ttl(self, key: str) -> int:
+        self._stats['commands'] += 1
+        if not self._alive(key):
+            return -2
+        expires_at = self._data[key][1]
+        if expires_at is None:
+            return -1
+        return max(0, int(expires_at - time.monotonic()))
+
+    async def scan(self, cursor: int = 0, match: Optional[str] = None, count: Optional[int] = None) -> Tuple[int, List[str]]:
+        self._stats['commands'] += 1
+        # Cursor je pozicija u redosledu umetanja; istekli ključevi se ovde
+        # ne brišu, da se pozicije ne pomere između koraka
+        keys = list(self._data.keys())
+        count = count or 10
+        now = time.monotonic()
+        batch = []
+        position = cursor
+        while position < len(keys) and len(batch) < count:
+            key = keys[position]
+            position += 1
+            expires_at = self._data[key][1]
+            if (expires_at is None or expires_at > now) and (match is None or fnmatch.fnmatchcase(key, match)):
+                batch.append(key)
+        next_cursor = position if position < len(keys) else 0
+        return next_cursor, batch
+
+    async def keys(self, pattern: str = "*") -> List[str]:
+        self._stats['commands'] += 1
+        return [key for key in list(self._data.keys()) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    async def dbsize(self) -> int:
+        return sum(1 for key in list(self._data.keys()) if self._alive(key))
+
+    async def flushdb(self) -> bool:
+        self.flush_sync()
+        return True
+
+    async def info(self, section: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'redis_mode': 'in-memory',
+            'connected_clients': 1,
+            'used_memory_human': 'n/a',
+            'total_commands_processed': self._stats['commands'],
+            'keyspace_hits': self._stats['keyspace_hits'],
+            'keyspace_misses': self._stats['keyspace_misses'],
+            'evicted_keys': self._stats['evicted_keys'],
+            'uptime_in_seconds': int(time.time() - self._started_at),
+            'db0': {'keys': len(self._data)}
+        }
+
+    async def publish(self, channel: str, message: Any) -> int:
+        self._stats['commands'] += 1
+        subscribers = self._subscribers.get(channel, [])
+        for subscriber in subscribers:
+            subscriber._deliver(channel, message)
+        return len(subscribers)
+
+    def pubsub(self) -> "InMemoryPubSub":
+        return InMemoryPubSub(self)
+
+    def pipeline(self, transaction: bool = False) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+    async def close(self):
+        pass
+
+class InMemoryPubSub:
+    """Pub/sub u okviru jednog procesa"""
+
+    def __init__(self, backend: InMemoryRedis):
+        self._backend = backend
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._channels: List[str] = []
+
+    def _deliver(self, channel: str, message: Any):
+        self._queue.put_nowait({'type': 'message', 'channel': channel, 'data': message})
+
+    async def subscribe(self, *channels: str):
+        for channel in channels:
+            self._backend._subscribers.setdefault(channel, []).append(self)
+            self._channels.append(channel)
+            self._queue.put_nowait({'type': 'subscribe', 'channel': channel, 'data': len(self._channels)})
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + (timeout or 0.0)
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    message = await asyncio.wait_for(self._queue.get(), remaining)
+                else:
+                    message = self._queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                return None
+            if ignore_subscribe_messages and message['type'] != 'message':
+                continue
+            return message
+
+    async def close(self):
+        for channel in self._channels:
+            subscribers = self._backend._subscribers.get(channel, [])
+            if self in subscribers:
+                subscribers.remove(self)
+        self._channels = []
+
+class InMemoryPipeline:
+    """Pipeline koji komande izvršava redom pri execute()"""
+
+    def __init__(self, backend: InMemoryRedis):
+        self._backend = backend
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        getattr(self._backend, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [await getattr(self._backend, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._commands = []
+
+class ResilientRedis:
+    """
+    Redis klijent sa circuit breaker-om i lokalnim fallback-om
+
+    Dok je Redis zdrav, sve komande idu na njega. Posle niza grešaka
+    konekcije breaker se otvara i komande odmah idu na in-memory backend
+    (bez čekanja na socket timeout), dok probni poziv ne potvrdi oporavak.
+    """
+
+    def __init__(self, primary: Any, fallback: InMemoryRedis, breaker: CircuitBreaker):
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker
+
+    def using_fallback(self) -> bool:
+        """Da li komande trenutno idu na lokalni backend"""
+        return self.primary is None or self.breaker.state.value == "open"
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        if self.primary is not None and self.breaker.allow_request():
+            try:
+                result = await getattr(self.primary, name)(*args, **kwargs)
+                self.breaker.record_success()
+                return result
+            except CONNECTION_ERRORS as e:
+                self.breaker.record_failure(e)
+                logger.warning(f"Redis {name} nije uspeo, koristi se lokalni cache: {e}")
+            except Exception:
+                # Greška komande (ne konekcije) - Redis je dostupan
+                self.breaker.record_success()
+                raise
+            finally:
+                self.breaker.release_probe()
+        return await getattr(self.fallback, name)(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+        return command
+
+    def pipeline(self, transaction: bool = False) -> "ResilientPipeline":
+        return ResilientPipeline(self, transaction)
+
+    def pubsub(self):
+        # Pretplata uvek ide na pravi Redis; listener sam obnavlja vezu
+        return self.primary.pubsub() if self.primary is not None else self.fallback.pubsub()
+
+    async def close(self):
+        if self.primary is not None:
+            await self.primary.close()
+
+class ResilientPipeline:
+    """Pipeline koji se izvršava na Redis-u ili, ako nije dostupan, lokalno"""
+
+    def __init__(self, client: ResilientRedis, transaction: bool = False):
+        self._client = client
+        self._transaction = transaction
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def _run(self, backend: Any) -> List[Any]:
+        async with backend.pipeline(transaction=self._transaction) as pipe:
+            for name, args, kwargs in self._commands:
+                getattr(pipe, name)(*args, **kwargs)
+            return await pipe.execute()
+
+    async def execute(self) -> List[Any]:
+        client = self._client
+        try:
+            if client.primary is not None and client.breaker.allow_request():
+                try:
+                    result = await self._run(client.primary)
+                    client.breaker.record_success()
+                    return result
+                except CONNECTION_ERRORS as e:
+                    client.breaker.record_failure(e)
+                    logger.warning(f"Redis pipeline nije uspeo, koristi se lokalni cache: {e}")
+                except Exception:
+                    # Greška komande (ne konekcije) - Redis je dostupan
+                    client.breaker.record_success()
+                    raise
+                finally:
+                    client.breaker.release_probe()
+            return await self._run(client.fallback)
+        finally:
+            self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._commands = []
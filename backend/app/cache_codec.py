@@ -0,0 +1,156 @@
+"""
+Cache Codec
+Binarni format vrednosti u cache-u: msgpack (ili JSON) + zstd/zlib kompresija
+iznad praga veličine, sa verzijom formata u zaglavlju
+"""
+
+import json
+import zlib
+import logging
+from typing import Any, Dict, Optional, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Zaglavlje: [verzija][serializer << 4 | kompresija]. Prvi bajt nikad nije
+# validan početak JSON teksta, pa se stari JSON unosi čitaju bez zaglavlja.
+FORMAT_VERSION = 1
+
+SERIALIZER_JSON = 0
+SERIALIZER_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+_SERIALIZERS = {"json": SERIALIZER_JSON, "msgpack": SERIALIZER_MSGPACK}
+_COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+class CacheCodec:
+    """
+    Enkodiranje/dekodiranje cache vrednosti
+
+    Args:
+        serializer: "msgpack", "json" ili "auto" (msgpack ako je instaliran)
+        compression: "zstd", "zlib", "none" ili "auto" (zstd ako je instaliran)
+        threshold: Vrednosti manje od ovoliko bajtova se ne kompresuju
+    """
+
+    def __init__(self, serializer: str = "auto", compression: str = "auto", threshold: int = 1024):
+        if serializer == "auto":
+            serializer = "msgpack" if MSGPACK_AVAILABLE else "json"
+        if serializer == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack nije instaliran - cache koristi JSON")
+            serializer = "json"
+        if compression == "auto":
+            compression = "zstd" if ZSTD_AVAILABLE else "zlib"
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard nije instaliran - cache koristi zlib")
+            compression = "zlib"
+
+        self.serializer = _SERIALIZERS.get(serializer, SERIALIZER_JSON)
+        self.compression = _COMPRESSIONS.get(compression, COMPRESSION_ZLIB)
+        self.threshold = max(0, threshold)
+
+        self._zstd_compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+        # namespace -> brojači (namespace = prefiks ključa do prve ':')
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    # Serijalizacija
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == SERIALIZER_MSGPACK:
+            return msgpack.packb(value, default=str, use_bin_type=True)
+        return json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+
+    def _deserialize(self, serializer: int, payload: bytes) -> Any:
+        if serializer == SERIALIZER_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("Cache vrednost je u msgpack formatu, a msgpack nije instaliran")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return json.loads(payload)
+
+    # Kompresija
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == COMPRESSION_ZSTD:
+            return self._zstd_compressor.compress(payload)
+        return zlib.compress(payload, 6)
+
+    def _decompress(self, compression: int, payload: bytes) -> bytes:
+        if compression == COMPRESSION_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("Cache vrednost je zstd kompresovana, a zstandard nije instaliran")
+            return self._zstd_decompressor.decompress(payload)
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(payload)
+        return payload
+
+    def encode(self, value: Any, namespace: Optional[str] = None) -> bytes:
+        """Vrednost -> bajtovi za Redis"""
+        payload = self._serialize(value)
+        raw_size = len(payload)
+        compression = COMPRESSION_NONE
+
+        if self.compression != COMPRESSION_NONE and raw_size >= self.threshold:
+            compressed = self._compress(payload)
+            # Kompresija se zadržava samo ako stvarno smanjuje vrednost
+            if len(compressed) < raw_size:
+                payload = compressed
+                compression = self.compression
+
+        data = bytes((FORMAT_VERSION, (self.serializer << 4) | compression)) + payload
+        if namespace is not None:
+            self._record(namespace, raw_size, len(data), compression != COMPRESSION_NONE)
+        return data
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Bajtovi iz Redis-a -> vrednost (stari JSON unosi bez zaglavlja se i dalje čitaju)"""
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data or data[0] != FORMAT_VERSION:
+            return json.loads(data)
+
+        flags = data[1]
+        payload = self._decompress(flags & 0x0F, data[2:])
+        return self._deserialize(flags >> 4, payload)
+
+    def _record(self, namespace: str, raw_size: int, stored_size: int, compressed: bool):
+        stats = self.stats.get(namespace)
+        if stats is None:
+            stats = self.stats[namespace] = {
+                'writes': 0, 'compressed_writes': 0, 'raw_bytes': 0, 'stored_bytes': 0
+            }
+        stats['writes'] += 1
+        stats['raw_bytes'] += raw_size
+        stats['stored_bytes'] += stored_size
+        if compressed:
+            stats['compressed_writes'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ušteda po namespace-u (raw = serijalizovano pre kompresije)"""
+        namespaces = {}
+        for namespace, stats in self.stats.items():
+            saved = stats['raw_bytes'] - stats['stored_bytes']
+            namespaces[namespace] = {
+                **stats,
+                'saved_bytes': saved,
+                'ratio': round(stats['stored_bytes'] / stats['raw_bytes'], 3) if stats['raw_bytes'] else 1.0
+            }
+        return {
+            'serializer': "msgpack" if self.serializer == SERIALIZER_MSGPACK else "json",
+            'compression': {v: k for k, v in _COMPRESSIONS.items()}[self.compression],
+            'threshold': self.threshold,
+            'namespaces': namespaces
+        }
@@ -1,10 +1,22 @@
 import asyncio
 import json
 import hashlib
-from typing import Optional, Any, Dict, List
+import time
+import uuid
+from typing import Optional, Any, Dict, List, AsyncIterator, Awaitable, Callable, Tuple
 from datetime import datetime, timedelta
 import logging
 import redis.asyncio as redis
+from .config import Config
+from .semantic_cache import SemanticCacheIndex
+from .local_cache import LocalTTLCache
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .cache_backends import InMemoryRedis, ResilientRedis
+from .single_flight import SingleFlight
+from .cache_codec import CacheCodec
+from .cache_metrics import cache_telemetry
+from .persistent_cache import PersistentCacheTier
+from .database_manager import get_db_manager
 
 # Konfiguracija logging-a
 logging.basicConfig(level=logging.INFO)
@@ -14,31 +26,262 @@ class CacheManager:
     """Upravlja Redis cache-om za aplikaciju"""
     
     def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0):
-        self.redis: Optional[redis.Redis] = None
+        self.redis: Optional[ResilientRedis] = None
         self.host = host
         self.port = port
         self.db = db
+        self.backend = Config.CACHE_BACKEND
+        self.scan_count = Config.CACHE_SCAN_COUNT
+        self.batch_size = max(1, Config.CACHE_BATCH_SIZE)
+        
+        # Semantic cache (embedding upita -> Redis ključ odgovora); aktivira
+        # se kada se postavi embedding model
+        self.semantic_index = SemanticCacheIndex(
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=Config.SEMANTIC_CACHE_MAX_ENTRIES
+        )
+        
+        # L1 - in-process LRU/TTL ispred Redis-a; ostali workeri dobijaju
+        # invalidacije preko Redis pub/sub kanala
+        self.l1: Optional[LocalTTLCache] = (
+            LocalTTLCache(Config.CACHE_L1_MAX_ENTRIES, Config.CACHE_L1_TTL) if Config.CACHE_L1_ENABLED else None
+        )
+        self.instance_id = uuid.uuid4().hex
+        self.invalidation_channel = Config.CACHE_INVALIDATION_CHANNEL
+        self._listener_task: Optional[asyncio.Task] = None
+        self.tier_stats = {'redis': {'hits': 0, 'misses': 0}}
+        
+        # Spajanje istovremenih identičnih promašaja i stale-while-revalidate
+        self.flights = SingleFlight()
+        self.single_flight_enabled = Config.CACHE_SINGLE_FLIGHT_ENABLED
+        self.stale_ttl = max(0, Config.CACHE_STALE_WHILE_REVALIDATE)
+        
+        # Binarni format vrednosti (msgpack + kompresija velikih vrednosti)
+        self.codec = CacheCodec(
+            serializer=Config.CACHE_SERIALIZER,
+            compression=Config.CACHE_COMPRESSION,
+            threshold=Config.CACHE_COMPRESSION_THRESHOLD
+        )
+        self.telemetry = cache_telemetry
+        
+        # L2 - SQLite ispod Redis-a za skupe artefakte (preživljava restart)
+        self.l2: Optional[PersistentCacheTier] = None
+        if Config.CACHE_L2_ENABLED:
+            try:
+                self.l2 = PersistentCacheTier(
+                    get_db_manager(),
+                    namespaces=[ns.strip() for ns in Config.CACHE_L2_NAMESPACES.split(",") if ns.strip()],
+                    max_bytes=Config.CACHE_L2_MAX_BYTES,
+                    flush_interval=Config.CACHE_L2_FLUSH_INTERVAL,
+                    batch_size=Config.CACHE_L2_BATCH_SIZE,
+                    sweep_interval=Config.CACHE_L2_SWEEP_INTERVAL
+                )
+            except Exception as e:
+                logger.error(f"Greška pri inicijalizaciji L2 cache-a: {e}")
         self._connect()
     
     def _connect(self):
-        """Poveži se sa Redis-om"""
+        """
+        Poveži se sa Redis-om
+        
+        Klijent je omotan circuit breaker-om: kada Redis ne odgovara, komande
+        odmah idu na lokalni in-memory backend umesto da čekaju timeout.
+        Sa CACHE_BACKEND=memory Redis se ne koristi uopšte.
+        """
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=Config.CACHE_BREAKER_FAILURES,
+            recovery_timeout=Config.CACHE_BREAKER_RECOVERY,
+            on_state_change=self._on_breaker_state_change
+        )
+        fallback = InMemoryRedis(max_keys=Config.CACHE_FALLBACK_MAX_KEYS)
+        primary = None
+        
+        if self.backend != "memory":
+            try:
+                # Vrednosti su binarne (CacheCodec), ključevi se dekodiraju u scan_keys
+                options = dict(
+                    decode_responses=False,
+                    socket_connect_timeout=Config.CACHE_REDIS_TIMEOUT,
+                    socket_timeout=Config.CACHE_REDIS_TIMEOUT
+                )
+                if Config.REDIS_URL:
+                    primary = redis.Redis.from_url(Config.REDIS_URL, **options)
+                else:
+                    primary = redis.Redis(host=self.host, port=self.port, db=self.db, **options)
+                logger.info(f"Redis klijent kreiran ({Config.REDIS_URL or f'{self.host}:{self.port}'})")
+            except Exception as e:
+                logger.error(f"Greška pri povezivanju sa Redis-om: {e}")
+        else:
+            logger.info("Cache koristi in-memory backend (CACHE_BACKEND=memory)")
+        
+        self.redis = ResilientRedis(primary, fallback, self.breaker)
+    
+    def _on_breaker_state_change(self, old_state: CircuitState, new_state: CircuitState):
+        """Prelazak između Redis-a i lokalnog backend-a"""
+        if new_state == CircuitState.OPEN:
+            logger.warning("Redis nedostupan - cache prelazi na lokalni in-memory backend")
+        elif new_state == CircuitState.CLOSED and old_state != CircuitState.CLOSED:
+            # Podaci upisani tokom prekida nisu u Redis-u, a invalidacije
+            # drugih workera su propuštene - lokalni nivoi se prazne
+            self.redis.fallback.flush_sync()
+            if self.l1 is not None:
+                self.l1.clear()
+            logger.info("Redis ponovo dostupan - lokalni fallback i L1 ispražnjeni")
+    
+    def enable_semantic_cache(self, encoder) -> bool:
+        """
+        Aktiviraj embedding semantic cache
+        
+        Args:
+            encoder: Embedding model (npr. SentenceTransformer iz RAG servisa)
+            
+        Returns:
+            True ako je semantic cache aktivan
+        """
+        if not Config.SEMANTIC_CACHE_ENABLED or encoder is None:
+            return False
         try:
-            self.redis = redis.Redis(
-                host=self.host,
-                port=self.port,
-                db=self.db,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
-            logger.info(f"Povezan sa Redis-om na {self.host}:{self.port}")
+            self.semantic_index.attach_encoder(encoder)
+            return True
         except Exception as e:
-            logger.error(f"Greška pri povezivanju sa Redis-om: {e}")
-            self.redis = None
+            logger.error(f"Greška pri aktiviranju semantic cache-a: {e}")
+            return False
+    
+    async def start(self):
+        """Pokreni pozadinske zadatke cache-a (L1 invalidacije, L2 flush/sweep)"""
+        await self.start_invalidation_listener()
+        if self.l2 is not None:
+            await self.l2.start()
+    
+    async def stop(self):
+        """Zaustavi pozadinske zadatke i upiši bafer L2 cache-a"""
+        await self.stop_invalidation_listener()
+        if self.l2 is not None:
+            await self.l2.stop()
+    
+    # L1 invalidacija između workera
+    async def start_invalidation_listener(self):
+        """Pokreni pretplatu na invalidacije L1 cache-a (poziva se pri startup-u)"""
+        if not self.redis or not self.l1 or self._listener_task:
+            return
+        self._listener_task = asyncio.create_task(self._invalidation_listener())
+    
+    async def stop_invalidation_listener(self):
+        """Zaustavi pretplatu na invalidacije"""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+    
+    async def _invalidation_listener(self):
+        """Prima invalidacije od drugih workera i briše ključeve iz L1"""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                logger.info(f"L1 cache pretplaćen na {self.invalidation_channel}")
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get('type') == 'message':
+                        self._apply_invalidation(message.get('data'))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Tokom prekida su invalidacije mogle biti propuštene - L1 više nije pouzdan
+                logger.warning(f"Greška u L1 invalidation listener-u: {e}")
+                self.l1.clear()
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+    
+    def _apply_invalidation(self, data: Any):
+        """Primeni poruku o invalidaciji (ignoriše sopstvene poruke)"""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get('origin') == self.instance_id:
+            return
+        for key in payload.get('keys', []):
+            self.l1.delete(key)
+        if 'prefix' in payload:
+            self.l1.clear(payload['prefix'])
+    
+    def _invalidation_message(self, keys: Optional[List[str]] = None, prefix: Optional[str] = None) -> str:
+        payload: Dict[str, Any] = {'origin': self.instance_id}
+        if keys is not None:
+            payload['keys'] = keys
+        if prefix is not None:
+            payload['prefix'] = prefix
+        return json.dumps(payload)
+    
+    async def _publish_invalidation(self, keys: Optional[List[str]] = None, prefix: Optional[str] = None):
+        """Obavesti ostale workere da izbace ključeve iz L1"""
+        if not self.redis or not self.l1:
+            return
+        try:
+            await self.redis.publish(self.invalidation_channel, self._invalidation_message(keys, prefix))
+        except Exception as e:
+            logger.warning(f"Greška pri slanju L1 invalidacije: {e}")
     
     def is_available(self) -> bool:
-        """Proveri da li je Redis dostupan"""
-        return self.redis is not None
+        """Proveri da li je cache backend dostupan (Redis zdrav ili in-memory režim)"""
+        if self.redis is None:
+            return False
+        if self.backend == "memory":
+            return True
+        return self.redis.primary is not None and not self.redis.using_fallback()
+    
+    async def ping(self) -> bool:
+        """
+        Proveri konekciju sa Redis-om direktno (mimo breaker-a)
+
+        Neuspeh odmah otvara breaker - jedna greška je ispod praga, pa bi
+        inače Redis bio prijavljen kao dostupan dok ne padnu i sledeći pozivi.
+        """
+        if self.redis is None:
+            return False
+        if self.backend == "memory":
+            return True
+        if self.redis.primary is None:
+            return False
+        try:
+            await self.redis.primary.ping()
+        except Exception as e:
+            logger.warning(f"Redis ping nije uspeo: {e}")
+            self.breaker.trip(e)
+            return False
+        self.breaker.record_success()
+        return True
+    
+    def get_backend_state(self) -> Dict[str, Any]:
+        """Aktivni backend i stanje circuit breaker-a"""
+        if self.backend == "memory":
+            active = "memory"
+        else:
+            active = "memory_fallback" if self.redis is None or self.redis.using_fallback() else "redis"
+        return {
+            "configured_backend": self.backend,
+            "active_backend": active,
+            "circuit_breaker": self.breaker.get_state(),
+            "fallback_keys": len(self.redis.fallback._data) if self.redis is not None else 0
+        }
+    
+    def _active_tier(self) -> str:
+        """Nivo koji trenutno odgovara na Redis komande (za telemetriju)"""
+        return "memory" if self.redis.using_fallback() else "redis"
+    
+    @staticmethod
+    def _namespace(key: str) -> str:
+        """Namespace ključa (prefiks do prve ':')"""
+        return key.split(":", 1)[0]
     
     def _generate_key(self, prefix: str, *args) -> str:
         """Generiši cache ključ"""
@@ -55,18 +298,61 @@ class CacheManager:
         Returns:
             Podatak ili None
         """
+        start = time.perf_counter()
+        if self.l1 is not None:
+            value = self.l1.get(key)
+            if value is not None:
+                self._update_hit_stats(True)
+                self.telemetry.record_get(key, True, time.perf_counter() - start, tier="l1")
+                return value
+        
         if not self.redis:
             return None
             
         try:
             data = await self.redis.get(key)
             if data:
-                return json.loads(data)
+                value = self.codec.decode(data)
+                self.tier_stats['redis']['hits'] += 1
+                self._update_hit_stats(True)
+                self.telemetry.record_get(key, True, time.perf_counter() - start, tier=self._active_tier())
+                if self.l1 is not None:
+                    self.l1.set(key, value)
+                return value
+            self.tier_stats['redis']['misses'] += 1
+            
+            if self.l2 is not None and self.l2.handles(key):
+                value = await self._get_from_l2(key)
+                if value is not None:
+                    self._update_hit_stats(True)
+                    self.telemetry.record_get(key, True, time.perf_counter() - start, tier="sqlite")
+                    return value
+            
+            self._update_hit_stats(False)
+            self.telemetry.record_get(key, False, time.perf_counter() - start)
             return None
         except Exception as e:
             logger.error(f"Greška pri dohvatanju iz cache-a: {e}")
+            self.telemetry.record_error(key, "get")
             return None
     
+    async def _get_from_l2(self, key: str) -> Optional[Any]:
+        """Dohvati iz L2 i vrati vrednost u Redis/L1 sa preostalim TTL-om"""
+        entry = await self.l2.get(key)
+        if entry is None:
+            return None
+        data, remaining = entry
+        value = self.codec.decode(data)
+        ttl = int(remaining) if remaining else 3600
+        if ttl > 0:
+            try:
+                await self.redis.setex(key, ttl, data)
+            except Exception as e:
+                logger.warning(f"Greška pri vraćanju L2 vrednosti u Redis: {e}")
+            if self.l1 is not None:
+                self.l1.set(key, value, ttl)
+        return value
+    
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
         """
         Sačuvaj podatak u cache
@@ -82,13 +368,27 @@ class CacheManager:
         if not self.redis:
             return False
             
+        start = time.perf_counter()
         try:
-            serialized_value = json.dumps(value, default=str)
-            await self.redis.setex(key, ttl, serialized_value)
+            serialized_value = self.codec.encode(value, self._namespace(key))
+            if self.l1 is not None:
+                # Upis i invalidacija drugih workera u jednom round trip-u
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, ttl, serialized_value)
+                    pipe.publish(self.invalidation_channel, self._invalidation_message(keys=[key]))
+                    await pipe.execute()
+                # U L1 ide dekodirana kopija, da je kasnije izmene value ne menjaju
+                self.l1.set(key, self.codec.decode(serialized_value), ttl)
+            else:
+                await self.redis.setex(key, ttl, serialized_value)
+            if self.l2 is not None and self.l2.handles(key):
+                self.l2.put(key, serialized_value, ttl)
+            self.telemetry.record_set(key, time.perf_counter() - start, len(serialized_value), ttl)
             logger.debug(f"Podatak sačuvan u cache: {key}")
             return True
         except Exception as e:
             logger.error(f"Greška pri čuvanju u cache: {e}")
+            self.telemetry.record_error(key, "set")
             return False
     
     async def delete(self, key: str) -> bool:
@@ -101,11 +401,19 @@ class CacheManager:
         Returns:
             True ako je uspešno obrisano, False inače
         """
+        if self.l1 is not None:
+            self.l1.delete(key)
+        self.telemetry.forget(key)
+        
         if not self.redis:
             return False
             
         try:
             result = await self.redis.delete(key)
+            await self._publish_invalidation(keys=[key])
+            if self.l2 is not None:
+                await self.l2.delete([key])
+            self.semantic_index.remove_key(key)
             logger.debug(f"Podatak obrisan iz cache-a: {key}")
             return result > 0
         except Exception as e:
@@ -153,6 +461,156 @@ class CacheManager:
             logger.error(f"Greška pri postavljanju TTL: {e}")
             return False
     
+    # Batch operacije (SCAN + pipeline/MGET umesto KEYS i pojedinačnih poziva)
+    async def scan_keys(self, pattern: str = "*", count: Optional[int] = None) -> AsyncIterator[List[str]]:
+        """
+        Inkrementalno prolazi kroz ključeve koji odgovaraju pattern-u
+        
+        Za razliku od KEYS, SCAN ne blokira Redis - svaki korak vraća
+        mali batch ključeva.
+        
+        Args:
+            pattern: Pattern ključeva
+            count: COUNT hint po SCAN koraku
+            
+        Yields:
+            Batch-evi ključeva
+        """
+        if not self.redis:
+            return
+        
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(cursor=cursor, match=pattern, count=count or self.scan_count)
+            if keys:
+                yield [key.decode() if isinstance(key, bytes) else key for key in keys]
+            if cursor == 0:
+                break
+    
+    async def mget(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Dohvati više ključeva u batch-evima (MGET)
+        
+        Args:
+            keys: Lista ključeva
+            
+        Returns:
+            Dict ključ -> vrednost (samo pronađeni ključevi)
+        """
+        if not self.redis or not keys:
+            return {}
+        
+        result = {}
+        try:
+            for start in range(0, len(keys), self.batch_size):
+                chunk = keys[start:start + self.batch_size]
+                values = await self.redis.mget(chunk)
+                for key, data in zip(chunk, values):
+                    if data:
+                        try:
+                            result[key] = self.codec.decode(data)
+                        except ValueError:
+                            logger.warning(f"Neispravna vrednost u cache-u: {key}")
+            return result
+        except Exception as e:
+            logger.error(f"Greška pri batch dohvatanju iz cache-a: {e}")
+            return result
+    
+    async def mset(self, items: Dict[str, Any], ttl: int = 3600) -> bool:
+        """
+        Sačuvaj više ključeva sa TTL-om kroz pipeline (jedan round trip po batch-u)
+        
+        Args:
+            items: Dict ključ -> vrednost
+            ttl: Time to live u sekundama
+            
+        Returns:
+            True ako je uspešno sačuvano
+        """
+        if not self.redis or not items:
+            return False
+        
+        try:
+            entries = list(items.items())
+            for start in range(0, len(entries), self.batch_size):
+                chunk = entries[start:start + self.batch_size]
+                batch_start = time.perf_counter()
+                encoded = [(key, self.codec.encode(value, self._namespace(key))) for key, value in chunk]
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, data in encoded:
+                        pipe.setex(key, ttl, data)
+                    if self.l1 is not None:
+                        pipe.publish(self.invalidation_channel, self._invalidation_message(keys=[key for key, _ in chunk]))
+                    await pipe.execute()
+                elapsed = (time.perf_counter() - batch_start) / len(encoded)
+                for key, data in encoded:
+                    self.telemetry.record_set(key, elapsed, len(data), ttl)
+                    if self.l2 is not None and self.l2.handles(key):
+                        self.l2.put(key, data, ttl)
+                if self.l1 is not None:
+                    for key, _ in chunk:
+                        self.l1.delete(key)
+            return True
+        except Exception as e:
+            logger.error(f"Greška pri batch čuvanju u cache: {e}")
+            return False
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Obriši više ključeva u batch-evima (UNLINK - oslobađanje memorije u pozadini)
+        
+        Args:
+            keys: Lista ključeva
+            
+        Returns:
+            Broj obrisanih ključeva
+        """
+        if not self.redis or not keys:
+            return 0
+        
+        deleted = 0
+        try:
+            for start in range(0, len(keys), self.batch_size):
+                chunk = keys[start:start + self.batch_size]
+                deleted += await self.redis.unlink(*chunk)
+                if self.l2 is not None:
+                    await self.l2.delete(chunk)
+                if self.l1 is not None:
+                    for key in chunk:
+                        self.l1.delete(key)
+                    await self._publish_invalidation(keys=chunk)
+            return deleted
+        except Exception as e:
+            logger.error(f"Greška pri batch brisanju iz cache-a: {e}")
+            return deleted
+    
+    # Single-flight / stale-while-revalidate
+    async def coalesce(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Izračunaj vrednost za cache ključ, deleći rezultat sa istovremenim zahtevima
+        
+        Args:
+            key: Cache ključ (identični zahtevi imaju isti ključ)
+            compute: Korutina koja računa (i kešira) vrednost
+            
+        Returns:
+            Tuple (rezultat, shared) - shared je True ako je rezultat izračunao drugi zahtev
+        """
+        if not self.single_flight_enabled:
+            return await compute(), False
+        return await self.flights.do(key, compute)
+    
+    def is_stale(self, entry: Any) -> bool:
+        """Da li je keširani unos prešao fresh_until (služi se dok se osvežava)"""
+        if not isinstance(entry, dict):
+            return False
+        fresh_until = entry.get("fresh_until")
+        return fresh_until is not None and time.time() > fresh_until
+    
+    def revalidate(self, key: str, compute: Callable[[], Awaitable[Any]]) -> bool:
+        """Osveži zastareli unos u pozadini (najviše jedno osvežavanje po ključu)"""
+        return self.flights.refresh(key, compute)
+    
     # RAG-specific cache metode
     async def get_rag_result(self, query: str, context: str = "") -> Optional[Dict]:
         """
@@ -184,6 +642,47 @@ class CacheManager:
         key = self._generate_key("rag", query, context)
         return await self.set(key, result, ttl)
     
+    # Retrieval cache - rangirani chunk ID-jevi i skorovi (bez LLM odgovora)
+    def _retrieval_key(self, query: str, generation: int, top_k: int, filters: Optional[Dict] = None) -> str:
+        normalized = " ".join(query.lower().split())
+        filters_part = json.dumps(filters, sort_keys=True, default=str) if filters else ""
+        digest = hashlib.md5(f"{normalized}|{filters_part}".encode()).hexdigest()
+        return self._generate_key("retrieval", f"g{generation}", top_k, digest)
+    
+    async def get_retrieval_result(self, query: str, generation: int, top_k: int,
+                                   filters: Optional[Dict] = None) -> Optional[List]:
+        """
+        Dohvati rezultat pretrage iz cache-a
+        
+        Args:
+            query: Korisnički upit (normalizuje se: mala slova, razmaci)
+            generation: Generacija indeksa
+            top_k: Broj rezultata
+            filters: Filteri pretrage (opciono)
+            
+        Returns:
+            Lista [chunk_id, score] ili None
+        """
+        return await self.get(self._retrieval_key(query, generation, top_k, filters))
+    
+    async def set_retrieval_result(self, query: str, generation: int, top_k: int, hits: List,
+                                   filters: Optional[Dict] = None, ttl: int = 86400) -> bool:
+        """
+        Sačuvaj rezultat pretrage (samo ID-jevi i skorovi, ne sadržaj chunk-ova)
+        
+        Args:
+            query: Korisnički upit
+            generation: Generacija indeksa
+            top_k: Broj rezultata
+            hits: Lista [chunk_id, score]
+            filters: Filteri pretrage (opciono)
+            ttl: Time to live u sekundama
+            
+        Returns:
+            True ako je uspešno sačuvano
+        """
+        return await self.set(self._retrieval_key(query, generation, top_k, filters), hits, ttl)
+    
     async def get_session_data(self, session_id: str) -> Optional[Dict]:
         """
         Dohvati podatke sesije iz cache-a
@@ -259,12 +758,32 @@ class CacheManager:
                 "total_commands_processed": info.get("total_commands_processed", 0),
                 "keyspace_hits": info.get("keyspace_hits", 0),
                 "keyspace_misses": info.get("keyspace_misses", 0),
-                "uptime_in_seconds": info.get("uptime_in_seconds", 0)
+                "uptime_in_seconds": info.get("uptime_in_seconds", 0),
+                "semantic_cache": self.semantic_index.get_stats(),
+                "tiers": self.get_tier_stats(),
+                "single_flight": self.flights.get_stats(),
+                "codec": self.codec.get_stats(),
+                "l2": self.l2.get_stats() if self.l2 is not None else {"enabled": False},
+                "backend": self.get_backend_state()
             }
         except Exception as e:
             logger.error(f"Greška pri dohvatanju statistika: {e}")
             return {"error": str(e)}
     
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Hit ratio po nivou cache-a (L1 in-process, Redis)"""
+        redis_stats = self.tier_stats['redis']
+        redis_lookups = redis_stats['hits'] + redis_stats['misses']
+        return {
+            'l1': self.l1.get_stats() if self.l1 is not None else {'enabled': False},
+            'redis': {
+                'hits': redis_stats['hits'],
+                'misses': redis_stats['misses'],
+                'hit_rate': round(redis_stats['hits'] / redis_lookups * 100, 2) if redis_lookups else 0.0
+            },
+            'invalidation_listener': self._listener_task is not None and not self._listener_task.done()
+        }
+    
     async def clear_cache(self, pattern: str = "*") -> int:
         """
         Obriši sve ključeve koji odgovaraju pattern-u
@@ -279,12 +798,20 @@ class CacheManager:
             return 0
             
         try:
-            keys = await self.redis.keys(pattern)
-            if keys:
-                deleted = await self.redis.delete(*keys)
+            deleted = 0
+            async for keys in self.scan_keys(pattern):
+                deleted += await self.delete_many(keys)
+            # Semantic indeks i L1 prate samo ključeve koji postoje u Redis-u
+            prefix = pattern.split('*', 1)[0]
+            self.semantic_index.clear(prefix)
+            if self.l2 is not None:
+                deleted += await self.l2.clear(prefix)
+            if self.l1 is not None:
+                self.l1.clear(prefix)
+                await self._publish_invalidation(prefix=prefix)
+            if deleted:
                 logger.info(f"Obrisano {deleted} ključeva iz cache-a")
-                return deleted
-            return 0
+            return deleted
         except Exception as e:
             logger.error(f"Greška pri brisanju cache-a: {e}")
             return 0
@@ -300,8 +827,9 @@ class CacheManager:
             return {"status": "error", "message": "Redis nije dostupan"}
             
         try:
-            # Test konekcije
-            await self.redis.ping()
+            # Test konekcije (greška konekcije otvara breaker)
+            await self.ping()
+            backend_state = self.get_backend_state()
             
             # Test čitanja/pisanja
             test_key = "health_check_test"
@@ -311,22 +839,31 @@ class CacheManager:
             retrieved_value = await self.get(test_key)
             await self.delete(test_key)
             
-            if retrieved_value and retrieved_value.get("timestamp"):
+            if not (retrieved_value and retrieved_value.get("timestamp")):
                 return {
-                    "status": "healthy",
-                    "message": "Cache radi normalno",
-                    "timestamp": datetime.now().isoformat()
+                    "status": "warning",
+                    "message": "Cache radi ali ima problema sa čitanjem/pisanjem",
+                    **backend_state
                 }
-            else:
+            if backend_state["active_backend"] == "memory_fallback":
                 return {
-                    "status": "warning",
-                    "message": "Cache radi ali ima problema sa čitanjem/pisanjem"
+                    "status": "degraded",
+                    "message": "Redis nije dostupan - koristi se lokalni in-memory cache",
+                    "timestamp": datetime.now().isoformat(),
+                    **backend_state
                 }
+            return {
+                "status": "healthy",
+                "message": "Cache radi normalno",
+                "timestamp": datetime.now().isoformat(),
+                **backend_state
+            }
                 
         except Exception as e:
             return {
                 "status": "error",
-                "message": f"Cache nije dostupan: {str(e)}"
+                "message": f"Cache nije dostupan: {str(e)}",
+                **self.get_backend_state()
             }
 
     # AI Response Cache metode
@@ -346,7 +883,8 @@ class CacheManager:
         return await self.get(key)
     
     async def set_ai_response(self, query: str, response: str, model: str = "gpt-4", 
-                            context: str = "", response_time: float = 0.0, ttl: int = 3600) -> bool:
+                            context: str = "", response_time: float = 0.0, ttl: int = 3600,
+                            semantic_query: Optional[str] = None, stale_ttl: Optional[int] = None) -> bool:
         """
         Sačuvaj AI odgovor u cache
         
@@ -357,10 +895,14 @@ class CacheManager:
             context: Kontekst (opciono)
             response_time: Vreme odgovora
             ttl: Time to live u sekundama (default: 1 sat)
+            semantic_query: Tekst upita za semantic cache (opciono)
+            stale_ttl: Koliko dugo posle ttl-a se zastareli odgovor još služi
+                dok se osvežava (default: CACHE_STALE_WHILE_REVALIDATE)
             
         Returns:
             True ako je uspešno sačuvano
         """
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
         cache_data = {
             "query": query,
             "response": response,
@@ -370,75 +912,69 @@ class CacheManager:
             "cached_at": datetime.now().isoformat(),
             "cached": True
         }
+        if stale_ttl > 0:
+            cache_data["fresh_until"] = time.time() + ttl
         key = self._generate_key("ai_response", query, model, context)
-        return await self.set(key, cache_data, ttl)
+        saved = await self.set(key, cache_data, ttl + stale_ttl)
+        
+        if saved and semantic_query and self.semantic_index.is_ready():
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, self.semantic_index.add, semantic_query, key, ttl, f"{model}:{context}"
+                )
+            except Exception as e:
+                logger.warning(f"Greška pri dodavanju u semantic cache: {e}")
+        
+        return saved
     
     # Semantic Cache metode (za slične upite)
-    async def get_semantic_cache(self, query: str, similarity_threshold: float = 0.8) -> Optional[Dict]:
+    async def get_semantic_cache(self, query: str, similarity_threshold: Optional[float] = None,
+                                 model: str = "gpt-4", context: str = "") -> Optional[Dict]:
         """
         Dohvati semantički sličan odgovor iz cache-a
         
+        Pretraga ide kroz FAISS indeks (kosinusna sličnost). Bez embedding
+        modela semantic cache je isključen - lookup odmah vraća None.
+        
         Args:
             query: Korisnički upit
             similarity_threshold: Prag sličnosti (0.0 - 1.0)
+            model: AI model (odgovori različitih modela se ne mešaju)
+            context: Kontekst (opciono)
             
         Returns:
             Sličan odgovor ili None
         """
+        if not self.redis or not self.semantic_index.is_ready():
+            return None
+        
+        return await self._get_semantic_cache_indexed(query, similarity_threshold, model, context)
+    
+    async def _get_semantic_cache_indexed(self, query: str, similarity_threshold: Optional[float],
+                                          model: str, context: str) -> Optional[Dict]:
+        """Semantic lookup kroz ANN indeks + jedan GET iz Redis-a"""
         try:
-            # Dohvati sve AI response ključeve
-            if not self.redis:
+            loop = asyncio.get_running_loop()
+            match = await loop.run_in_executor(
+                None, self.semantic_index.search, query, f"{model}:{context}", similarity_threshold
+            )
+            if not match:
                 return None
-            pattern = "ai_response:*"
-            keys = await self.redis.keys(pattern)
-            
-            best_match = None
-            best_similarity = 0.0
             
-            for key in keys:
-                cached_data = await self.get(key)
-                if cached_data and "query" in cached_data:
-                    # Jednostavna sličnost na osnovu ključnih reči
-                    similarity = self._calculate_similarity(query, cached_data["query"])
-                    if similarity > best_similarity and similarity >= similarity_threshold:
-                        best_similarity = similarity
-                        best_match = cached_data
-                        best_match["similarity_score"] = similarity
+            key, similarity = match
+            cached_data = await self.get(key)
+            if not cached_data:
+                # Redis je izbacio ključ - izbaci i iz indeksa
+                self.semantic_index.remove_key(key, stale=True)
+                return None
             
-            return best_match
+            return {**cached_data, "similarity_score": similarity}
             
         except Exception as e:
             logger.error(f"Greška pri semantic cache lookup: {e}")
             return None
     
-    def _calculate_similarity(self, query1: str, query2: str) -> float:
-        """
-        Izračunaj sličnost između dva upita
-        
-        Args:
-            query1: Prvi upit
-            query2: Drugi upit
-            
-        Returns:
-            Sličnost (0.0 - 1.0)
-        """
-        try:
-            # Jednostavna implementacija - broj zajedničkih reči
-            words1 = set(query1.lower().split())
-            words2 = set(query2.lower().split())
-            
-            if not words1 or not words2:
-                return 0.0
-            
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-            
-            return len(intersection) / len(union)
-            
-        except Exception as e:
-            logger.error(f"Greška pri računanju sličnosti: {e}")
-            return 0.0
-    
     # Query Cache metode
     async def get_query_cache(self, query: str, session_id: str = "") -> Optional[Dict]:
         """
@@ -504,17 +1040,18 @@ class CacheManager:
                 "sessions": "session:*"
             }
             
-            for category, pattern in patterns.items():
-                try:
-                    if self.redis:
-                        keys = await self.redis.keys(pattern)
-                        analytics[category] = len(keys)
-                        analytics["total_keys"] += len(keys)
-                    else:
-                        analytics[category] = 0
-                except Exception as e:
-                    logger.error(f"Greška pri brojanju {category}: {e}")
-                    analytics[category] = 0
+            # Jedan inkrementalni SCAN prolaz, ključevi se razvrstavaju po prefiksu
+            prefixes = {pattern[:-1]: category for category, pattern in patterns.items()}
+            try:
+                async for keys in self.scan_keys("*"):
+                    for key in keys:
+                        for prefix, category in prefixes.items():
+                            if key.startswith(prefix):
+                                analytics[category] += 1
+                                analytics["total_keys"] += 1
+                                break
+            except Exception as e:
+                logger.error(f"Greška pri brojanju ključeva: {e}")
             # Izračunaj hit rate (ako imamo statistike)
             if hasattr(self, '_hit_stats'):
                 total_hits = self._hit_stats.get('hits', 0)
@@ -574,13 +1111,15 @@ async def get_cached_ai_response(query: str, model: str = "gpt-4", context: str
     return await cache_manager.get_ai_response(query, model, context)
 
 async def set_cached_ai_response(query: str, response: str, model: str = "gpt-4", 
-                                context: str = "", response_time: float = 0.0, ttl: int = 3600) -> bool:
+                                context: str = "", response_time: float = 0.0, ttl: int = 3600,
+                                semantic_query: Optional[str] = None) -> bool:
     """Helper funkcija za čuvanje AI odgovora u cache"""
-    return await cache_manager.set_ai_response(query, response, model, context, response_time, ttl)
+    return await cache_manager.set_ai_response(query, response, model, context, response_time, ttl, semantic_query)
 
-async def get_semantic_cached_response(query: str, similarity_threshold: float = 0.8) -> Optional[Dict]:
+async def get_semantic_cached_response(query: str, similarity_threshold: Optional[float] = None,
+                                       model: str = "gpt-4", context: str = "") -> Optional[Dict]:
     """Helper funkcija za dohvatanje semantički sličnog odgovora iz cache-a"""
-    return await cache_manager.get_semantic_cache(query, similarity_threshold)
+    return await cache_manager.get_semantic_cache(query, similarity_threshold, model, context)
 
 async def get_cached_query(query: str, session_id: str = "") -> Optional[Dict]:
     """Helper funkcija za dohvatanje keširanog upita"""
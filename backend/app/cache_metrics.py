@@ -0,0 +1,231 @@
+"""
+Cache Metrics
+Telemetrija cache-a po namespace-u: hit/miss po nivou, latencija, veličina
+vrednosti i efikasnost TTL-a (starost pri prvoj upotrebi, istekli neiskorišćeni
+unosi), u JSON obliku i Prometheus text formatu
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Namespace-ovi sa sopstvenim metrikama; ostali ključevi idu pod "other"
+# (ograničava kardinalnost Prometheus labela)
+KNOWN_NAMESPACES = ("ai_response", "rag", "retrieval", "query", "session", "embeddings", "ocr")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+AGE_BUCKETS = (10, 60, 300, 900, 3600, 14400, 86400)
+
+class Histogram:
+    """Kumulativni histogram (Prometheus semantika bucket-a)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Poslednji = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0.0,
+            'buckets': dict(self.cumulative())
+        }
+
+class NamespaceStats:
+    """Brojači jednog namespace-a"""
+
+    def __init__(self):
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+        self.sets = 0
+        self.errors: Dict[str, int] = {}
+        self.expired_unused = 0
+        self.get_latency = Histogram(LATENCY_BUCKETS)
+        self.set_latency = Histogram(LATENCY_BUCKETS)
+        self.value_size = Histogram(SIZE_BUCKETS)
+        self.first_reuse_age = Histogram(AGE_BUCKETS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            'hits': hits,
+            'hits_by_tier': dict(self.hits),
+            'misses': self.misses,
+            'hit_rate': round(hits / lookups * 100, 2) if lookups else 0.0,
+            'sets': self.sets,
+            'errors': dict(self.errors),
+            'reused': self.first_reuse_age.count,
+            'expired_unused': self.expired_unused,
+            'get_latency_seconds': self.get_latency.to_dict(),
+            'set_latency_seconds': self.set_latency.to_dict(),
+            'value_size_bytes': self.value_size.to_dict(),
+            'first_reuse_age_seconds': self.first_reuse_age.to_dict()
+        }
+
+class CacheTelemetry:
+    """
+    Thread-safe telemetrija cache-a
+
+    Za TTL efikasnost se prati svaki upisan ključ dok ne bude pročitan:
+    prvi pogodak beleži starost unosa, a unos koji istekne nepročitan broji
+    se kao expired_unused (TTL je predug ili se vrednost ne koristi).
+    """
+
+    def __init__(self, max_tracked_keys: int = 50000):
+        self.max_tracked_keys = max_tracked_keys
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, NamespaceStats] = {}
+        # key -> (namespace, set_at, expires_at) - upisano, još nije pročitano
+        self._pending: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self._untracked = 0
+        self._last_sweep = time.time()
+        self.started_at = time.time()
+
+    @staticmethod
+    def namespace_of(key: str) -> str:
+        parts = key.split(":", 2)
+        namespace = parts[0]
+        # RAG odgovori se čuvaju kao ai_response:rag:... - prate se odvojeno od chat-a
+        if namespace == "ai_response" and len(parts) > 1 and parts[1] == "rag":
+            return "rag"
+        return namespace if namespace in KNOWN_NAMESPACES else "other"
+
+    def _stats(self, namespace: str) -> NamespaceStats:
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces[namespace] = NamespaceStats()
+        return stats
+
+    def record_get(self, key: str, hit: bool, seconds: float, tier: str = "redis",
+                   namespace: Optional[str] = None):
+        """Zabeleži lookup (tier: l1, redis, sqlite...)"""
+        namespace = namespace or self.namespace_of(key)
+        now = time.time()
+        with self._lock:
+            stats = self._stats(namespace)
+            stats.get_latency.observe(seconds)
+            if not hit:
+                stats.misses += 1
+                return
+            stats.hits[tier] = stats.hits.get(tier, 0) + 1
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                stats.first_reuse_age.observe(now - pending[1])
+
+    def record_set(self, key: str, seconds: float, size: Optional[int] = None,
+                   ttl: Optional[float] = None, namespace: Optional[str] = None):
+        """Zabeleži upis (size u bajtovima, ttl u sekundama)"""
+        namespace = namespace or self.namespace_of(key)
+        now = time.time()
+        with self._lock:
+            stats = self._stats(namespace)
+            stats.sets += 1
+            stats.set_latency.observe(seconds)
+            if size is not None:
+                stats.value_size.observe(size)
+            if ttl:
+                self._pending[key] = (namespace, now, now + ttl)
+                self._pending.move_to_end(key)
+                while len(self._pending) > self.max_tracked_keys:
+                    self._pending.popitem(last=False)
+                    self._untracked += 1
+            if now - self._last_sweep > 60:
+                self._sweep_locked(now)
+
+    def record_error(self, key: str, operation: str, namespace: Optional[str] = None):
+        namespace = namespace or self.namespace_of(key)
+        with self._lock:
+            stats = self._stats(namespace)
+            stats.errors[operation] = stats.errors.get(operation, 0) + 1
+
+    def forget(self, key: str):
+        """Ključ je obrisan - ne računa se kao istekao neiskorišćen"""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _sweep_locked(self, now: float):
+        expired = [key for key, (_, _, expires_at) in self._pending.items() if expires_at <= now]
+        for key in expired:
+            namespace = self._pending.pop(key)[0]
+            self._stats(namespace).expired_unused += 1
+        self._last_sweep = now
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Telemetrija po namespace-u"""
+        with self._lock:
+            self._sweep_locked(time.time())
+            return {
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'tracked_unread_keys': len(self._pending),
+                'untracked_keys': self._untracked,
+                'namespaces': {name: stats.to_dict() for name, stats in sorted(self._namespaces.items())}
+            }
+
+    def render_prometheus(self, prefix: str = "acaia_cache") -> str:
+        """Metrike u Prometheus text exposition formatu"""
+        with self._lock:
+            self._sweep_locked(time.time())
+            lines: List[str] = []
+
+            def header(name: str, kind: str, help_text: str):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+            header("hits_total", "counter", "Cache hits by namespace and tier")
+            for namespace, stats in sorted(self._namespaces.items()):
+                for tier, count in sorted(stats.hits.items()):
+                    lines.append(f'{prefix}_hits_total{{namespace="{namespace}",tier="{tier}"}} {count}')
+
+            for name, attr, help_text in (
+                ("misses_total", "misses", "Cache misses by namespace"),
+                ("sets_total", "sets", "Cache writes by namespace"),
+                ("expired_unused_total", "expired_unused", "Entries that expired before their first read")
+            ):
+                header(name, "counter", help_text)
+                for namespace, stats in sorted(self._namespaces.items()):
+                    lines.append(f'{prefix}_{name}{{namespace="{namespace}"}} {getattr(stats, attr)}')
+
+            header("errors_total", "counter", "Cache errors by namespace and operation")
+            for namespace, stats in sorted(self._namespaces.items()):
+                for operation, count in sorted(stats.errors.items()):
+                    lines.append(f'{prefix}_errors_total{{namespace="{namespace}",operation="{operation}"}} {count}')
+
+            for name, attr, help_text in (
+                ("get_duration_seconds", "get_latency", "Cache lookup latency"),
+                ("set_duration_seconds", "set_latency", "Cache write latency"),
+                ("value_size_bytes", "value_size", "Stored value size"),
+                ("first_reuse_age_seconds", "first_reuse_age", "Entry age at its first read")
+            ):
+                header(name, "histogram", help_text)
+                for namespace, stats in sorted(self._namespaces.items()):
+                    histogram: Histogram = getattr(stats, attr)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{prefix}_{name}_bucket{{namespace="{namespace}",le="{bound}"}} {count}')
+                    lines.append(f'{prefix}_{name}_sum{{namespace="{namespace}"}} {histogram.sum}')
+                    lines.append(f'{prefix}_{name}_count{{namespace="{namespace}"}} {histogram.count}')
+
+            header("tracked_unread_keys", "gauge", "Written keys not read yet")
+            lines.append(f"{prefix}_tracked_unread_keys {len(self._pending)}")
+            return "\n".join(lines) + "\n"
+
+# Globalna instanca telemetrije (deli je CacheManager i OCR cache)
+cache_telemetry = CacheTelemetry()
@@ -0,0 +1,135 @@
+"""
+Circuit Breaker
+Prati zdravlje spoljnog servisa i prestaje da ga poziva posle niza grešaka,
+umesto da svaki zahtev čeka na timeout
+"""
+
+import time
+import logging
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    CLOSED = "closed"        # Normalan rad
+    OPEN = "open"            # Servis se ne poziva (fail fast)
+    HALF_OPEN = "half_open"  # Jedan probni poziv posle pauze
+
+class CircuitBreaker:
+    """Jednostavan circuit breaker (closed -> open -> half_open -> closed)"""
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout: float = 30.0,
+                 on_state_change: Optional[Callable[[CircuitState, CircuitState], None]] = None):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.on_state_change = on_state_change
+
+        self.state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        self.stats = {
+            'total_failures': 0,
+            'total_successes': 0,
+            'rejected': 0,
+            'times_opened': 0,
+            'last_failure': None,
+            'last_error': None
+        }
+
+    def allow_request(self) -> bool:
+        """Da li sme da se pozove servis"""
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._set_state(CircuitState.HALF_OPEN)
+            else:
+                self.stats['rejected'] += 1
+                return False
+
+        # HALF_OPEN - propusti samo jedan probni poziv
+        if self._probe_in_flight:
+            self.stats['rejected'] += 1
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        """Poziv je uspeo"""
+        self.stats['total_successes'] += 1
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != CircuitState.CLOSED:
+            self._set_state(CircuitState.CLOSED)
+
+    def release_probe(self):
+        """
+        Probni poziv je završen (poziva se u finally) - i kada je prekinut
+        (CancelledError) ili nije zabeležen ni uspeh ni greška; inače bi
+        breaker zauvek ostao u half_open stanju bez novih proba
+        """
+        self._probe_in_flight = False
+
+    def trip(self, error: Optional[BaseException] = None):
+        """Odmah otvori breaker (npr. neuspeo ping pri startup-u)"""
+        self.stats['total_failures'] += 1
+        self.stats['last_failure'] = time.time()
+        if error is not None:
+            self.stats['last_error'] = str(error)
+        self._probe_in_flight = False
+        self._opened_at = time.monotonic()
+        if self.state != CircuitState.OPEN:
+            self.stats['times_opened'] += 1
+            self._set_state(CircuitState.OPEN, f"odmah, bez čekanja praga grešaka ({error if error is not None else 'trip'})")
+
+    def record_failure(self, error: Optional[BaseException] = None):
+        """Poziv nije uspeo (greška konekcije ili timeout)"""
+        self.stats['total_failures'] += 1
+        self.stats['last_failure'] = time.time()
+        if error is not None:
+            self.stats['last_error'] = str(error)
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if self.state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != CircuitState.OPEN:
+                if self.state == CircuitState.HALF_OPEN:
+                    reason = f"probni poziv nije uspeo ({error})"
+                else:
+                    reason = f"posle {self._consecutive_failures} grešaka (poslednja: {error})"
+                self.stats['times_opened'] += 1
+                self._set_state(CircuitState.OPEN, reason)
+
+    def _set_state(self, new_state: CircuitState, reason: str = ""):
+        old_state = self.state
+        self.state = new_state
+        if new_state == CircuitState.OPEN:
+            logger.warning(f"[{self.name}] Circuit breaker otvoren - {reason or 'nepoznat razlog'}")
+        elif new_state == CircuitState.CLOSED:
+            logger.info(f"[{self.name}] Circuit breaker zatvoren - servis ponovo dostupan")
+        if self.on_state_change:
+            try:
+                self.on_state_change(old_state, new_state)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Greška u on_state_change: {e}")
+
+    def get_state(self) -> Dict[str, Any]:
+        """Stanje breaker-a za health/monitoring endpoint-e"""
+        retry_in = None
+        if self.state == CircuitState.OPEN and self._opened_at is not None:
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+        return {
+            'name': self.name,
+            'state': self.state.value,
+            'consecutive_failures': self._consecutive_failures,
+            'failure_threshold': self.failure_threshold,
+            'recovery_timeout': self.recovery_timeout,
+            'retry_in': retry_in,
+            **self.stats
+        }
@@ -29,22 +29,99 @@ class Config:
     ALLOWED_EXTENSIONS = os.getenv("ALLOWED_EXTENSIONS", ".pdf,.docx,.txt,.png,.jpg,.jpeg,.bmp,.tiff,.tif").split(",")
     
     # OCR konfiguracija
+    OCR_ENGINE = os.getenv("OCR_ENGINE", "auto")  # auto | tesserocr | pytesseract
     OCR_DEFAULT_LANGUAGES = os.getenv("OCR_DEFAULT_LANGUAGES", "srp,eng").split(",")
+    OCR_AUTO_LANGUAGE = os.getenv("OCR_AUTO_LANGUAGE", "true").lower() == "true"  # Detekcija pisma kada jezici nisu zadati
+    OCR_SCRIPT_LANGUAGES = os.getenv("OCR_SCRIPT_LANGUAGES", "Cyrillic:srp,Latin:eng")  # Pismo -> jezički paketi
+    OCR_SCRIPT_MIN_CONFIDENCE = float(os.getenv("OCR_SCRIPT_MIN_CONFIDENCE", "2.0"))
     OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "50.0"))
+    OCR_GOOD_CONFIDENCE = float(os.getenv("OCR_GOOD_CONFIDENCE", "80.0"))  # Early exit za PSM fallback
     OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "5"))
-    
+    OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "4"))  # Veličina OCR executor-a
+    OCR_BATCH_CONCURRENCY = int(os.getenv("OCR_BATCH_CONCURRENCY", "4"))  # Istovremenih OCR obrada po batch-u
+    OCR_BATCH_MAX_FILES = int(os.getenv("OCR_BATCH_MAX_FILES", "50"))
+    OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 256MB budžet
+    OCR_CACHE_TTL_HOURS = float(os.getenv("OCR_CACHE_TTL_HOURS", "24"))
+    OCR_PHASH_MAX_DISTANCE = int(os.getenv("OCR_PHASH_MAX_DISTANCE", "4"))  # Hamming prag pHash kandidata (0-7)
+    OCR_CONTENT_MAX_DIFF = float(os.getenv("OCR_CONTENT_MAX_DIFF", "0.08"))  # Udeo različitih bita otiska sadržaja
+    OCR_TILING_ENABLED = os.getenv("OCR_TILING_ENABLED", "true").lower() == "true"
+    OCR_TILE_THRESHOLD = int(os.getenv("OCR_TILE_THRESHOLD", "2000"))  # Veće slike se seku na tile-ove umesto smanjivanja
+    OCR_TILE_SIZE = int(os.getenv("OCR_TILE_SIZE", "1200"))
+    OCR_TILE_OVERLAP = int(os.getenv("OCR_TILE_OVERLAP", "120"))
+    OCR_TILE_WORKERS = int(os.getenv("OCR_TILE_WORKERS", "4"))
+    OCR_DOCUMENT_CONCURRENCY = int(os.getenv("OCR_DOCUMENT_CONCURRENCY", "3"))  # Stranica u obradi (i u memoriji) odjednom
+    OCR_DOCUMENT_WORKERS = int(os.getenv("OCR_DOCUMENT_WORKERS", "2"))  # Poseban pool za stranice background dokumenata
+    OCR_DOCUMENT_MAX_PAGES = int(os.getenv("OCR_DOCUMENT_MAX_PAGES", "500"))
+    OCR_PDF_DPI = int(os.getenv("OCR_PDF_DPI", "200"))
+    OCR_ANALYSIS_THUMBNAIL_SIZE = int(os.getenv("OCR_ANALYSIS_THUMBNAIL_SIZE", "512"))  # Analiza kvaliteta/skew na thumbnail-u
+    OCR_TEXT_CROP_ENABLED = os.getenv("OCR_TEXT_CROP_ENABLED", "true").lower() == "true"
+    OCR_TEXT_CROP_MIN_GAIN = float(os.getenv("OCR_TEXT_CROP_MIN_GAIN", "0.1"))  # Seci samo ako se uklanja bar 10% površine
+    OCR_TILE_MAX_PIXELS = int(os.getenv("OCR_TILE_MAX_PIXELS", str(80 * 1000 * 1000)))  # Iznad ovoga se ipak smanjuje
+
+    # Admission control za skupe operacije (upload, OCR, embedding)
+    ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "4"))
+    ADMISSION_MAX_PER_USER = int(os.getenv("ADMISSION_MAX_PER_USER", "2"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "20"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+
+    # Redis cache konfiguracija
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis").lower()  # redis | memory (bez servera - testovi, benchmark)
+    REDIS_URL = os.getenv("REDIS_URL", "")  # Ako je postavljen, ima prednost nad host/port
+    CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", "1.0"))  # Socket timeout (sekunde)
+    CACHE_BREAKER_FAILURES = int(os.getenv("CACHE_BREAKER_FAILURES", "3"))  # Uzastopne greške pre otvaranja
+    CACHE_BREAKER_RECOVERY = float(os.getenv("CACHE_BREAKER_RECOVERY", "15"))  # Pauza pre probnog poziva
+    CACHE_FALLBACK_MAX_KEYS = int(os.getenv("CACHE_FALLBACK_MAX_KEYS", "5000"))  # Lokalni backend tokom prekida
+    CACHE_SCAN_COUNT = int(os.getenv("CACHE_SCAN_COUNT", "1000"))  # COUNT hint za SCAN
+    CACHE_BATCH_SIZE = int(os.getenv("CACHE_BATCH_SIZE", "500"))  # Ključeva po MGET/pipeline batch-u
+    CACHE_L1_ENABLED = os.getenv("CACHE_L1_ENABLED", "true").lower() == "true"  # In-process LRU ispred Redis-a
+    CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "2048"))
+    CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", "60"))  # Maksimalna starost L1 unosa (sekunde)
+    CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+    CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "auto")  # auto | msgpack | json
+    CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto")  # auto | zstd | zlib | none
+    CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))  # Bajtova pre kompresije
+    CACHE_L2_ENABLED = os.getenv("CACHE_L2_ENABLED", "true").lower() == "true"  # SQLite nivo ispod Redis-a
+    CACHE_L2_NAMESPACES = os.getenv("CACHE_L2_NAMESPACES", "ai_response,embeddings,retrieval")
+    CACHE_L2_MAX_BYTES = int(os.getenv("CACHE_L2_MAX_BYTES", str(512 * 1024 * 1024)))  # 512MB budžet
+    CACHE_L2_FLUSH_INTERVAL = float(os.getenv("CACHE_L2_FLUSH_INTERVAL", "1.0"))  # Sekunde između batch upisa
+    CACHE_L2_BATCH_SIZE = int(os.getenv("CACHE_L2_BATCH_SIZE", "200"))
+    CACHE_L2_SWEEP_INTERVAL = float(os.getenv("CACHE_L2_SWEEP_INTERVAL", "300"))  # Brisanje isteklih redova
+    CACHE_SINGLE_FLIGHT_ENABLED = os.getenv("CACHE_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"  # Spajanje istih promašaja
+    CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "0"))  # Sekunde posle TTL-a (0 = isključeno)
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))  # Kosinusna sličnost
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+
     # Lokalni storage konfiguracija
     USE_LOCAL_STORAGE = True  # Uvek koristi lokalni storage
     
     # RAG konfiguracija
+    RAG_CACHE_TTL = int(os.getenv("RAG_CACHE_TTL", "86400"))  # Ključ sadrži generaciju indeksa
+    RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"  # Keš rezultata pretrage
+    RETRIEVAL_CACHE_TTL = int(os.getenv("RETRIEVAL_CACHE_TTL", "86400"))
     RAG_CHUNK_SIZE = int(os.getenv("RAG_CHUNK_SIZE", "500"))
     RAG_CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "50"))
     
+    # Warm-up pri startup-u
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "50"))  # Najčešći nedavni upiti
+    WARMUP_LLM_CACHE = os.getenv("WARMUP_LLM_CACHE", "true").lower() == "true"  # Dohvati i keširane odgovore
+    WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "120"))
+    
     # OpenAI konfiguracija
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # npr. http://localhost:8090/v1 (mock LLM server)
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
     OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
     OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))  # Read timeout po pozivu
+    OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+    OPENAI_POOL_TIMEOUT = float(os.getenv("OPENAI_POOL_TIMEOUT", "10"))  # Čekanje na slobodnu konekciju
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "500"))
+    OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "100"))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+    STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "64"))  # Chunk-ova u redu pre backpressure-a
     
     @classmethod
     def get_allowed_extensions(cls) -> List[str]:
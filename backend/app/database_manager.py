@@ -106,10 +106,16 @@ class DatabaseManager:
                 cache_value TEXT NOT NULL,
                 cache_type VARCHAR(50) DEFAULT 'general',
                 expires_at DATETIME,
+                size_bytes INTEGER DEFAULT 0,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
+        # Starije baze nemaju size_bytes kolonu (budžet veličine cache-a)
+        cache_columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+        if 'size_bytes' not in cache_columns:
+            conn.execute("ALTER TABLE cache ADD COLUMN size_bytes INTEGER DEFAULT 0")
+        
         # Analytics tabela
         conn.execute("""
             CREATE TABLE IF NOT EXISTS analytics (
@@ -146,6 +152,7 @@ class DatabaseManager:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_session_id ON chat_history(session_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_document_id ON documents(document_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_cache_key ON cache(cache_key)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_analytics_event_type ON analytics(event_type)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_users_user_id ON users(user_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
@@ -401,11 +408,12 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+                serialized = json.dumps(value)
                 conn.execute(
                     """INSERT OR REPLACE INTO cache 
-                       (cache_key, cache_value, cache_type, expires_at) 
-                       VALUES (?, ?, ?, ?)""",
-                    (key, json.dumps(value), cache_type, expires_at.isoformat())
+                       (cache_key, cache_value, cache_type, expires_at, size_bytes) 
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (key, serialized, cache_type, expires_at.isoformat(), len(serialized))
                 )
                 conn.commit()
                 return True
@@ -430,6 +438,146 @@ class DatabaseManager:
             logger.error(f"Greška pri dohvatanju cache-a: {e}")
             return None
     
+    def get_cache_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Dohvata sirovu cache vrednost (BLOB ili tekst) sa preostalim TTL-om
+        
+        Returns:
+            Tuple (vrednost, preostale sekunde ili None) ili None ako nema/istekla
+        """
+        try:
+            now = datetime.now()
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    """SELECT cache_value, expires_at FROM cache 
+                       WHERE cache_key = ? AND (expires_at IS NULL OR expires_at > ?)""",
+                    (key, now.isoformat())
+                ).fetchone()
+                if not row:
+                    return None
+                remaining = None
+                if row['expires_at']:
+                    remaining = (datetime.fromisoformat(row['expires_at']) - now).total_seconds()
+                return row['cache_value'], remaining
+        except Exception as e:
+            logger.error(f"Greška pri dohvatanju cache-a: {e}")
+            return None
+    
+    def set_cache_many(self, entries: List[Tuple[str, Any, str, int]]) -> int:
+        """
+        Upisuje više cache vrednosti u jednoj transakciji
+        
+        Args:
+            entries: Lista (ključ, vrednost kao bytes/str, cache_type, ttl_seconds)
+            
+        Returns:
+            Broj upisanih redova
+        """
+        if not entries:
+            return 0
+        try:
+            now = datetime.now()
+            rows = [
+                (key, value, cache_type, (now + timedelta(seconds=ttl)).isoformat(), len(value))
+                for key, value, cache_type, ttl in entries
+            ]
+            with self.get_connection() as conn:
+                conn.executemany(
+                    """INSERT OR REPLACE INTO cache 
+                       (cache_key, cache_value, cache_type, expires_at, size_bytes) 
+                       VALUES (?, ?, ?, ?, ?)""",
+                    rows
+                )
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Greška pri batch upisu cache-a: {e}")
+            return 0
+    
+    def delete_cache_keys(self, keys: List[str] = None, prefix: str = None) -> int:
+        """Briše cache ključeve (listu ili sve sa prefiksom)"""
+        try:
+            with self.get_connection() as conn:
+                deleted = 0
+                if keys:
+                    for start in range(0, len(keys), 500):
+                        chunk = keys[start:start + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        deleted += conn.execute(
+                            f"DELETE FROM cache WHERE cache_key IN ({placeholders})", chunk
+                        ).rowcount
+                if prefix is not None:
+                    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    deleted += conn.execute(
+                        "DELETE FROM cache WHERE cache_key LIKE ? ESCAPE '\\'", (escaped + "%",)
+                    ).rowcount
+                conn.commit()
+                return deleted
+        except Exception as e:
+            logger.error(f"Greška pri brisanju cache ključeva: {e}")
+            return 0
+    
+    def delete_expired_cache(self) -> int:
+        """Briše istekle cache redove (koristi idx_cache_expires_at)"""
+        try:
+            with self.get_connection() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (datetime.now().isoformat(),)
+                ).rowcount
+                conn.commit()
+                return deleted
+        except Exception as e:
+            logger.error(f"Greška pri brisanju isteklog cache-a: {e}")
+            return 0
+    
+    def enforce_cache_budget(self, max_bytes: int) -> int:
+        """
+        Drži ukupnu veličinu cache tabele ispod budžeta
+        
+        Prvo se brišu redovi koji najranije ističu.
+        
+        Returns:
+            Broj obrisanih redova
+        """
+        try:
+            with self.get_connection() as conn:
+                total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM cache").fetchone()[0]
+                if total <= max_bytes:
+                    return 0
+                
+                to_free = total - max_bytes
+                victims = []
+                for row in conn.execute("SELECT id, size_bytes FROM cache ORDER BY expires_at ASC"):
+                    victims.append(row['id'])
+                    to_free -= row['size_bytes'] or 0
+                    if to_free <= 0:
+                        break
+                
+                for start in range(0, len(victims), 500):
+                    chunk = victims[start:start + 500]
+                    conn.execute(f"DELETE FROM cache WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+                conn.commit()
+                return len(victims)
+        except Exception as e:
+            logger.error(f"Greška pri primeni cache budžeta: {e}")
+            return 0
+    
+    def get_cache_table_stats(self) -> Dict[str, Any]:
+        """Statistike cache tabele"""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    """SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS total_bytes,
+                              COALESCE(SUM(CASE WHEN expires_at <= ? THEN 1 ELSE 0 END), 0) AS expired
+                       FROM cache""",
+                    (datetime.now().isoformat(),)
+                ).fetchone()
+                return {'entries': row['entries'], 'total_bytes': row['total_bytes'], 'expired': row['expired']}
+        except Exception as e:
+            logger.error(f"Greška pri dohvatanju statistika cache tabele: {e}")
+            return {}
+    
     def clear_cache(self, cache_type: str = None) -> bool:
         """Briše cache"""
         try:
@@ -350,6 +350,12 @@ class OCRError(AcAIAException):
     def __init__(self, message: str, error_code: str = None):
         super().__init__(message, ErrorCategory.OCR, ErrorSeverity.MEDIUM, error_code)
 
+class RateLimitError(AcAIAException):
+    """Greška kada je kapacitet servisa popunjen (429)"""
+    def __init__(self, message: str, retry_after: int = 1, error_code: str = None):
+        super().__init__(message, ErrorCategory.RATE_LIMIT, ErrorSeverity.LOW, error_code)
+        self.retry_after = retry_after
+
 # FastAPI middleware za error handling
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
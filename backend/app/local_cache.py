@@ -0,0 +1,103 @@
+"""
+Local Cache
+Ograničen in-process LRU/TTL cache (L1 ispred Redis-a)
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+_MISSING = object()
+
+class LocalTTLCache:
+    """
+    LRU cache sa TTL-om po unosu
+
+    Nije thread-safe - koristi se samo iz event loop-a (CacheManager).
+    """
+
+    def __init__(self, max_entries: int = 2048, default_ttl: float = 60.0):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        # key -> (expires_at, value)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dohvati vrednost (osvežava LRU redosled)"""
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            self.stats['misses'] += 1
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Sačuvaj vrednost; TTL ne može biti duži od default_ttl"""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        self.stats['sets'] += 1
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def delete(self, key: str) -> bool:
+        """Ukloni ključ"""
+        if self._data.pop(key, _MISSING) is _MISSING:
+            return False
+        self.stats['invalidations'] += 1
+        return True
+
+    def clear(self, prefix: str = "") -> int:
+        """Ukloni sve ključeve sa prefiksom (prazan prefiks = sve)"""
+        if not prefix:
+            cleared = len(self._data)
+            self._data.clear()
+        else:
+            keys = [key for key in self._data if key.startswith(prefix)]
+            for key in keys:
+                del self._data[key]
+            cleared = len(keys)
+        self.stats['invalidations'] += cleared
+        return cleared
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistike L1 cache-a"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': len(self._data),
+            'max_entries': self.max_entries,
+            'ttl': self.default_ttl,
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'hit_rate': round(self.stats['hits'] / lookups * 100, 2) if lookups else 0.0,
+            'sets': self.stats['sets'],
+            'evictions': self.stats['evictions'],
+            'expirations': self.stats['expirations'],
+            'invalidations': self.stats['invalidations']
+        }
@@ -12,7 +12,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, WebSocket, WebSocketDisconnect, Request, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import sys
 import asyncio
 import hashlib
@@ -28,15 +28,8 @@ try:
     import PyPDF2
 except ImportError:
     PyPDF2 = None
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 # Konfiguracija logging-a
 logger = logging.getLogger(__name__)
@@ -50,16 +43,19 @@ from .rag_service import RAGService
 from .ocr_service import OCRService
 from .config import Config
 from .cache_manager import cache_manager, get_cached_ai_response, set_cached_ai_response
+from .cache_metrics import cache_telemetry
 from .openai_service import openai_service
-from .background_tasks import task_manager, add_background_task, get_task_status, cancel_task, get_all_tasks, get_task_stats
+from .background_tasks import task_manager, add_background_task, get_task_status, cancel_task, get_all_tasks, get_task_stats, report_task_progress, is_current_task_cancelled
 from .websocket import websocket_manager, WebSocketMessage, MessageType
 from .exam_service import get_exam_service
 from .problem_generator import get_problem_generator, Subject, Difficulty, ProblemType
 from .error_handler import (
     error_handler, handle_api_error, ErrorCategory, ErrorSeverity,
     AcAIAException, ValidationError, ExternalServiceError, RAGError, OCRError,
-    ErrorHandlingMiddleware
+    RateLimitError, ErrorHandlingMiddleware
 )
+from .admission_control import admission_controller
+from .warmup import WarmupManager
 from .query_rewriter import QueryRewriter
 from .fact_checker import FactChecker, FactCheckResult
 from .study_journal_service import study_journal_service
@@ -95,7 +91,7 @@ async def acaia_exception_handler(request: Request, exc: AcAIAException):
 from .database_manager import get_db_manager, init_database
 
 # Auth manager
-from .auth import UserManager
+from .auth import UserManager, auth_manager
 
 # Inicijalizuj bazu podataka
 db_manager = get_db_manager()
@@ -140,8 +136,13 @@ def save_documents():
 # Inicijalizuj servise
 rag_service = RAGService(use_supabase=False)
 ocr_service = OCRService()
+# Semantic cache deli embedding model sa RAG servisom
+cache_manager.enable_semantic_cache(rag_service.embedding_model)
 query_rewriter = QueryRewriter()
 fact_checker = FactChecker()
+# Warm-up pri startup-u (readiness se prijavljuje tek posle njega)
+warmup_manager = WarmupManager(db_manager, rag_service, top_n=Config.WARMUP_TOP_N, timeout=Config.WARMUP_TIMEOUT)
+warmup_task = None
 
 # Connection Pooling za HTTP klijente
 http_session = None
@@ -172,6 +173,32 @@ async def get_http_session():
         )
     return http_session
 
+def get_client_key(request: Request) -> str:
+    """
+    Identifikator klijenta za admission control (korisnik ili IP adresa)
+    
+    Korisnik se prepoznaje samo po verifikovanom JWT tokenu - ID koji klijent
+    sam šalje (npr. X-User-ID header) mogao bi da menja na svakom zahtevu i
+    tako zaobiđe limit po korisniku.
+    """
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        try:
+            payload = auth_manager.verify_token(authorization[len("Bearer "):])
+        except Exception:
+            payload = None
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def rate_limit_exception(error: RateLimitError) -> HTTPException:
+    """Konvertuje RateLimitError u 429 odgovor sa Retry-After headerom"""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 def get_conversation_context(session_id: str, max_messages: int = 10) -> str:
     """Dohvati prethodne poruke za kontekst iz lokalnog storage-a"""
     try:
@@ -269,6 +296,14 @@ async def health_check():
         "version": "3.0.0"
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness - instanca prima saobraćaj tek posle warm-up faze"""
+    status = warmup_manager.get_status()
+    if not warmup_manager.is_ready():
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": status})
+    return {"status": "ready", "warmup": status}
+
 # ============================================================================
 # CHAT ENDPOINTS
 # ============================================================================
@@ -320,32 +355,19 @@ async def chat_stream_endpoint(message: dict):
         # Kreiraj messages za OpenAI
         messages = [{"role": "user", "content": enhanced_prompt}]
         
-        # Pozovi OpenAI sa streaming
-        try:
-            response = await openai_service.chat_completion(
-                messages=messages,
-                model="gpt-4",
-                stream=True
-            )
-            
-            # Vraćamo streaming response
-            return StreamingResponse(
-                stream_chat_response(response, session_id or "", content, user_id),
-                media_type="text/plain",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "*"
-                }
-            )
-            
-        except Exception as e:
-            logger.error(f"Greška pri streaming pozivu: {e}")
-            return StreamingResponse(
-                stream_error_response(f"Greška pri komunikaciji sa AI servisom: {str(e)}"),
-                media_type="text/plain"
-            )
+        # OpenAI stream se otvara tek u generatoru - ako se telo odgovora nikad
+        # ne pokrene (klijent ode pre početka), upstream zahtev se ni ne šalje
+        return StreamingResponse(
+            stream_chat_response(messages, session_id or "", content, user_id),
+            media_type="text/plain",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Headers": "*"
+            }
+        )
             
     except ValidationError as e:
         logger.error(f"Validation error: {e}")
@@ -354,64 +376,159 @@ async def chat_stream_endpoint(message: dict):
         logger.error(f"Streaming chat error: {e}")
         raise HTTPException(status_code=500, detail="Streaming chat processing failed")
 
-async def stream_chat_response(openai_response, session_id: str, user_content: str, user_id: str):
-    """Stream chat response iz OpenAI-a"""
+# Oznaka kraja upstream stream-a u redu chunk-ova
+STREAM_END = object()
+
+async def stream_chat_response(messages: List[Dict[str, str]], session_id: str, user_content: str, user_id: str):
+    """
+    Stream chat response iz OpenAI-a
+    
+    Upstream zahtev se šalje tek kad Starlette počne da šalje telo odgovora,
+    pa se otvoren stream uvek zatvara u finally ovog generatora. Stream čita
+    poseban task u ograničen red: kad klijent sporo čita, red se napuni i
+    čitanje sa OpenAI-a staje (backpressure). Kad se klijent diskonektuje,
+    Starlette prekida generator - task se otkazuje, a upstream zahtev
+    zatvara da se generisanje ne bi plaćalo do kraja.
+    """
+    try:
+        openai_response = await openai_service.chat_completion(
+            messages=messages,
+            model="gpt-4",
+            stream=True
+        )
+    except Exception as e:
+        logger.error(f"Greška pri streaming pozivu: {e}")
+        async for chunk in stream_error_response(f"Greška pri komunikaciji sa AI servisom: {str(e)}"):
+            yield chunk
+        return
+    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=Config.STREAM_BUFFER_SIZE)
+    
+    async def pump():
+        try:
+            async for chunk in openai_response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    await queue.put(chunk.choices[0].delta.content)
+            await queue.put(STREAM_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+    
+    full_response = ""
+    message_id = str(uuid.uuid4())
+    completed = False
+    producer = asyncio.create_task(pump())
+    
     try:
-        full_response = ""
-        message_id = str(uuid.uuid4())
-        
         # Pošalji početak poruke
         yield f"data: {json.dumps({'type': 'start', 'message_id': message_id})}\n\n"
         
-        # Stream odgovor - OpenAI response je generator, ne async generator
-        for chunk in openai_response:
-            if hasattr(chunk.choices[0], 'delta') and chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
-                full_response += content
-                
-                # Pošalji chunk
-                yield f"data: {json.dumps({'type': 'chunk', 'content': content})}\n\n"
+        while True:
+            item = await queue.get()
+            if item is STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            full_response += item
+            
+            # Pošalji chunk
+            yield f"data: {json.dumps({'type': 'chunk', 'content': item})}\n\n"
         
         # Pošalji kraj poruke
         yield f"data: {json.dumps({'type': 'end', 'message_id': message_id})}\n\n"
+        completed = True
         
-        # Sačuvaj u bazu podataka ako postoji session_id
+    except Exception as e:
+        logger.error(f"Greška u streaming response: {e}")
+        yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        await openai_service.close_stream(openai_response, cancelled=not completed)
+    
+    # Prekinut ili neuspeo odgovor se ne čuva
+    if not completed:
+        return
+    
+    try:
+        # Sačuvaj u bazu podataka ako postoji session_id (van event loop-a)
         if session_id:
-            # Sačuvaj korisničku poruku
-            user_message_id = str(uuid.uuid4())
-            db_manager.save_chat_message(
-                session_id=session_id,
-                message_id=user_message_id,
-                sender="user",
-                content=user_content,
-                metadata={"user_id": user_id}
-            )
-            
-            # Sačuvaj AI odgovor
-            ai_message_id = str(uuid.uuid4())
-            db_manager.save_chat_message(
-                session_id=session_id,
-                message_id=ai_message_id,
-                sender="assistant",
-                content=full_response,
-                metadata={"user_id": "ai_assistant"}
-            )
-            
-            # Ažuriraj session last_accessed
-            db_manager.update_session(session_id, last_accessed=datetime.now().isoformat())
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, save_stream_exchange, session_id, user_content, full_response, user_id)
         
         # Sačuvaj u cache
         cache_key = f"chat:{hashlib.md5(user_content.encode()).hexdigest()}"
-        await set_cached_ai_response(cache_key, full_response)
-        
+        await set_cached_ai_response(cache_key, full_response, semantic_query=user_content)
     except Exception as e:
-        logger.error(f"Greška u streaming response: {e}")
-        yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+        logger.error(f"Greška pri čuvanju streaming odgovora: {e}")
+
+def save_stream_exchange(session_id: str, user_content: str, response: str, user_id: str):
+    """Sačuvaj korisničku poruku i AI odgovor iz streaming-a u bazu"""
+    # Sačuvaj korisničku poruku
+    db_manager.save_chat_message(
+        session_id=session_id,
+        message_id=str(uuid.uuid4()),
+        sender="user",
+        content=user_content,
+        metadata={"user_id": user_id}
+    )
+    
+    # Sačuvaj AI odgovor
+    db_manager.save_chat_message(
+        session_id=session_id,
+        message_id=str(uuid.uuid4()),
+        sender="assistant",
+        content=response,
+        metadata={"user_id": "ai_assistant"}
+    )
+    
+    # Ažuriraj session last_accessed
+    db_manager.update_session(session_id, last_accessed=datetime.now().isoformat())
 
 async def stream_error_response(error_message: str):
     """Stream error response"""
     yield f"data: {json.dumps({'type': 'error', 'message': error_message})}\n\n"
 
+async def generate_chat_response(cache_key: str, content: str, context: str = "") -> Dict[str, Any]:
+    """Pozovi AI model i sačuvaj odgovor u cache (jedan poziv po cache ključu)"""
+    # Kreiraj poboljšani prompt
+    enhanced_prompt = create_enhanced_prompt(content, context)
+    
+    # Pozovi AI model
+    start_time = time.time()
+    ai_response = await ai_chat_async(
+        model="gpt-4",
+        messages=[{"role": "user", "content": enhanced_prompt}],
+        stream=False
+    )
+    response_time = time.time() - start_time
+    
+    response_content = ai_response['message']['content']
+    
+    # Sačuvaj u cache
+    await set_cached_ai_response(cache_key, response_content, response_time=response_time, semantic_query=content)
+    
+    return {"response": response_content, "response_time": response_time}
+
+def chat_flight_key(cache_key: str, context: str) -> str:
+    """
+    Single-flight ključ chat odgovora - odgovor zavisi i od konteksta sesije,
+    pa isti poziv AI modela dele samo zahtevi sa istim kontekstom
+    """
+    if not context:
+        return cache_key
+    return f"{cache_key}:ctx:{hashlib.md5(context.encode()).hexdigest()}"
+
+async def refresh_chat_response(cache_key: str, content: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """Stale-while-revalidate osvežavanje - isti prompt kao pri promašaju (sa kontekstom sesije)"""
+    context = await get_conversation_context_async(session_id) if session_id else ""
+    return await generate_chat_response(cache_key, content, context)
+
 @app.post("/chat")
 async def chat_endpoint(message: dict):
     """Glavni chat endpoint"""
@@ -429,11 +546,33 @@ async def chat_endpoint(message: dict):
         
         if cached_response:
             logger.info(f"Cache hit za: {content[:50]}...")
+            stale = cache_manager.is_stale(cached_response)
+            if stale:
+                # Stale-while-revalidate: odmah vrati stari odgovor, osveži u pozadini
+                cache_manager.revalidate(cache_key, lambda: refresh_chat_response(cache_key, content, session_id))
             return {
                 "status": "success",
                 "data": {
                     "response": cached_response.get('response', ''),
                     "cached": True,
+                    "stale": stale,
+                    "session_id": session_id
+                }
+            }
+        
+        # Semantic cache - parafrazirano pitanje koje je već odgovoreno
+        semantic_response = None
+        if cache_manager.semantic_index.is_ready():
+            semantic_response = await cache_manager.get_semantic_cache(content)
+        if semantic_response:
+            logger.info(f"Semantic cache hit ({semantic_response.get('similarity_score', 0):.3f}) za: {content[:50]}...")
+            return {
+                "status": "success",
+                "data": {
+                    "response": semantic_response.get('response', ''),
+                    "cached": True,
+                    "semantic_match": True,
+                    "similarity_score": semantic_response.get('similarity_score'),
                     "session_id": session_id
                 }
             }
@@ -443,22 +582,12 @@ async def chat_endpoint(message: dict):
         if session_id:
             context = await get_conversation_context_async(session_id)
         
-        # Kreiraj poboljšani prompt
-        enhanced_prompt = create_enhanced_prompt(content, context)
-        
-        # Pozovi AI model
-        start_time = time.time()
-        ai_response = await ai_chat_async(
-            model="gpt-4",
-            messages=[{"role": "user", "content": enhanced_prompt}],
-            stream=False
+        # Istovremeni identični zahtevi (isti sadržaj i kontekst) čekaju jedan poziv AI modela
+        result, coalesced = await cache_manager.coalesce(
+            chat_flight_key(cache_key, context), lambda: generate_chat_response(cache_key, content, context)
         )
-        response_time = time.time() - start_time
-        
-        response_content = ai_response['message']['content']
-        
-        # Sačuvaj u cache
-        await set_cached_ai_response(cache_key, response_content)
+        response_content = result['response']
+        response_time = result['response_time']
         
         # Sačuvaj u bazu podataka ako postoji session_id
         if session_id:
@@ -491,7 +620,8 @@ async def chat_endpoint(message: dict):
                 "response": response_content,
                 "session_id": session_id,
                 "response_time": response_time,
-                "cached": False
+                "cached": False,
+                "coalesced": coalesced
             }
         }
         
@@ -832,6 +962,110 @@ def calculate_response_times(messages: list) -> dict:
 # RAG ENDPOINTS
 # ============================================================================
 
+async def retrieve_chunks(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Pretraga sa retrieval cache-om
+    
+    Kešira se rangirana lista chunk ID-jeva po (upit, generacija indeksa, top_k),
+    pa se encode + FAISS pretraga preskaču i kada LLM odgovor mora ponovo da se generiše.
+    """
+    generation = rag_service.get_generation()
+    if Config.RETRIEVAL_CACHE_ENABLED:
+        hits = await cache_manager.get_retrieval_result(query, generation, top_k)
+        if hits is not None:
+            results = rag_service.get_chunks(hits)
+            if results is not None:
+                logger.info(f"Retrieval cache hit za: {query[:50]}...")
+                return results
+    
+    loop = asyncio.get_running_loop()
+    rag_results = await loop.run_in_executor(None, rag_service.search, query, top_k)
+    
+    if Config.RETRIEVAL_CACHE_ENABLED and rag_results:
+        hits = [[result['id'], result['score']] for result in rag_results]
+        await cache_manager.set_retrieval_result(query, generation, top_k, hits, ttl=Config.RETRIEVAL_CACHE_TTL)
+    return rag_results
+
+def rag_cache_key(query: str) -> str:
+    """Cache ključ RAG odgovora - generacija indeksa u ključu: posle upload-a/brisanja
+    stari odgovori više nisu dostupni, bez brisanja cache-a"""
+    return f"rag:g{rag_service.get_generation()}:{hashlib.md5(query.encode()).hexdigest()}"
+
+async def warm_rag_answer(query: str) -> bool:
+    """Warm-up: dohvati keširan RAG odgovor (L2 -> Redis -> L1)"""
+    return await get_cached_ai_response(rag_cache_key(query)) is not None
+
+async def generate_rag_response(cache_key: str, query: str) -> Dict[str, Any]:
+    """RAG pretraga + poziv AI modela i čuvanje odgovora u cache (jedan poziv po cache ključu)"""
+    # RAG search
+    search_time = time.time()
+    rag_results = await retrieve_chunks(query, top_k=5)
+    search_time = time.time() - search_time
+    
+    # Kreiraj kontekst
+    if rag_results:
+        # Loguj rezultate za debugging
+        logger.info(f"RAG rezultati: {len(rag_results)} rezultata")
+        for i, result in enumerate(rag_results):
+            logger.info(f"Rezultat {i+1}: keys={list(result.keys())}, content_exists={'content' in result}")
+        
+        # Filtriraj rezultate koji imaju content
+        valid_results = [result for result in rag_results if 'content' in result and result['content']]
+        logger.info(f"Validnih rezultata: {len(valid_results)}")
+        
+        if valid_results:
+            # Ograniči dužinu konteksta na ~1000 karaktera (otprilike 250 tokena)
+            max_context_length = 1000
+            context_parts = []
+            current_length = 0
+            
+            for i, result in enumerate(valid_results):
+                source_text = f"Source {i+1}: {result['content']}"
+                if current_length + len(source_text) > max_context_length:
+                    break
+                context_parts.append(source_text)
+                current_length += len(source_text)
+            
+            context = "\n\n".join(context_parts)
+            logger.info(f"Kontekst dužina: {len(context)} karaktera")
+            
+            sources = [
+                {
+                    "title": result.get('metadata', {}).get('filename', f'Source {i+1}'),
+                    "content": result['content'][:200] + "...",
+                    "score": result.get('score', 0)
+                }
+                for i, result in enumerate(valid_results)
+            ]
+        else:
+            # Ako nema validnih rezultata, koristi običan prompt
+            context = ""
+            sources = []
+            logger.warning("Nema validnih RAG rezultata sa content poljem")
+        
+        # Kreiraj pojednostavljen prompt sa RAG kontekstom
+        rag_prompt = f"Ti si AI Study Assistant. Odgovaraj na srpskom.\n\nRelevant sources:\n{context}\n\nUser question: {query}\n\nAI Assistant:"
+        logger.info(f"Prompt dužina: {len(rag_prompt)} karaktera")
+    else:
+        # Ako nema dokumenata, koristi običan prompt
+        context = ""
+        sources = []
+        rag_prompt = f"Ti si AI Study Assistant. Odgovaraj na srpskom.\n\nKorisnik: {query}\n\nAI Assistant:"
+    
+    # Pozovi AI model (placeholder)
+    ai_response = await ai_chat_async(
+        model="gpt-4",
+        messages=[{"role": "user", "content": rag_prompt}],
+        stream=False
+    )
+    
+    response_content = ai_response['message']['content']
+    
+    # Sačuvaj u cache (ključ sadrži generaciju indeksa, pa TTL može biti dug)
+    await set_cached_ai_response(cache_key, response_content, ttl=Config.RAG_CACHE_TTL)
+    
+    return {"response": response_content, "sources": sources, "search_time": search_time}
+
 @app.post("/chat/rag")
 async def rag_chat_endpoint(message: dict):
     """RAG chat endpoint"""
@@ -842,98 +1076,44 @@ async def rag_chat_endpoint(message: dict):
         session_id = message.get('session_id')
         query = message['query']
         
+        # Upit ide u analytics tabelu - izvor za warm-up sledećih instanci
+        asyncio.get_running_loop().run_in_executor(None, warmup_manager.log_query, query, "rag_query", session_id)
+        
         # Proveri cache
-        cache_key = f"rag:{hashlib.md5(query.encode()).hexdigest()}"
+        cache_key = rag_cache_key(query)
         cached_response = await get_cached_ai_response(cache_key)
         
         if cached_response:
+            stale = cache_manager.is_stale(cached_response)
+            if stale:
+                cache_manager.revalidate(cache_key, lambda: generate_rag_response(cache_key, query))
             return {
                 "status": "success",
                 "data": {
-                    "response": cached_response,
+                    "response": cached_response.get('response', ''),
                     "cached": True,
+                    "stale": stale,
                     "session_id": session_id
                 }
             }
         
         start_time = time.time()
         
-        # RAG search
-        search_time = time.time()
-        rag_results = rag_service.search(query, limit=5)
-        search_time = time.time() - search_time
-        
-        # Kreiraj kontekst
-        if rag_results:
-            # Loguj rezultate za debugging
-            logger.info(f"RAG rezultati: {len(rag_results)} rezultata")
-            for i, result in enumerate(rag_results):
-                logger.info(f"Rezultat {i+1}: keys={list(result.keys())}, content_exists={'content' in result}")
-            
-            # Filtriraj rezultate koji imaju content
-            valid_results = [result for result in rag_results if 'content' in result and result['content']]
-            logger.info(f"Validnih rezultata: {len(valid_results)}")
-            
-            if valid_results:
-                # Ograniči dužinu konteksta na ~1000 karaktera (otprilike 250 tokena)
-                max_context_length = 1000
-                context_parts = []
-                current_length = 0
-                
-                for i, result in enumerate(valid_results):
-                    source_text = f"Source {i+1}: {result['content']}"
-                    if current_length + len(source_text) > max_context_length:
-                        break
-                    context_parts.append(source_text)
-                    current_length += len(source_text)
-                
-                context = "\n\n".join(context_parts)
-                logger.info(f"Kontekst dužina: {len(context)} karaktera")
-                
-                sources = [
-                    {
-                        "title": result.get('metadata', {}).get('filename', f'Source {i+1}'),
-                        "content": result['content'][:200] + "...",
-                        "score": result.get('score', 0)
-                    }
-                    for i, result in enumerate(valid_results)
-                ]
-            else:
-                # Ako nema validnih rezultata, koristi običan prompt
-                context = ""
-                sources = []
-                logger.warning("Nema validnih RAG rezultata sa content poljem")
-            
-            # Kreiraj pojednostavljen prompt sa RAG kontekstom
-            rag_prompt = f"Ti si AI Study Assistant. Odgovaraj na srpskom.\n\nRelevant sources:\n{context}\n\nUser question: {query}\n\nAI Assistant:"
-            logger.info(f"Prompt dužina: {len(rag_prompt)} karaktera")
-        else:
-            # Ako nema dokumenata, koristi običan prompt
-            context = ""
-            sources = []
-            rag_prompt = f"Ti si AI Study Assistant. Odgovaraj na srpskom.\n\nKorisnik: {query}\n\nAI Assistant:"
-        
-        # Pozovi AI model (placeholder)
-        ai_response = await ai_chat_async(
-            model="gpt-4",
-            messages=[{"role": "user", "content": rag_prompt}],
-            stream=False
+        # Istovremeni identični upiti dele jednu pretragu i jedan poziv AI modela
+        result, coalesced = await cache_manager.coalesce(
+            cache_key, lambda: generate_rag_response(cache_key, query)
         )
-        
-        response_content = ai_response['message']['content']
         total_time = time.time() - start_time
         
-        # Sačuvaj u cache
-        await set_cached_ai_response(cache_key, response_content)
-        
         return {
             "status": "success",
             "data": {
-                "response": response_content,
-                "sources": sources,
-                "search_time": search_time,
+                "response": result['response'],
+                "sources": result['sources'],
+                "search_time": result['search_time'],
                 "total_time": total_time,
                 "cached": False,
+                "coalesced": coalesced,
                 "session_id": session_id
             }
         }
@@ -950,7 +1130,7 @@ async def rag_chat_endpoint(message: dict):
 # ============================================================================
 
 @app.post("/documents/upload")
-async def upload_document(file: UploadFile = File(...)):
+async def upload_document(request: Request, file: UploadFile = File(...)):
     """Upload dokumenta sa automatskom ekstrakcijom teksta za RAG"""
     try:
         if not file.filename:
@@ -975,53 +1155,56 @@ async def upload_document(file: UploadFile = File(...)):
         if file.content_type not in allowed_types:
             raise ValidationError(f"Unsupported file type: {file.content_type}")
         
-        # Procesiraj dokument
-        content = await file.read()
-        doc_id = str(uuid.uuid4())
-        extracted_text = ""
-        
-        # Ekstrakcija teksta po tipu fajla
-        if file.content_type.startswith('text/'):
-            extracted_text = content.decode('utf-8', errors='ignore')
-        elif file.content_type == 'application/pdf' and PyPDF2:
-            try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(content))
-                extracted_text = "\n".join([page.extract_text() or '' for page in pdf_reader.pages])
-            except Exception as e:
-                logger.error(f"PDF extraction error: {e}")
-        elif file.content_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'] and docx:
-            try:
-                doc = docx.Document(BytesIO(content))
-                extracted_text = "\n".join([p.text for p in doc.paragraphs])
-            except Exception as e:
-                logger.error(f"DOCX extraction error: {e}")
-        elif file.content_type in ['image/png', 'image/jpeg', 'image/jpg'] and pytesseract and Image:
-            try:
-                image = Image.open(BytesIO(content))
-                extracted_text = pytesseract.image_to_string(image)
-            except Exception as e:
-                logger.error(f"OCR extraction error: {e}")
-        else:
-            logger.warning(f"Ekstrakcija teksta nije podržana za: {file.content_type}")
-        
-        document_data = {
-            "doc_id": doc_id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "size": len(content),
-            "user_id": "default_user",
-            "created_at": datetime.now().isoformat(),
-            "content": extracted_text
-        }
-        documents[doc_id] = document_data
-        save_documents() # Sačuvaj dokument u fajl
-        
-        # Dodaj u vector store ako ima teksta
-        if extracted_text.strip():
-            rag_service.add_document(
-                content=extracted_text,
-                metadata={"filename": file.filename, "content_type": file.content_type}
-            )
+        # Admission control - ograniči broj istovremenih skupih obrada
+        async with admission_controller.slot(get_client_key(request)):
+            # Procesiraj dokument
+            content = await file.read()
+            doc_id = str(uuid.uuid4())
+            extracted_text = ""
+            
+            # Ekstrakcija teksta po tipu fajla
+            if file.content_type.startswith('text/'):
+                extracted_text = content.decode('utf-8', errors='ignore')
+            elif file.content_type == 'application/pdf' and PyPDF2:
+                try:
+                    pdf_reader = PyPDF2.PdfReader(BytesIO(content))
+                    extracted_text = "\n".join([page.extract_text() or '' for page in pdf_reader.pages])
+                except Exception as e:
+                    logger.error(f"PDF extraction error: {e}")
+            elif file.content_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'] and docx:
+                try:
+                    doc = docx.Document(BytesIO(content))
+                    extracted_text = "\n".join([p.text for p in doc.paragraphs])
+                except Exception as e:
+                    logger.error(f"DOCX extraction error: {e}")
+            elif file.content_type in ['image/png', 'image/jpeg', 'image/jpg']:
+                # OCR ide kroz async, keširan put na OCR executor-u
+                ocr_result = await ocr_service.extract_text_async(content, file.filename)
+                if ocr_result.get('status') == 'success':
+                    extracted_text = ocr_result.get('text', '')
+                else:
+                    logger.error(f"OCR extraction error: {ocr_result.get('message')}")
+            else:
+                logger.warning(f"Ekstrakcija teksta nije podržana za: {file.content_type}")
+            
+            document_data = {
+                "doc_id": doc_id,
+                "filename": file.filename,
+                "content_type": file.content_type,
+                "size": len(content),
+                "user_id": "default_user",
+                "created_at": datetime.now().isoformat(),
+                "content": extracted_text
+            }
+            # Dodaj u vector store ako ima teksta
+            if extracted_text.strip():
+                document_data["rag_doc_id"] = rag_service.add_document(
+                    content=extracted_text,
+                    metadata={"filename": file.filename, "content_type": file.content_type}
+                )
+            
+            documents[doc_id] = document_data
+            save_documents() # Sačuvaj dokument u fajl
         
         return {
             "status": "success",
@@ -1036,6 +1219,9 @@ async def upload_document(file: UploadFile = File(...)):
     except ValidationError as e:
         logger.error(f"Document upload validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitError as e:
+        logger.warning(f"Document upload odbijen (admission control): {e}")
+        raise rate_limit_exception(e)
     except Exception as e:
         logger.error(f"Document upload error: {e}")
         raise HTTPException(status_code=500, detail="Document upload failed")
@@ -1106,12 +1292,13 @@ async def delete_document(doc_id: str):
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Obriši dokument
-        del documents[doc_id]
+        doc_data = documents.pop(doc_id)
         save_documents() # Sačuvaj dokument u fajl
         
-        # Obriši iz vector store-a ako postoji
+        # Obriši iz vector store-a ako postoji (chunk-ovi nose RAG ID dokumenta)
         try:
-            rag_service.delete_document(doc_id)
+            if doc_data.get("rag_doc_id"):
+                rag_service.delete_document(doc_data["rag_doc_id"])
         except Exception as e:
             logger.warning(f"Failed to delete document from vector store: {e}")
         
@@ -1133,34 +1320,193 @@ async def delete_document(doc_id: str):
 # ============================================================================
 
 @app.post("/ocr/extract")
-async def extract_text_from_image(file: UploadFile = File(...)):
+async def extract_text_from_image(request: Request, file: UploadFile = File(...)):
     """Extract text from image"""
     try:
         if not file.filename:
             raise ValidationError("Filename is required")
         
-        # Procesiraj sliku
-        content = await file.read()
+        if not ocr_service.is_supported_format(file.filename):
+            raise ValidationError(f"Format slike nije podržan: {file.filename}")
         
-        # OCR processing
-        extracted_text = await ocr_service.extract_text_from_image(content)
+        # Admission control - ograniči broj istovremenih OCR obrada
+        async with admission_controller.slot(get_client_key(request)):
+            # Procesiraj sliku
+            content = await file.read()
+            
+            # OCR processing (async, keširano, na OCR executor-u)
+            ocr_result = await ocr_service.extract_text_async(content, file.filename)
+        
+        if ocr_result.get('status') != 'success':
+            raise OCRError(ocr_result.get('message', 'OCR processing failed'), "OCR_EXTRACTION_FAILED")
         
         return {
             "status": "success",
             "data": {
-                "extracted_text": extracted_text,
+                "extracted_text": ocr_result.get('text', ''),
                 "filename": file.filename,
-                "confidence": 0.85  # Placeholder
+                "confidence": ocr_result.get('confidence', 0.0),
+                "processing_time": ocr_result.get('processing_time', 0.0)
             }
         }
         
     except ValidationError as e:
         logger.error(f"OCR validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitError as e:
+        logger.warning(f"OCR zahtev odbijen (admission control): {e}")
+        raise rate_limit_exception(e)
     except Exception as e:
         logger.error(f"OCR error: {e}")
         raise HTTPException(status_code=500, detail="OCR processing failed")
 
+@app.post("/ocr/extract-async")
+async def extract_document_async(file: UploadFile = File(...)):
+    """
+    OCR višestraničnog dokumenta (TIFF, skenirani PDF) u pozadini
+    
+    Vraća task_id; napredak po stranici se prati preko /tasks/{task_id}.
+    """
+    try:
+        if not file.filename:
+            raise ValidationError("Filename is required")
+        
+        if not (ocr_service.is_document_format(file.filename) or ocr_service.is_supported_format(file.filename)):
+            raise ValidationError(f"Format dokumenta nije podržan: {file.filename}")
+        
+        content = await file.read()
+        if not Config.is_file_size_valid(len(content)):
+            raise ValidationError(f"Fajl je prevelik (max {Config.MAX_FILE_SIZE} bajtova)")
+        
+        pages_total = await asyncio.get_running_loop().run_in_executor(
+            ocr_service.page_executor, ocr_service.get_page_count, content, file.filename
+        )
+        if pages_total > ocr_service.document_max_pages:
+            raise ValidationError(f"Dokument ima više od {ocr_service.document_max_pages} stranica")
+        
+        task_id = await add_background_task(
+            run_document_ocr, content, file.filename,
+            description=f"ocr_document:{file.filename}"
+        )
+        
+        return {
+            "status": "accepted",
+            "task_id": task_id,
+            "filename": file.filename,
+            "pages_total": pages_total
+        }
+        
+    except ValidationError as e:
+        logger.error(f"OCR document validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except OCRError as e:
+        logger.error(f"OCR document error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        # Pun red background taskova
+        logger.warning(f"OCR document task odbijen: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"OCR document error: {e}")
+        raise HTTPException(status_code=500, detail="OCR document processing failed")
+
+async def run_document_ocr(content: bytes, filename: str) -> Dict[str, Any]:
+    """Background task - OCR dokumenta sa napretkom po stranici u statusu taska"""
+    def on_progress(state: Dict[str, Any]):
+        report_task_progress(state['pages_done'] / max(state['pages_total'], 1) * 100.0, **state)
+    
+    return await ocr_service.extract_document(
+        content, filename,
+        progress_callback=on_progress,
+        is_cancelled=is_current_task_cancelled
+    )
+
+@app.get("/tasks/{task_id}")
+async def get_background_task_status(task_id: str):
+    """Status background taska (napredak, metadata, rezultat)"""
+    status = await get_task_status(task_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task nije pronađen")
+    return {"status": "success", "data": status}
+
+@app.delete("/tasks/{task_id}")
+async def cancel_background_task(task_id: str):
+    """Otkaži background task"""
+    if not await cancel_task(task_id):
+        raise HTTPException(status_code=404, detail="Task nije pronađen ili je već završen")
+    return {"status": "success", "message": "Task otkazan"}
+
+@app.post("/ocr/batch-extract")
+async def batch_extract_text(request: Request, files: List[UploadFile] = File(...),
+                             max_concurrency: Optional[int] = None):
+    """
+    Batch OCR - paralelna obrada više slika sa NDJSON streamingom
+    
+    Svaki red odgovora je jedan JSON objekat: rezultat za sliku čim je gotov
+    (cache hit-ovi odmah), a poslednji red je sažetak batch-a.
+    """
+    try:
+        if not files:
+            raise ValidationError("Nije prosleđena nijedna slika")
+        
+        if len(files) > Config.OCR_BATCH_MAX_FILES:
+            raise ValidationError(f"Maksimalno {Config.OCR_BATCH_MAX_FILES} slika po batch-u")
+        
+        # Ceo batch zauzima jedan admission slot; slot se oslobađa tek kada
+        # se stream završi (ili klijent prekine vezu)
+        client_key = get_client_key(request)
+        await admission_controller.acquire(client_key)
+        admitted_at = time.monotonic()
+        
+        async def release_slot():
+            await admission_controller.release(client_key, time.monotonic() - admitted_at)
+        
+        try:
+            images = [(file.filename or f"image_{i}", await file.read()) for i, file in enumerate(files)]
+        except Exception:
+            await release_slot()
+            raise
+        
+        return StreamingResponse(
+            stream_batch_ocr(images, max_concurrency),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache"},
+            background=BackgroundTask(release_slot)
+        )
+        
+    except ValidationError as e:
+        logger.error(f"Batch OCR validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitError as e:
+        logger.warning(f"Batch OCR odbijen (admission control): {e}")
+        raise rate_limit_exception(e)
+    except Exception as e:
+        logger.error(f"Batch OCR error: {e}")
+        raise HTTPException(status_code=500, detail="Batch OCR processing failed")
+
+async def stream_batch_ocr(images: list, max_concurrency: Optional[int] = None):
+    """Stream rezultata batch OCR-a kao NDJSON"""
+    start_time = time.time()
+    summary = {"type": "summary", "total": len(images), "succeeded": 0, "failed": 0, "cached": 0}
+    
+    try:
+        async for item in ocr_service.extract_text_batch_stream(images, max_concurrency=max_concurrency):
+            result = item['result']
+            if result.get('status') == 'success':
+                summary['succeeded'] += 1
+            else:
+                summary['failed'] += 1
+            if result.get('cached'):
+                summary['cached'] += 1
+            
+            yield json.dumps({"type": "result", **item}, ensure_ascii=False, default=str) + "\n"
+    except Exception as e:
+        logger.error(f"Greška u batch OCR stream-u: {e}")
+        yield json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False) + "\n"
+    
+    summary['total_time'] = time.time() - start_time
+    yield json.dumps(summary) + "\n"
+
 # ============================================================================
 # STARTUP & SHUTDOWN EVENTS
 # ============================================================================
@@ -1170,14 +1516,17 @@ async def startup_event():
     """Startup event"""
     print("🚀 AcAIA Backend - Čista verzija se pokreće...")
     
-    # Inicijalizuj cache
-    if cache_manager.is_available():
+    # Inicijalizuj cache (ping otvara circuit breaker ako Redis ne radi)
+    if await cache_manager.ping():
         print("✅ Cache manager inicijalizovan")
     else:
-        print("⚠️ Cache manager nije dostupan")
+        print("⚠️ Redis nije dostupan - cache koristi lokalni in-memory backend")
     
     # Inicijalizuj background tasks
     await task_manager.start()
+    
+    # L1 cache invalidacije između workera, L2 batch upisi i sweeper
+    await cache_manager.start()
     print("✅ Background task manager pokrenut")
     
     # Inicijalizuj WebSocket manager
@@ -1188,6 +1537,16 @@ async def startup_event():
     load_documents()
     print("✅ Dokumenti učitani")
     
+    # Warm-up u pozadini - /health/ready vraća 503 dok se ne završi
+    global warmup_task
+    if Config.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(
+            warmup_manager.run(retrieve_chunks, warm_rag_answer if Config.WARMUP_LLM_CACHE else None)
+        )
+        print("🔥 Warm-up pokrenut")
+    else:
+        warmup_manager.state = "ready"
+    
     print("✅ AcAIA Backend uspešno pokrenut!")
 
 @app.on_event("shutdown")
@@ -1199,6 +1558,11 @@ async def shutdown_event():
     await task_manager.stop()
     print("✅ Background task manager zaustavljen")
     
+    await cache_manager.stop()
+    
+    # Zatvori OpenAI connection pool
+    await openai_service.close()
+    
     # Zaustavi WebSocket manager
     websocket_manager.stop()
     print("✅ WebSocket manager zaustavljen")
@@ -1225,12 +1589,14 @@ async def shutdown_event():
 
 @app.get("/cache/health")
 async def check_cache_health():
-    """Cache health check"""
+    """Cache health check (uključuje stanje circuit breaker-a i aktivni backend)"""
+    health = await cache_manager.health_check()
     return {
         "status": "success",
         "data": {
             "cache_available": cache_manager.is_available(),
-            "cache_stats": cache_manager.get_stats()
+            "health": health,
+            "backend": cache_manager.get_backend_state()
         }
     }
 
@@ -1239,17 +1605,31 @@ async def get_cache_stats():
     """Cache statistics"""
     return {
         "status": "success",
-        "data": cache_manager.get_stats()
+        "data": await cache_manager.get_stats()
     }
 
+@app.get("/cache/telemetry")
+async def get_cache_telemetry():
+    """Telemetrija cache-a po namespace-u (hit ratio, latencija, veličine, TTL efikasnost)"""
+    return {
+        "status": "success",
+        "data": cache_telemetry.get_stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrike (scrape target iz monitoring/prometheus.yml)"""
+    return PlainTextResponse(cache_telemetry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.post("/cache/clear")
 async def clear_cache():
     """Clear cache"""
-    cache_manager.clear()
+    deleted = await cache_manager.clear_cache()
     return {
         "status": "success",
         "data": {
-            "message": "Cache cleared successfully"
+            "message": "Cache cleared successfully",
+            "deleted_keys": deleted
         }
     }
 
@@ -1263,10 +1643,20 @@ async def get_performance_overview():
             "memory_usage": "placeholder",
             "cpu_usage": "placeholder",
             "active_connections": connection_pool_stats["active_connections"],
-            "total_requests": connection_pool_stats["total_requests"]
+            "total_requests": connection_pool_stats["total_requests"],
+            "admission": admission_controller.get_stats(),
+            "llm": openai_service.get_stats()
         }
     }
 
+@app.get("/performance/admission")
+async def get_admission_stats():
+    """Metrike admission control-a (dubina reda, vreme čekanja, odbijeni zahtevi)"""
+    return {
+        "status": "success",
+        "data": admission_controller.get_stats()
+    }
+
 # ============================================================================
 # SESSION METADATA ENDPOINTS
 # ============================================================================
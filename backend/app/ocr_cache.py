@@ -0,0 +1,334 @@
+"""
+OCR Cache Store
+Indeksirani SQLite cache za OCR rezultate sa LRU izbacivanjem po veličini
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Broj traka za multi-index pretragu perceptualnih heševa (64 bita / 8 traka).
+# Ako se dva heša razlikuju u najviše HASH_BANDS - 1 bitova, bar jedna traka
+# im je identična, pa je pretraga po trakama bez propuštenih kandidata.
+HASH_BANDS = 8
+HASH_BAND_BITS = 64 // HASH_BANDS
+
+def _to_signed64(value: int) -> int:
+    """SQLite INTEGER je signed 64-bit"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+def _to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+class OCRCacheStore:
+    """
+    Jedan SQLite fajl umesto JSON fajla po slici
+
+    - put/get su pojedinačni upiti po primarnom ključu
+    - ukupan broj i veličina se drže u memoriji, pa su statistike besplatne
+    - kada se pređe byte budžet, izbacuju se najdavnije korišćeni unosi
+    - sekundarni indeks perceptualnih heševa (pHash) i potpis slike za skoro iste slike
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 24 * 3600, eviction_batch: int = 64):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.eviction_batch = eviction_batch
+        self._lock = threading.Lock()
+
+        # Brojači koje održavamo inkrementalno
+        self._total_count = 0
+        self._total_bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._init_schema()
+
+    def _init_schema(self):
+        """Kreira tabelu i indekse, učitava početne brojače"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_accessed ON ocr_cache(last_accessed)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_created_at ON ocr_cache(created_at)")
+
+            # Perceptualni heševi - jedan red po (unos, tip heša) i trake za pretragu
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_phash (
+                    cache_key TEXT NOT NULL,
+                    hash_type TEXT NOT NULL,
+                    lang_key TEXT NOT NULL,
+                    hash INTEGER NOT NULL,
+                    PRIMARY KEY (cache_key, hash_type)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_phash_band (
+                    hash_type TEXT NOT NULL,
+                    lang_key TEXT NOT NULL,
+                    band INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    cache_key TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ocr_phash_band_lookup "
+                "ON ocr_phash_band(hash_type, lang_key, band, value)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_phash_band_key ON ocr_phash_band(cache_key)")
+            # Dimenzije i fini otisak sadržaja - provera kandidata nađenih po hešu
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_image_signature (
+                    cache_key TEXT PRIMARY KEY,
+                    width INTEGER NOT NULL,
+                    height INTEGER NOT NULL,
+                    fingerprint BLOB NOT NULL
+                )
+            """)
+            # Heševi nestaju zajedno sa unosom (eviction, TTL, clear)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_ocr_cache_delete AFTER DELETE ON ocr_cache
+                BEGIN
+                    DELETE FROM ocr_phash WHERE cache_key = OLD.cache_key;
+                    DELETE FROM ocr_phash_band WHERE cache_key = OLD.cache_key;
+                END
+            """)
+            self._conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_ocr_cache_delete_signature AFTER DELETE ON ocr_cache
+                BEGIN
+                    DELETE FROM ocr_image_signature WHERE cache_key = OLD.cache_key;
+                END
+            """)
+
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+            self._total_count, self._total_bytes = int(row[0]), int(row[1])
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Dohvati rezultat i osveži LRU vreme pristupa"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, created_at FROM ocr_cache WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, size, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._delete_locked(cache_key, size)
+                self._expirations += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE ocr_cache SET last_accessed = ? WHERE cache_key = ?",
+                (now, cache_key)
+            )
+
+        try:
+            return json.loads(value)
+        except ValueError:
+            logger.warning(f"Oštećen OCR cache unos: {cache_key}")
+            self.delete(cache_key)
+            return None
+
+    def put(self, cache_key: str, result: Dict[str, Any]):
+        """Sačuvaj rezultat i po potrebi izbaci najstarije unose"""
+        value = json.dumps(result, ensure_ascii=False, default=str, separators=(',', ':'))
+        size = len(value.encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM ocr_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+            self._conn.execute(
+                """INSERT OR REPLACE INTO ocr_cache
+                   (cache_key, value, size, created_at, last_accessed)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (cache_key, value, size, now, now)
+            )
+
+            if old is None:
+                self._total_count += 1
+            else:
+                self._total_bytes -= int(old[0])
+            self._total_bytes += size
+
+            self._evict_locked()
+
+    def delete(self, cache_key: str) -> bool:
+        """Obriši unos"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM ocr_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._delete_locked(cache_key, int(row[0]))
+            return True
+
+    def _delete_locked(self, cache_key: str, size: int):
+        """Briše unos (poziva se pod lock-om)"""
+        self._conn.execute("DELETE FROM ocr_cache WHERE cache_key = ?", (cache_key,))
+        self._total_count -= 1
+        self._total_bytes -= size
+
+    def _evict_locked(self):
+        """LRU izbacivanje dok ukupna veličina ne padne ispod budžeta"""
+        while self.max_bytes and self._total_bytes > self.max_bytes and self._total_count > 0:
+            rows = self._conn.execute(
+                "SELECT cache_key, size FROM ocr_cache ORDER BY last_accessed ASC LIMIT ?",
+                (self.eviction_batch,)
+            ).fetchall()
+            if not rows:
+                break
+
+            for cache_key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._delete_locked(cache_key, int(size))
+                self._evictions += 1
+
+    def put_perceptual_hash(self, cache_key: str, hash_type: str, hash_value: int, lang_key: str):
+        """Zapamti perceptualni heš za postojeći cache unos"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM ocr_phash_band WHERE cache_key = ? AND hash_type = ?",
+                    (cache_key, hash_type)
+                )
+                self._conn.execute(
+                    """INSERT OR REPLACE INTO ocr_phash (cache_key, hash_type, lang_key, hash)
+                       VALUES (?, ?, ?, ?)""",
+                    (cache_key, hash_type, lang_key, _to_signed64(hash_value))
+                )
+                self._conn.executemany(
+                    """INSERT INTO ocr_phash_band (hash_type, lang_key, band, value, cache_key)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    [
+                        (hash_type, lang_key, band, self._band_value(hash_value, band), cache_key)
+                        for band in range(HASH_BANDS)
+                    ]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def put_image_signature(self, cache_key: str, width: int, height: int, fingerprint: bytes):
+        """Zapamti dimenzije slike i otisak sadržaja za postojeći cache unos"""
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO ocr_image_signature (cache_key, width, height, fingerprint)
+                   VALUES (?, ?, ?, ?)""",
+                (cache_key, width, height, fingerprint)
+            )
+
+    def get_image_signature(self, cache_key: str) -> Optional[Tuple[int, int, bytes]]:
+        """(širina, visina, otisak) ili None za unose bez potpisa"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT width, height, fingerprint FROM ocr_image_signature WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+        return (int(row[0]), int(row[1]), bytes(row[2])) if row else None
+
+    def find_similar(self, hash_type: str, hash_value: int, lang_key: str,
+                     max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Pronađi kandidate po Hamming rastojanju perceptualnog heša
+
+        Returns:
+            Lista (cache_key, rastojanje) sortirana od najbližeg
+        """
+        max_distance = min(max_distance, HASH_BANDS - 1)
+        band_clauses = " OR ".join(["(b.band = ? AND b.value = ?)"] * HASH_BANDS)
+        params = [hash_type, lang_key]
+        for band in range(HASH_BANDS):
+            params.extend([band, self._band_value(hash_value, band)])
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT DISTINCT p.cache_key, p.hash
+                    FROM ocr_phash_band b
+                    JOIN ocr_phash p ON p.cache_key = b.cache_key AND p.hash_type = b.hash_type
+                    WHERE b.hash_type = ? AND b.lang_key = ? AND ({band_clauses})""",
+                params
+            ).fetchall()
+
+        matches = []
+        for cache_key, candidate in rows:
+            distance = bin(hash_value ^ _to_unsigned64(candidate)).count('1')
+            if distance <= max_distance:
+                matches.append((cache_key, distance))
+        return sorted(matches, key=lambda match: match[1])
+
+    @staticmethod
+    def _band_value(hash_value: int, band: int) -> int:
+        return (hash_value >> (band * HASH_BAND_BITS)) & ((1 << HASH_BAND_BITS) - 1)
+
+    def clear_older_than(self, seconds: float) -> int:
+        """Obriši unose starije od zadatog broja sekundi"""
+        cutoff = time.time() - seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache WHERE created_at < ?",
+                (cutoff,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM ocr_cache WHERE created_at < ?", (cutoff,))
+            self._total_count -= int(row[0])
+            self._total_bytes -= int(row[1])
+            return int(row[0])
+
+    def clear(self) -> int:
+        """Obriši ceo cache"""
+        with self._lock:
+            cleared = self._total_count
+            self._conn.execute("DELETE FROM ocr_phash")
+            self._conn.execute("DELETE FROM ocr_phash_band")
+            self._conn.execute("DELETE FROM ocr_image_signature")
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._total_count = 0
+            self._total_bytes = 0
+            return cleared
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistike bez skeniranja diska"""
+        return {
+            'cache_count': self._total_count,
+            'cache_size_bytes': self._total_bytes,
+            'cache_size_mb': self._total_bytes / (1024 * 1024),
+            'max_size_mb': self.max_bytes / (1024 * 1024) if self.max_bytes else None,
+            'evictions': self._evictions,
+            'expirations': self._expirations
+        }
+
+    def close(self):
+        """Zatvori konekciju"""
+        with self._lock:
+            self._conn.close()
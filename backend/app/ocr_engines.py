@@ -0,0 +1,217 @@
+"""
+OCR Engines
+Zamenljivi OCR backend-ovi: pytesseract (poseban proces po pozivu) i
+in-process Tesseract API (tesserocr) koji drži učitan model po thread-u
+"""
+
+import os
+import re
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+try:
+    from tesserocr import PyTessBaseAPI, RIL, iterate_level
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Ključevi koje vraća pytesseract.image_to_data(output_type=DICT)
+DATA_KEYS = [
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height', 'conf', 'text'
+]
+
+_PSM_PATTERN = re.compile(r'--psm\s+(\d+)')
+
+class OCREngine(ABC):
+    """Osnovni interfejs OCR backend-a (nepotpun engine ne može da se instancira)"""
+
+    name = "base"
+
+    @abstractmethod
+    def image_to_data(self, image: np.ndarray, lang: str, config: str = '') -> Dict[str, List]:
+        """
+        OCR jedne slike
+
+        Returns:
+            Dict u formatu pytesseract.image_to_data (Output.DICT)
+        """
+
+    @abstractmethod
+    def detect_script(self, image: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Detekcija pisma (Tesseract OSD)
+
+        Returns:
+            Tuple (naziv pisma, confidence) ili None
+        """
+
+    def get_info(self) -> Dict[str, Any]:
+        """Informacije o engine-u"""
+        return {'name': self.name}
+
+    def close(self):
+        """Oslobodi resurse"""
+        pass
+
+class PytesseractEngine(OCREngine):
+    """pytesseract - pokreće tesseract proces i učitava modele za svaki poziv"""
+
+    name = "pytesseract"
+
+    def image_to_data(self, image: np.ndarray, lang: str, config: str = '') -> Dict[str, List]:
+        return pytesseract.image_to_data(
+            image, lang=lang, config=config, output_type=pytesseract.Output.DICT
+        )
+
+    def detect_script(self, image: np.ndarray) -> Optional[Tuple[str, float]]:
+        osd = pytesseract.image_to_osd(image, config='--psm 0', output_type=pytesseract.Output.DICT)
+        if not osd.get('script'):
+            return None
+        return osd['script'], float(osd.get('script_conf', 0.0))
+
+class TesserocrEngine(OCREngine):
+    """
+    In-process Tesseract API
+
+    Svaki worker thread drži svoj PyTessBaseAPI po jeziku (API nije
+    thread-safe), pa se traineddata učitava samo jednom po thread-u.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path: Optional[str] = None):
+        if not TESSEROCR_AVAILABLE:
+            raise ImportError("tesserocr nije instaliran")
+
+        self.tessdata_path = tessdata_path
+        self._local = threading.local()
+        self._apis = []
+        self._lock = threading.Lock()
+
+    def _get_api(self, lang: str):
+        """API za trenutni thread i jezik (kreira se pri prvom korišćenju)"""
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+
+        api = apis.get(lang)
+        if api is None:
+            kwargs = {'lang': lang}
+            if self.tessdata_path:
+                kwargs['path'] = self.tessdata_path
+            api = PyTessBaseAPI(**kwargs)
+            apis[lang] = api
+            with self._lock:
+                self._apis.append(api)
+            logger.info(f"Tesseract API učitan za '{lang}' ({threading.current_thread().name})")
+        return api
+
+    def image_to_data(self, image: np.ndarray, lang: str, config: str = '') -> Dict[str, List]:
+        api = self._get_api(lang)
+
+        # Od konfiguracije se podržava samo PSM (ostalo koristi default vrednosti)
+        psm_match = _PSM_PATTERN.search(config or '')
+        api.SetPageSegMode(int(psm_match.group(1)) if psm_match else 3)
+
+        if image.ndim == 3:
+            # OpenCV slike su BGR
+            image = np.ascontiguousarray(image[:, :, ::-1])
+        api.SetImage(Image.fromarray(image))
+        api.Recognize()
+
+        data: Dict[str, List] = {key: [] for key in DATA_KEYS}
+        block_num = par_num = line_num = word_num = 0
+
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+
+        for word_iter in iterate_level(iterator, RIL.WORD):
+            if word_iter.IsAtBeginningOf(RIL.BLOCK):
+                block_num += 1
+                par_num = line_num = 0
+            if word_iter.IsAtBeginningOf(RIL.PARA):
+                par_num += 1
+                line_num = 0
+            if word_iter.IsAtBeginningOf(RIL.TEXTLINE):
+                line_num += 1
+                word_num = 0
+            word_num += 1
+
+            bbox = word_iter.BoundingBox(RIL.WORD)
+            if bbox is None:
+                continue
+            x1, y1, x2, y2 = bbox
+
+            data['level'].append(5)
+            data['page_num'].append(1)
+            data['block_num'].append(block_num)
+            data['par_num'].append(par_num)
+            data['line_num'].append(line_num)
+            data['word_num'].append(word_num)
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+            data['conf'].append(word_iter.Confidence(RIL.WORD))
+            data['text'].append(word_iter.GetUTF8Text(RIL.WORD) or '')
+
+        return data
+
+    def detect_script(self, image: np.ndarray) -> Optional[Tuple[str, float]]:
+        api = self._get_api('osd')
+        api.SetPageSegMode(0)
+
+        if image.ndim == 3:
+            image = np.ascontiguousarray(image[:, :, ::-1])
+        api.SetImage(Image.fromarray(image))
+
+        osd = api.DetectOrientationScript()
+        if not osd or not osd.get('script_name'):
+            return None
+        return osd['script_name'], float(osd.get('script_conf', 0.0))
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            loaded = len(self._apis)
+        return {'name': self.name, 'loaded_apis': loaded, 'tessdata_path': self.tessdata_path}
+
+    def close(self):
+        with self._lock:
+            for api in self._apis:
+                try:
+                    api.End()
+                except Exception as e:
+                    logger.warning(f"Greška pri zatvaranju Tesseract API-ja: {e}")
+            self._apis = []
+
+def create_ocr_engine(name: str = "auto", tessdata_path: Optional[str] = None) -> OCREngine:
+    """
+    Kreira OCR engine po imenu
+
+    Args:
+        name: 'auto' (tesserocr ako je dostupan), 'tesserocr' ili 'pytesseract'
+        tessdata_path: Putanja do tessdata direktorijuma (za tesserocr)
+    """
+    name = (name or "auto").lower()
+    tessdata_path = tessdata_path or os.getenv("TESSDATA_PREFIX")
+
+    if name in ("auto", "tesserocr"):
+        if TESSEROCR_AVAILABLE:
+            try:
+                return TesserocrEngine(tessdata_path)
+            except Exception as e:
+                logger.warning(f"tesserocr engine nije dostupan, koristi se pytesseract: {e}")
+        elif name == "tesserocr":
+            logger.warning("tesserocr nije instaliran, koristi se pytesseract")
+
+    return PytesseractEngine()
@@ -1,18 +1,30 @@
 import os
 import pytesseract
-from PIL import Image
+from PIL import Image, ImageSequence
 import cv2
 import numpy as np
-from typing import List, Dict, Any, Optional
+from io import BytesIO
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Iterator, Callable
 import logging
 import hashlib
 import asyncio
 import aiofiles
 import json
+import time
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .config import Config
+from .ocr_cache import OCRCacheStore
+from .cache_metrics import cache_telemetry
+from .ocr_engines import create_ocr_engine, PytesseractEngine
 from .error_handler import OCRError, ValidationError, ErrorCategory, ErrorSeverity
 
+try:
+    import fitz  # PyMuPDF - renderovanje skeniranih PDF-ova
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
 class OCRService:
     """Modularan OCR servis za ekstrakciju teksta iz slika sa performance optimizacijama"""
     
@@ -39,20 +51,81 @@ class OCRService:
             else:
                 self.logger.warning("Tesseract nije pronađen. OCR možda neće raditi.")
         
+        # OCR engine - in-process API ako je dostupan, pytesseract kao fallback
+        self.engine = create_ocr_engine(Config.OCR_ENGINE)
+        self.fallback_engine = self.engine if isinstance(self.engine, PytesseractEngine) else PytesseractEngine()
+        self.logger.info(f"OCR engine: {self.engine.name}")
+        
+        # Detekcija pisma za izbor jezičkih paketa (srp, eng ili oba)
+        self.default_languages = ['srp', 'eng']
+        self.auto_language = Config.OCR_AUTO_LANGUAGE
+        self.script_languages = self._parse_script_languages(Config.OCR_SCRIPT_LANGUAGES)
+        self.script_min_confidence = Config.OCR_SCRIPT_MIN_CONFIDENCE
+        self.language_probe_size = 1024
+        
         # Podržani formati slika
         self.supported_formats = ['.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif']
         
+        # Višestranični dokumenti (TIFF frejmovi, skenirani PDF) - stranice se
+        # dekodiraju lenjo u jednom thread-u (PyMuPDF nije thread-safe)
+        self.document_formats = ['.tif', '.tiff', '.pdf']
+        self.document_concurrency = max(1, Config.OCR_DOCUMENT_CONCURRENCY)
+        self.document_max_pages = Config.OCR_DOCUMENT_MAX_PAGES
+        self.pdf_dpi = Config.OCR_PDF_DPI
+        self.page_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-page")
+        # OCR stranica dokumenata (background poslovi) ide na poseban ograničen pool,
+        # da veliki dokumenti ne bi zauzeli executor interaktivnog /ocr/extract-a
+        self.document_workers = max(1, Config.OCR_DOCUMENT_WORKERS)
+        self.document_executor = ThreadPoolExecutor(max_workers=self.document_workers, thread_name_prefix="ocr-document")
+        
         # Podržani jezici
         self.supported_languages = ['srp', 'eng', 'srp+eng']
         
         # Cache konfiguracija
         self.cache_dir = cache_dir
-        self.cache_ttl = timedelta(hours=24)  # Cache TTL
-        self.cache_metadata_file = os.path.join(cache_dir, "cache_metadata.json")
+        self.cache_ttl = timedelta(hours=Config.OCR_CACHE_TTL_HOURS)  # Cache TTL
+        self.cache_db_path = os.path.join(cache_dir, "ocr_cache.db")
+        self.cache_store: Optional[OCRCacheStore] = None
         self._init_cache()
         
-        # Thread pool za async processing
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Ograničen thread pool za async processing - sav Tesseract/OpenCV
+        # posao ide ovde, nikad direktno na event loop
+        self.max_workers = Config.OCR_MAX_WORKERS
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr")
+        # Cache lookup ide na poseban mali pool da cache hit ne bi čekao
+        # iza OCR poslova u redu glavnog executor-a
+        self.cache_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-cache")
+        
+        # Poseban pool za paralelne PSM fallback pokušaje (ne sme deliti
+        # pool sa glavnim poslom jer se poziva iz njega)
+        self.psm_fallback_modes = [6, 8, 13]
+        self.psm_executor = ThreadPoolExecutor(max_workers=len(self.psm_fallback_modes))
+        self.fallback_confidence = Config.OCR_MIN_CONFIDENCE
+        self.good_confidence = Config.OCR_GOOD_CONFIDENCE
+        
+        # Tiled OCR za velike slike - tile-ovi se obrađuju paralelno u
+        # posebnom pool-u (poziva se iz glavnog executor-a)
+        self.tiling_enabled = Config.OCR_TILING_ENABLED
+        self.tile_threshold = Config.OCR_TILE_THRESHOLD
+        self.tile_size = Config.OCR_TILE_SIZE
+        self.tile_overlap = min(Config.OCR_TILE_OVERLAP, Config.OCR_TILE_SIZE // 4)
+        self.tile_max_pixels = Config.OCR_TILE_MAX_PIXELS
+        self.tile_executor = ThreadPoolExecutor(max_workers=Config.OCR_TILE_WORKERS, thread_name_prefix="ocr-tile")
+        
+        # Jeftina analiza na thumbnail-u i sečenje na oblasti sa tekstom
+        self.analysis_thumbnail_size = Config.OCR_ANALYSIS_THUMBNAIL_SIZE
+        self.text_crop_enabled = Config.OCR_TEXT_CROP_ENABLED
+        self.text_crop_min_gain = Config.OCR_TEXT_CROP_MIN_GAIN
+        
+        # Perceptualni heševi za skoro iste slike (re-save, rekompresija, resize).
+        # Stranice istog rasporeda imaju bliske 64-bit heševe, pa je pHash samo
+        # izvor kandidata - kandidat mora da prođe i odnos stranica i fini otisak
+        # sadržaja. dHash 9x8 se ne koristi: na belim stranicama je nestabilan,
+        # a različite stranice istog rasporeda daje kao skoro iste.
+        self.perceptual_hash_types = ['phash']
+        self.perceptual_hash_max_distance = Config.OCR_PHASH_MAX_DISTANCE
+        self.content_max_diff = Config.OCR_CONTENT_MAX_DIFF
+        self.aspect_ratio_tolerance = 0.02
         
         # Processing statistics
         self.stats = {
@@ -60,18 +133,89 @@ class OCRService:
             'cache_hits': 0,
             'cache_misses': 0,
             'avg_processing_time': 0,
-            'total_processing_time': 0
+            'total_processing_time': 0,
+            'tiled_images': 0,
+            'tiles_processed': 0,
+            'cropped_images': 0,
+            'cropped_pixels': 0,
+            'language_choices': {},
+            'hash_lookups': {
+                'md5': {'hits': 0, 'misses': 0},
+                'perceptual': {'hits': 0, 'misses': 0, 'rejected': 0}
+            }
         }
     
     def _init_cache(self):
-        """Inicijalizuje cache direktorijum"""
+        """Inicijalizuje SQLite cache store"""
         try:
-            os.makedirs(self.cache_dir, exist_ok=True)
-            if not os.path.exists(self.cache_metadata_file):
-                with open(self.cache_metadata_file, 'w') as f:
-                    json.dump({}, f)
+            self.cache_store = OCRCacheStore(
+                self.cache_db_path,
+                max_bytes=Config.OCR_CACHE_MAX_BYTES,
+                ttl_seconds=self.cache_ttl.total_seconds()
+            )
         except Exception as e:
             self.logger.error(f"Greška pri inicijalizaciji cache-a: {e}")
+            self.cache_store = None
+    
+    def _parse_script_languages(self, mapping: str) -> Dict[str, List[str]]:
+        """Parsira 'Cyrillic:srp,Latin:eng' u {'Cyrillic': ['srp'], 'Latin': ['eng']}"""
+        result = {}
+        for item in mapping.split(','):
+            if ':' not in item:
+                continue
+            script, langs = item.split(':', 1)
+            langs = [lang for lang in langs.strip().split('+') if lang]
+            if script.strip() and langs:
+                result[script.strip()] = langs
+        return result
+    
+    def _cache_languages(self, languages: Optional[List[str]]) -> List[str]:
+        """Jezici koji ulaze u cache ključ ('auto' kada se jezik detektuje)"""
+        if languages is None:
+            return ['auto'] if self.auto_language else list(self.default_languages)
+        return languages
+    
+    def _detect_languages(self, image: np.ndarray) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Bira jezičke pakete na osnovu detekcije pisma (OSD na umanjenoj slici)
+        
+        Jedan jezik je značajno brži od kombinacije, pa se oba koriste
+        samo kada pismo nije pouzdano prepoznato.
+        
+        Returns:
+            Tuple (jezici, informacije o detekciji)
+        """
+        start = time.monotonic()
+        probe, _ = self._make_thumbnail(image, self.language_probe_size)
+        script, script_confidence = None, 0.0
+        
+        try:
+            try:
+                detected = self.engine.detect_script(probe)
+            except Exception as e:
+                if self.engine is self.fallback_engine:
+                    raise
+                self.logger.warning(f"{self.engine.name} OSD greška, koristi se pytesseract: {e}")
+                detected = self.fallback_engine.detect_script(probe)
+            if detected:
+                script, script_confidence = detected
+        except Exception as e:
+            # OSD ne uspeva na slikama sa malo teksta - koristi sve jezike
+            self.logger.debug(f"Detekcija pisma nije uspela: {e}")
+        
+        languages = self.script_languages.get(script) if script_confidence >= self.script_min_confidence else None
+        if not languages:
+            languages = list(self.default_languages)
+        
+        choice = '+'.join(languages)
+        self.stats['language_choices'][choice] = self.stats['language_choices'].get(choice, 0) + 1
+        
+        return languages, {
+            'script': script,
+            'script_confidence': script_confidence,
+            'languages': languages,
+            'detection_time': time.monotonic() - start
+        }
     
     def _get_cache_key(self, image_bytes: bytes, languages: List[str]) -> str:
         """Generiše cache key za sliku"""
@@ -80,66 +224,151 @@ class OCRService:
         lang_string = '+'.join(sorted(languages))
         return f"{image_hash}_{lang_string}"
     
-    def _get_cache_path(self, cache_key: str) -> str:
-        """Vraća putanju do cache fajla"""
-        return os.path.join(self.cache_dir, f"{cache_key}.json")
-    
-    def _is_cache_valid(self, cache_path: str) -> bool:
-        """Proverava da li je cache valid"""
-        try:
-            if not os.path.exists(cache_path):
-                return False
-            
-            # Proveri TTL
-            file_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
-            return datetime.now() - file_time < self.cache_ttl
-        except Exception:
-            return False
-    
     def _load_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Učitava rezultat iz cache-a"""
+        if not self.cache_store:
+            return None
+        start = time.perf_counter()
         try:
-            cache_path = self._get_cache_path(cache_key)
-            if not self._is_cache_valid(cache_path):
-                return None
-            
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                result = json.load(f)
+            result = self.cache_store.get(cache_key)
+            cache_telemetry.record_get(f"ocr:{cache_key}", result is not None,
+                                       time.perf_counter() - start, tier="sqlite")
+            if result is not None:
                 self.stats['cache_hits'] += 1
                 self.logger.info(f"Cache hit za {cache_key}")
-                return result
+            return result
         except Exception as e:
             self.logger.warning(f"Greška pri učitavanju iz cache-a: {e}")
+            cache_telemetry.record_error(f"ocr:{cache_key}", "get")
             return None
     
-    def _save_to_cache(self, cache_key: str, result: Dict[str, Any]):
-        """Čuva rezultat u cache"""
+    def _save_to_cache(self, cache_key: str, result: Dict[str, Any],
+                       perceptual_hashes: Optional[Dict[str, Any]] = None,
+                       languages: Optional[List[str]] = None):
+        """Čuva rezultat u cache (i perceptualne heševe ako su prosleđeni)"""
+        if not self.cache_store:
+            return
+        start = time.perf_counter()
         try:
-            cache_path = self._get_cache_path(cache_key)
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            
-            # Ažuriraj metadata
-            self._update_cache_metadata(cache_key, cache_path)
+            self.cache_store.put(cache_key, result)
+            cache_telemetry.record_set(f"ocr:{cache_key}", time.perf_counter() - start,
+                                       ttl=Config.OCR_CACHE_TTL_HOURS * 3600)
+            
+            if perceptual_hashes and languages:
+                lang_key = '+'.join(sorted(languages))
+                for hash_type in self.perceptual_hash_types:
+                    self.cache_store.put_perceptual_hash(cache_key, hash_type, perceptual_hashes[hash_type], lang_key)
+                self.cache_store.put_image_signature(
+                    cache_key, perceptual_hashes['width'], perceptual_hashes['height'], perceptual_hashes['content']
+                )
         except Exception as e:
             self.logger.warning(f"Greška pri čuvanju u cache: {e}")
+            cache_telemetry.record_error(f"ocr:{cache_key}", "set")
     
-    def _update_cache_metadata(self, cache_key: str, cache_path: str):
-        """Ažurira cache metadata"""
+    def _compute_perceptual_hashes(self, image_bytes: bytes) -> Dict[str, Any]:
+        """Računa pHash (64-bit), dimenzije i otisak sadržaja iz bajtova slike"""
         try:
-            with open(self.cache_metadata_file, 'r') as f:
-                metadata = json.load(f)
+            nparr = np.frombuffer(image_bytes, np.uint8)
+            gray = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                return {}
             
-            metadata[cache_key] = {
-                'path': cache_path,
-                'created_at': datetime.now().isoformat(),
-                'size': os.path.getsize(cache_path)
+            return {
+                'phash': self._phash(gray),
+                'width': int(gray.shape[1]),
+                'height': int(gray.shape[0]),
+                'content': self._content_fingerprint(gray)
             }
-            
-            with open(self.cache_metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
         except Exception as e:
-            self.logger.warning(f"Greška pri ažuriranju cache metadata: {e}")
+            self.logger.warning(f"Greška pri računanju perceptualnog heša: {e}")
+            return {}
+    
+    def _phash(self, gray: np.ndarray) -> int:
+        """Perceptual hash - niske frekvencije DCT-a na 32x32 sličici"""
+        resized = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low_freq = cv2.dct(resized)[:8, :8]
+        # DC komponentu ne računamo u medijanu
+        median = np.median(low_freq.flatten()[1:])
+        return self._bits_to_int(low_freq > median)
+    
+    def _content_fingerprint(self, gray: np.ndarray) -> bytes:
+        """dHash na 33x32 sličici (1024 bita) - razlikuje redove teksta istog rasporeda"""
+        resized = cv2.resize(gray, (33, 32), interpolation=cv2.INTER_AREA)
+        return np.packbits(resized[:, 1:] > resized[:, :-1]).tobytes()
+    
+    def _is_near_duplicate(self, hashes: Dict[str, Any], candidate_key: str) -> bool:
+        """Provera kandidata nađenog po pHash-u: odnos stranica i otisak sadržaja"""
+        # Unosi bez potpisa (stariji format) se ne koriste za približna poklapanja
+        signature = self.cache_store.get_image_signature(candidate_key)
+        if signature is None:
+            return False
+        width, height, fingerprint = signature
+        aspect, candidate_aspect = hashes['width'] / hashes['height'], width / height
+        if abs(aspect - candidate_aspect) > self.aspect_ratio_tolerance * candidate_aspect:
+            return False
+        
+        current = np.unpackbits(np.frombuffer(hashes['content'], np.uint8))
+        stored = np.unpackbits(np.frombuffer(fingerprint, np.uint8))
+        if current.size != stored.size:
+            return False
+        return np.count_nonzero(current != stored) / current.size <= self.content_max_diff
+    
+    def _bits_to_int(self, bits: np.ndarray) -> int:
+        value = 0
+        for bit in bits.flatten():
+            value = (value << 1) | int(bool(bit))
+        return value
+    
+    def _lookup_cache(self, image_bytes: bytes, cache_key: str,
+                      languages: List[str]) -> tuple:
+        """
+        Traži rezultat po tačnom ključu, pa po perceptualnim heševima
+        
+        Returns:
+            Tuple (rezultat ili None, izračunati perceptualni heševi)
+        """
+        hash_stats = self.stats['hash_lookups']
+        
+        cached_result = self._load_from_cache(cache_key)
+        if cached_result:
+            hash_stats['md5']['hits'] += 1
+            return cached_result, {}
+        hash_stats['md5']['misses'] += 1
+        
+        perceptual_hashes = self._compute_perceptual_hashes(image_bytes)
+        if not self.cache_store or not perceptual_hashes:
+            return None, perceptual_hashes
+        
+        # Kandidati po pHash indeksu, pa stroga provera svakog kandidata
+        lang_key = '+'.join(sorted(languages))
+        candidates = self.cache_store.find_similar(
+            'phash', perceptual_hashes['phash'], lang_key, self.perceptual_hash_max_distance
+        )
+        for candidate_key, distance in candidates:
+            if not self._is_near_duplicate(perceptual_hashes, candidate_key):
+                hash_stats['perceptual']['rejected'] += 1
+                continue
+            
+            similar_result = self.cache_store.get(candidate_key)
+            if not similar_result:
+                continue
+            
+            hash_stats['perceptual']['hits'] += 1
+            self.stats['cache_hits'] += 1
+            self.logger.info(f"Perceptual cache hit (pHash rastojanje {distance}) za {cache_key}")
+            
+            result = dict(similar_result)
+            result['cache_match'] = {
+                'hash_type': 'phash',
+                'distance': distance,
+                'source_cache_key': candidate_key
+            }
+            # Zapamti i pod tačnim ključem za sledeći put
+            self._save_to_cache(cache_key, result)
+            return result, perceptual_hashes
+        
+        hash_stats['perceptual']['misses'] += 1
+        return None, perceptual_hashes
     
     def _compress_image(self, image: np.ndarray, max_size: int = 2000) -> np.ndarray:
         """Kompresuje sliku ako je prevelika"""
@@ -162,34 +391,221 @@ class OCRService:
         
         return image
     
+    def _should_tile(self, image: np.ndarray) -> bool:
+        """Da li sliku treba obraditi u tile-ovima"""
+        height, width = image.shape[:2]
+        return self.tiling_enabled and max(height, width) > self.tile_threshold
+    
+    def _compress_to_pixel_budget(self, image: np.ndarray, max_pixels: int) -> np.ndarray:
+        """Smanjuje sliku samo ako prelazi budžet piksela (zaštita memorije)"""
+        height, width = image.shape[:2]
+        if not max_pixels or height * width <= max_pixels:
+            return image
+        
+        scale = (max_pixels / float(height * width)) ** 0.5
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+        self.logger.info(f"Slika kompresovana sa {width}x{height} na {new_width}x{new_height} (budžet piksela)")
+        return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    
+    def _tile_boxes(self, height: int, width: int) -> List[Tuple[int, int, int, int, Tuple[int, int, int, int]]]:
+        """
+        Deli sliku na tile-ove koji se preklapaju
+        
+        Returns:
+            Lista (x, y, w, h, core) gde je core (x0, y0, x1, y1) deo tile-a
+            koji mu "pripada" - core oblasti pokrivaju sliku bez preklapanja
+        """
+        def spans(length: int) -> List[Tuple[int, int]]:
+            step = self.tile_size - self.tile_overlap
+            starts = list(range(0, max(length - self.tile_overlap, 1), step))
+            result = []
+            for start in starts:
+                end = min(start + self.tile_size, length)
+                result.append((max(0, end - self.tile_size), end))
+                if end >= length:
+                    break
+            return result
+        
+        def cores(segments: List[Tuple[int, int]], length: int) -> List[Tuple[int, int]]:
+            # Granica između susednih tile-ova je sredina njihovog preklapanja
+            result = []
+            for i, (start, end) in enumerate(segments):
+                core_start = 0 if i == 0 else (start + segments[i - 1][1]) // 2
+                core_end = length if i == len(segments) - 1 else (segments[i + 1][0] + end) // 2
+                result.append((core_start, core_end))
+            return result
+        
+        rows = spans(height)
+        cols = spans(width)
+        row_cores = cores(rows, height)
+        col_cores = cores(cols, width)
+        
+        boxes = []
+        for (y0, y1), (cy0, cy1) in zip(rows, row_cores):
+            for (x0, x1), (cx0, cx1) in zip(cols, col_cores):
+                boxes.append((x0, y0, x1 - x0, y1 - y0, (cx0, cy0, cx1, cy1)))
+        return boxes
+    
+    def _ocr_tile_words(self, tile: np.ndarray, lang: str, offset_x: int, offset_y: int,
+                        core: Tuple[int, int, int, int]) -> List[Dict[str, Any]]:
+        """OCR jednog tile-a; vraća reči u globalnim koordinatama koje pripadaju core oblasti"""
+        data = self._tesseract_data(tile, lang)
+        core_x0, core_y0, core_x1, core_y1 = core
+        words = []
+        
+        for i, word in enumerate(data.get('text', [])):
+            word = (word or '').strip()
+            if not word:
+                continue
+            
+            try:
+                conf = float(data['conf'][i])
+            except (TypeError, ValueError):
+                conf = -1.0
+            
+            left = data['left'][i] + offset_x
+            top = data['top'][i] + offset_y
+            width = data['width'][i]
+            height = data['height'][i]
+            center_x = left + width / 2.0
+            center_y = top + height / 2.0
+            
+            # De-duplikacija preklapanja: reč zadržava samo tile u čijem je core-u njen centar
+            if not (core_x0 <= center_x < core_x1 and core_y0 <= center_y < core_y1):
+                continue
+            
+            words.append({
+                'text': word,
+                'conf': conf,
+                'left': left,
+                'top': top,
+                'width': width,
+                'height': height,
+                'center_y': center_y
+            })
+        
+        return words
+    
+    def _merge_tile_words(self, words: List[Dict[str, Any]]) -> str:
+        """Spaja reči iz svih tile-ova u tekst po redosledu čitanja (redovi odozgo, reči sleva)"""
+        if not words:
+            return ""
+        
+        words = sorted(words, key=lambda w: w['center_y'])
+        lines: List[List[Dict[str, Any]]] = []
+        
+        for word in words:
+            if lines:
+                line = lines[-1]
+                line_center = sum(w['center_y'] for w in line) / len(line)
+                line_height = max(w['height'] for w in line)
+                if abs(word['center_y'] - line_center) <= max(line_height, word['height']) / 2.0:
+                    line.append(word)
+                    continue
+            lines.append([word])
+        
+        heights = sorted(max(w['height'] for w in line) for line in lines)
+        median_height = heights[len(heights) // 2] or 1
+        
+        output = []
+        previous_bottom = None
+        for line in lines:
+            line.sort(key=lambda w: w['left'])
+            top = min(w['top'] for w in line)
+            # Veći vertikalni razmak = novi paragraf
+            if previous_bottom is not None and top - previous_bottom > median_height * 1.2:
+                output.append('')
+            output.append(' '.join(w['text'] for w in line))
+            previous_bottom = max(w['top'] + w['height'] for w in line)
+        
+        return '\n'.join(output)
+    
+    def _extract_text_tiled(self, image: np.ndarray, lang_string: str) -> Tuple[str, float, int]:
+        """
+        Tiled OCR za velike slike
+        
+        Slika se deli na tile-ove koji se preklapaju, tile-ovi se obrađuju
+        paralelno, a reči se spajaju po redosledu čitanja uz uklanjanje
+        duplikata iz zona preklapanja.
+        
+        Returns:
+            Tuple (tekst, confidence, broj tile-ova)
+        """
+        height, width = image.shape[:2]
+        boxes = self._tile_boxes(height, width)
+        
+        futures = [
+            self.tile_executor.submit(
+                self._ocr_tile_words, image[y:y + h, x:x + w], lang_string, x, y, core
+            )
+            for x, y, w, h, core in boxes
+        ]
+        
+        words = []
+        for future in futures:
+            try:
+                words.extend(future.result())
+            except Exception as e:
+                self.logger.warning(f"Tile OCR greška: {e}")
+        
+        self.stats['tiled_images'] += 1
+        self.stats['tiles_processed'] += len(boxes)
+        
+        confidences = [w['conf'] for w in words if w['conf'] > 0]
+        confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        
+        self.logger.info(f"Tiled OCR: {width}x{height}, {len(boxes)} tile-ova, {len(words)} reči")
+        return self._merge_tile_words(words), confidence, len(boxes)
+    
     async def extract_text_async(self, image_bytes: bytes, filename: str, 
-                                languages: List[str] = None) -> Dict[str, Any]:
-        """Asinhrono ekstraktuje tekst iz slike"""
+                                languages: List[str] = None,
+                                limiter: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """
+        Asinhrono ekstraktuje tekst iz slike
+        
+        Cache lookup, preprocessing i Tesseract se izvršavaju u executor-ima,
+        tako da event loop nikad ne radi blokirajući OCR posao.
+        
+        Args:
+            image_bytes: Bytes slike
+            filename: Naziv fajla
+            languages: Lista jezika za OCR
+            limiter: Opcioni semafor koji ograničava OCR (ne i cache lookup)
+        """
         try:
-            # Proveri cache prvo
-            if languages is None:
-                languages = ['srp', 'eng']
-            
-            cache_key = self._get_cache_key(image_bytes, languages)
-            cached_result = self._load_from_cache(cache_key)
+            # Proveri cache prvo - bez zadatih jezika cache ključ je 'auto'
+            # (jezik se bira detekcijom pisma i pamti u rezultatu)
+            cache_languages = self._cache_languages(languages)
+            
+            loop = asyncio.get_running_loop()
+            cache_key = self._get_cache_key(image_bytes, cache_languages)
+            cached_result, perceptual_hashes = await loop.run_in_executor(
+                self.cache_executor, self._lookup_cache, image_bytes, cache_key, cache_languages
+            )
             
             if cached_result:
-                return cached_result
+                return {**cached_result, 'cached': True}
+            
+            self.stats['cache_misses'] += 1
             
             # Ako nema u cache-u, procesiraj asinhrono
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.executor,
-                self._extract_text_sync,
-                image_bytes,
-                filename,
-                languages
-            )
+            if limiter is not None:
+                async with limiter:
+                    result = await loop.run_in_executor(
+                        self.executor, self._extract_text_sync, image_bytes, filename, languages
+                    )
+            else:
+                result = await loop.run_in_executor(
+                    self.executor, self._extract_text_sync, image_bytes, filename, languages
+                )
             
-            # Sačuvaj u cache
-            self._save_to_cache(cache_key, result)
+            # Sačuvaj u cache zajedno sa perceptualnim heševima
+            await loop.run_in_executor(
+                self.cache_executor, self._save_to_cache, cache_key, result, perceptual_hashes, cache_languages
+            )
             
-            return result
+            return {**result, 'cached': False}
             
         except Exception as e:
             self.logger.error(f"Async OCR greška: {e}")
@@ -198,6 +614,240 @@ class OCRService:
                 'message': str(e)
             }
     
+    async def extract_text_batch_stream(self, images: List[Tuple[str, bytes]],
+                                        languages: List[str] = None,
+                                        max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Paralelno ekstraktuje tekst iz više slika i vraća rezultate čim su gotovi
+        
+        Cache hit-ovi ne čekaju na slobodan OCR slot, pa stižu odmah.
+        
+        Args:
+            images: Lista (filename, image_bytes)
+            languages: Lista jezika za OCR
+            max_concurrency: Maksimalan broj istovremenih OCR obrada
+        
+        Yields:
+            Dict sa indeksom slike, nazivom fajla i rezultatom
+        """
+        limit = max(1, min(max_concurrency or Config.OCR_BATCH_CONCURRENCY, Config.OCR_BATCH_CONCURRENCY))
+        limiter = asyncio.Semaphore(limit)
+        
+        async def process(index: int, filename: str, image_bytes: bytes) -> Dict[str, Any]:
+            start = time.monotonic()
+            if not self.is_supported_format(filename):
+                result = {'status': 'error', 'message': f'Format slike nije podržan: {filename}'}
+            else:
+                result = await self.extract_text_async(image_bytes, filename, languages, limiter=limiter)
+            return {
+                'index': index,
+                'filename': filename,
+                'elapsed': time.monotonic() - start,
+                'result': result
+            }
+        
+        tasks = [
+            asyncio.create_task(process(index, filename, image_bytes))
+            for index, (filename, image_bytes) in enumerate(images)
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Ako klijent prekine stream, ne pokreći preostale OCR obrade
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def is_document_format(self, filename: str) -> bool:
+        """Da li je fajl višestranični dokument (TIFF ili PDF)"""
+        if not filename:
+            return False
+        return os.path.splitext(filename)[1].lower() in self.document_formats
+    
+    def get_page_count(self, data: bytes, filename: str) -> int:
+        """Broj stranica dokumenta bez dekodiranja stranica"""
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == '.pdf':
+            if not PYMUPDF_AVAILABLE:
+                raise OCRError("OCR PDF-a zahteva PyMuPDF (pip install pymupdf)", "OCR_PDF_UNSUPPORTED")
+            with fitz.open(stream=data, filetype="pdf") as document:
+                return document.page_count
+        
+        with Image.open(BytesIO(data)) as image:
+            return getattr(image, 'n_frames', 1)
+    
+    def _iter_document_pages(self, data: bytes, filename: str) -> Iterator[np.ndarray]:
+        """
+        Lenjo dekodira stranice dokumenta jednu po jednu (BGR numpy)
+        
+        U memoriji je samo trenutna stranica, ne ceo dokument.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        
+        if extension == '.pdf':
+            if not PYMUPDF_AVAILABLE:
+                raise OCRError("OCR PDF-a zahteva PyMuPDF (pip install pymupdf)", "OCR_PDF_UNSUPPORTED")
+            with fitz.open(stream=data, filetype="pdf") as document:
+                for page in document:
+                    pixmap = page.get_pixmap(dpi=self.pdf_dpi)
+                    page_image = np.frombuffer(pixmap.samples, np.uint8).reshape(
+                        pixmap.height, pixmap.width, pixmap.n
+                    )
+                    if pixmap.n == 4:
+                        yield cv2.cvtColor(page_image, cv2.COLOR_RGBA2BGR)
+                    elif pixmap.n == 1:
+                        yield cv2.cvtColor(page_image, cv2.COLOR_GRAY2BGR)
+                    else:
+                        yield cv2.cvtColor(page_image, cv2.COLOR_RGB2BGR)
+            return
+        
+        with Image.open(BytesIO(data)) as image:
+            for frame in ImageSequence.Iterator(image):
+                yield cv2.cvtColor(np.array(frame.convert('RGB')), cv2.COLOR_RGB2BGR)
+    
+    def _extract_page_sync(self, page_image: np.ndarray, languages: List[str] = None) -> Dict[str, Any]:
+        """OCR jedne stranice dokumenta (izvršava se u OCR executor-u)"""
+        start_time = time.monotonic()
+        try:
+            result = self._extract_text_from_image(page_image, languages)
+        except Exception as e:
+            result = {'status': 'error', 'message': str(e)}
+        result['processing_time'] = time.monotonic() - start_time
+        return result
+    
+    async def extract_document_pages(self, data: bytes, filename: str,
+                                     languages: List[str] = None,
+                                     max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming OCR višestraničnog dokumenta
+        
+        Stranice se dekodiraju lenjo i obrađuju paralelno; najviše
+        max_concurrency stranica je istovremeno u memoriji. Rezultati se
+        vraćaju čim je stranica gotova (ne nužno po redu).
+        
+        Yields:
+            Dict sa brojem stranice (od 1) i rezultatom OCR-a
+        """
+        loop = asyncio.get_running_loop()
+        limit = max(1, min(max_concurrency or self.document_concurrency, self.document_workers))
+        pages = self._iter_document_pages(data, filename)
+        
+        def next_page():
+            return next(pages, None)
+        
+        async def process(page_number: int, page_image: np.ndarray) -> Dict[str, Any]:
+            result = await loop.run_in_executor(self.document_executor, self._extract_page_sync, page_image, languages)
+            return {'page': page_number, 'result': result}
+        
+        in_flight = set()
+        page_number = 0
+        exhausted = False
+        
+        try:
+            while True:
+                # Dopuni red do limita - sledeća stranica se dekodira tek kada ima mesta
+                while not exhausted and len(in_flight) < limit:
+                    page_image = await loop.run_in_executor(self.page_executor, next_page)
+                    if page_image is None:
+                        exhausted = True
+                        break
+                    page_number += 1
+                    if page_number > self.document_max_pages:
+                        raise ValidationError(
+                            f"Dokument ima više od {self.document_max_pages} stranica", "OCR_TOO_MANY_PAGES"
+                        )
+                    in_flight.add(asyncio.create_task(process(page_number, page_image)))
+                    del page_image
+                
+                if not in_flight:
+                    break
+                
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await loop.run_in_executor(self.page_executor, pages.close)
+    
+    async def extract_document(self, data: bytes, filename: str, languages: List[str] = None,
+                               progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                               is_cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        OCR celog višestraničnog dokumenta sa izveštavanjem o napretku po stranici
+        
+        Args:
+            data: Bytes dokumenta (TIFF ili PDF)
+            filename: Naziv fajla
+            languages: Lista jezika (None = detekcija pisma po stranici)
+            progress_callback: Poziva se posle svake stranice sa stanjem obrade
+            is_cancelled: Ako vrati True, obrada se prekida
+        
+        Returns:
+            Dict sa spojenim tekstom i rezultatima po stranicama
+        """
+        start_time = time.monotonic()
+        
+        loop = asyncio.get_running_loop()
+        cache_key = f"doc_{self._get_cache_key(data, self._cache_languages(languages))}"
+        cached_result = await loop.run_in_executor(self.cache_executor, self._load_from_cache, cache_key)
+        if cached_result:
+            return {**cached_result, 'cached': True}
+        
+        total_pages = await loop.run_in_executor(self.page_executor, self.get_page_count, data, filename)
+        pages: Dict[int, Dict[str, Any]] = {}
+        failed = 0
+        cancelled = False
+        
+        async for item in self.extract_document_pages(data, filename, languages):
+            page_result = item['result']
+            pages[item['page']] = {
+                'page': item['page'],
+                'status': page_result.get('status'),
+                'text': page_result.get('text', ''),
+                'confidence': page_result.get('confidence', 0.0),
+                'languages': page_result.get('languages'),
+                'processing_time': page_result.get('processing_time'),
+                'message': page_result.get('message')
+            }
+            if page_result.get('status') != 'success':
+                failed += 1
+            
+            if progress_callback:
+                progress_callback({
+                    'pages_total': total_pages,
+                    'pages_done': len(pages),
+                    'pages_failed': failed,
+                    'last_page': item['page']
+                })
+            
+            if is_cancelled and is_cancelled():
+                cancelled = True
+                break
+        
+        ordered = [pages[number] for number in sorted(pages)]
+        confidences = [page['confidence'] for page in ordered if page['status'] == 'success']
+        
+        result = {
+            'status': 'cancelled' if cancelled else 'success',
+            'filename': filename,
+            'text': '\n\n'.join(page['text'] for page in ordered if page['text']),
+            'confidence': sum(confidences) / len(confidences) if confidences else 0.0,
+            'pages_total': total_pages,
+            'pages_processed': len(ordered),
+            'pages_failed': failed,
+            'pages': ordered,
+            'processing_time': time.monotonic() - start_time
+        }
+        
+        if not cancelled:
+            self._update_stats(result['processing_time'])
+            await loop.run_in_executor(self.cache_executor, self._save_to_cache, cache_key, result)
+        
+        return result
+    
     def _extract_text_sync(self, image_bytes: bytes, filename: str, 
                           languages: List[str] = None) -> Dict[str, Any]:
         """Sinhrono ekstraktuje tekst iz slike (internal method)"""
@@ -225,28 +875,7 @@ class OCRService:
             if image is None:
                 raise OCRError("Nije moguće dekodirati sliku", "OCR_DECODE_FAILED")
             
-            # Kompresuj sliku ako je potrebno
-            image = self._compress_image(image)
-            
-            # Primeni adaptive preprocessing
-            processed_image = self._adaptive_preprocess_image(image)
-            
-            # Postavi jezike
-            if languages is None:
-                languages = ['srp', 'eng']
-            
-            # Validacija jezika
-            for lang in languages:
-                if lang not in self.supported_languages:
-                    raise ValidationError(f"Jezik nije podržan: {lang}", "OCR_UNSUPPORTED_LANGUAGE")
-            
-            lang_string = '+'.join(languages)
-            
-            # OCR ekstrakcija sa multiple attempts
-            text, confidence = self._extract_text_with_fallback(processed_image, lang_string)
-            
-            # Post-processing
-            processed_text = self._post_process_text(text)
+            result = self._extract_text_from_image(image, languages)
             
             # Izračunaj processing time
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -255,14 +884,10 @@ class OCRService:
             self._update_stats(processing_time)
             
             return {
-                'status': 'success',
-                'text': processed_text,
-                'confidence': confidence,
-                'languages': languages,
-                'image_size': image.shape,
+                **result,
                 'filename': filename,
                 'processing_time': processing_time,
-                'cache_key': self._get_cache_key(image_bytes, languages)
+                'cache_key': self._get_cache_key(image_bytes, self._cache_languages(languages))
             }
             
         except ValidationError:
@@ -272,6 +897,66 @@ class OCRService:
         except Exception as e:
             raise OCRError(f"Neočekivana OCR greška: {str(e)}", "OCR_UNEXPECTED_ERROR")
     
+    def _extract_text_from_image(self, image: np.ndarray, languages: List[str] = None) -> Dict[str, Any]:
+        """
+        OCR pipeline za dekodiranu sliku (crop, tiling, preprocessing, jezik, Tesseract)
+        
+        Args:
+            image: Slika u BGR formatu
+            languages: Lista jezika (None = detekcija pisma)
+        
+        Returns:
+            Dict sa tekstom, confidence-om i detaljima obrade
+        """
+        # Odseci prazne margine - preprocessing i Tesseract rade samo na tekstu
+        image = self._crop_to_text_regions(image)
+        
+        # Velike slike se seku na tile-ove umesto smanjivanja (sitan tekst
+        # ostaje čitljiv); smanjuju se samo ekstremno velike slike
+        use_tiling = self._should_tile(image)
+        if use_tiling:
+            image = self._compress_to_pixel_budget(image, self.tile_max_pixels)
+        else:
+            image = self._compress_image(image)
+        
+        # Primeni adaptive preprocessing
+        processed_image = self._adaptive_preprocess_image(image)
+        
+        # Postavi jezike - detekcija pisma ako jezici nisu zadati
+        language_detection = None
+        if languages is None:
+            if self.auto_language:
+                languages, language_detection = self._detect_languages(processed_image)
+            else:
+                languages = list(self.default_languages)
+        
+        # Validacija jezika
+        for lang in languages:
+            if lang not in self.supported_languages:
+                raise ValidationError(f"Jezik nije podržan: {lang}", "OCR_UNSUPPORTED_LANGUAGE")
+        
+        lang_string = '+'.join(languages)
+        
+        # OCR ekstrakcija - tiled za velike slike, inače sa multiple attempts
+        tile_count = 0
+        if use_tiling:
+            text, confidence, tile_count = self._extract_text_tiled(processed_image, lang_string)
+        else:
+            text, confidence = self._extract_text_with_fallback(processed_image, lang_string)
+        
+        # Post-processing
+        processed_text = self._post_process_text(text)
+        
+        return {
+            'status': 'success',
+            'text': processed_text,
+            'confidence': confidence,
+            'languages': languages,
+            'image_size': image.shape,
+            'tiles': tile_count,
+            'language_detection': language_detection
+        }
+    
     def _adaptive_preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
         Adaptive preprocessing koji automatski odabira najbolje parametre
@@ -310,8 +995,8 @@ class OCRService:
             cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
             
             # Deskew ako je potrebno
-            if image_analysis['skew_angle'] > 2:
-                cleaned = self._deskew_image(cleaned)
+            if abs(image_analysis['skew_angle']) > 2:
+                cleaned = self._deskew_image(cleaned, image_analysis['skew_angle'])
             
             return cleaned
             
@@ -319,9 +1004,92 @@ class OCRService:
             self.logger.error(f"Adaptive preprocessing greška: {str(e)}")
             return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
+    def _make_thumbnail(self, image: np.ndarray, max_size: Optional[int] = None) -> Tuple[np.ndarray, float]:
+        """
+        Umanjena kopija slike za jeftinu analizu
+        
+        Returns:
+            Tuple (thumbnail, scale) gde je scale = thumbnail / original
+        """
+        max_size = max_size or self.analysis_thumbnail_size
+        height, width = image.shape[:2]
+        if max(height, width) <= max_size:
+            return image, 1.0
+        
+        scale = max_size / float(max(height, width))
+        thumbnail = cv2.resize(
+            image, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA
+        )
+        return thumbnail, scale
+    
+    def _detect_text_regions(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """
+        Detektuje blokove teksta (morfološki gradijent + konture) na thumbnail-u
+        
+        Returns:
+            Lista (x, y, w, h) u koordinatama originalne slike
+        """
+        thumbnail, scale = self._make_thumbnail(image)
+        gray = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY) if len(thumbnail.shape) == 3 else thumbnail
+        
+        # Gradijent ističe ivice slova, a horizontalno zatvaranje spaja slova u redove
+        gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+        _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 3)))
+        
+        contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w < 4 or h < 3:
+                continue
+            # Tekst ima dovoljno "mastila" u svom okviru - odbaci tanke linije i šum
+            fill_ratio = cv2.countNonZero(binary[y:y + h, x:x + w]) / float(w * h)
+            if fill_ratio < 0.2:
+                continue
+            regions.append((
+                int(x / scale), int(y / scale), int(np.ceil(w / scale)), int(np.ceil(h / scale))
+            ))
+        
+        return regions
+    
+    def _crop_to_text_regions(self, image: np.ndarray) -> np.ndarray:
+        """Seče sliku na okvir svih blokova teksta (uz marginu) ako se time dobija dovoljno"""
+        if not self.text_crop_enabled:
+            return image
+        
+        try:
+            regions = self._detect_text_regions(image)
+            if not regions:
+                return image
+            
+            height, width = image.shape[:2]
+            margin = max(10, int(0.01 * max(height, width)))
+            x0 = max(0, min(x for x, _, _, _ in regions) - margin)
+            y0 = max(0, min(y for _, y, _, _ in regions) - margin)
+            x1 = min(width, max(x + w for x, _, w, _ in regions) + margin)
+            y1 = min(height, max(y + h for _, y, _, h in regions) + margin)
+            
+            cropped_area = (x1 - x0) * (y1 - y0)
+            if cropped_area <= 0 or cropped_area > (1.0 - self.text_crop_min_gain) * height * width:
+                return image
+            
+            self.stats['cropped_images'] += 1
+            self.stats['cropped_pixels'] += height * width - cropped_area
+            self.logger.info(f"Slika isečena na tekst: {width}x{height} -> {x1 - x0}x{y1 - y0}")
+            return image[y0:y1, x0:x1]
+            
+        except Exception as e:
+            self.logger.warning(f"Text region detection greška: {e}")
+            return image
+    
     def _analyze_image_quality(self, gray_image: np.ndarray) -> Dict[str, float]:
-        """Analizira kvalitet slike za adaptive preprocessing"""
+        """Analizira kvalitet slike za adaptive preprocessing (na thumbnail-u)"""
         try:
+            # Statistike i skew su stabilne i na umanjenoj slici, a višestruko jeftinije
+            gray_image, scale = self._make_thumbnail(gray_image)
+            
             # Noise level (varijansa)
             noise_level = np.var(gray_image) / 255.0
             
@@ -332,7 +1100,7 @@ class OCRService:
             brightness = np.mean(gray_image) / 255.0
             
             # Skew detection
-            skew_angle = self._detect_skew_angle(gray_image)
+            skew_angle = self._detect_skew_angle(gray_image, hough_threshold=max(30, int(100 * scale)))
             
             return {
                 'noise_level': noise_level,
@@ -349,24 +1117,28 @@ class OCRService:
                 'skew_angle': 0
             }
     
-    def _detect_skew_angle(self, image: np.ndarray) -> float:
+    def _detect_skew_angle(self, image: np.ndarray, hough_threshold: int = 100) -> float:
         """Detektuje ugao nagnutosti teksta"""
         try:
             # Detektuj linije teksta
             edges = cv2.Canny(image, 50, 150, apertureSize=3)
-            lines = cv2.HoughLines(edges, 1, np.pi/180, threshold=100)
+            lines = cv2.HoughLines(edges, 1, np.pi / 360, threshold=hough_threshold)  # Korak 0.5°
             
             if lines is None:
                 return 0.0
             
-            angles = []
-            for rho, theta in lines[:10]:  # Uzmi prvih 10 linija
-                angle = theta * 180 / np.pi
-                if angle < 45 or angle > 135:
-                    angles.append(angle)
-            
-            if angles:
-                return np.mean(angles) - 90
+            # Redovi teksta su skoro horizontalne linije: normala im je blizu 90°,
+            # a nagib je odstupanje od 90° (vertikalne ivice i okviri se preskaču)
+            deviations = []
+            for rho, theta in lines[:, 0]:
+                deviation = theta * 180 / np.pi - 90
+                if abs(deviation) < 45:
+                    deviations.append(deviation)
+                    if len(deviations) == 20:  # Linije su sortirane po broju glasova
+                        break
+            
+            if deviations:
+                return float(np.median(deviations))
             else:
                 return 0.0
                 
@@ -375,30 +1147,48 @@ class OCRService:
             return 0.0
     
     def _extract_text_with_fallback(self, image: np.ndarray, lang_string: str) -> tuple:
-        """Ekstraktuje tekst sa fallback strategijama"""
+        """
+        Ekstraktuje tekst sa fallback strategijama
+        
+        Svaki mod je jedan Tesseract poziv (image_to_data daje i tekst i
+        confidence). Ako je default confidence nizak, PSM modovi se pokreću
+        paralelno i prvi dovoljno dobar rezultat prekida čekanje ostalih.
+        """
         try:
             # Prvi pokušaj - standardni OCR
-            text = pytesseract.image_to_string(image, lang=lang_string)
-            confidence = self._get_confidence(image, lang_string)
+            text, confidence = self._run_tesseract(image, lang_string)
             
             # Ako je confidence nizak, probaj sa različitim PSM modovima
-            if confidence < 50:
-                psm_modes = [6, 8, 13]  # Različiti PSM modovi
+            if confidence < self.fallback_confidence:
                 best_text = text
                 best_confidence = confidence
                 
-                for psm in psm_modes:
-                    try:
-                        config = f'--psm {psm}'
-                        alt_text = pytesseract.image_to_string(image, lang=lang_string, config=config)
-                        alt_confidence = self._get_confidence(image, lang_string, config)
+                futures = {
+                    self.psm_executor.submit(self._run_tesseract, image, lang_string, f'--psm {psm}'): psm
+                    for psm in self.psm_fallback_modes
+                }
+                
+                try:
+                    for future in as_completed(futures):
+                        psm = futures[future]
+                        try:
+                            alt_text, alt_confidence = future.result()
+                        except Exception as e:
+                            self.logger.warning(f"PSM {psm} greška: {e}")
+                            continue
                         
                         if alt_confidence > best_confidence:
                             best_text = alt_text
                             best_confidence = alt_confidence
-                    except Exception as e:
-                        self.logger.warning(f"PSM {psm} greška: {e}")
-                        continue
+                        
+                        # Early exit - dovoljno dobar rezultat
+                        if best_confidence >= self.good_confidence:
+                            self.logger.info(f"PSM {psm} dao dovoljan confidence ({best_confidence:.1f}), preskačem ostale")
+                            break
+                finally:
+                    # Otkaži pokušaje koji još nisu počeli
+                    for future in futures:
+                        future.cancel()
                 
                 text = best_text
                 confidence = best_confidence
@@ -409,6 +1199,92 @@ class OCRService:
             self.logger.error(f"Text extraction fallback greška: {str(e)}")
             return "", 0.0
     
+    def _run_tesseract(self, image: np.ndarray, lang: str, config: str = '') -> tuple:
+        """
+        Jedan Tesseract poziv koji vraća tekst i prosečni confidence
+        
+        Args:
+            image: Preprocessed slika
+            lang: Jezik za OCR
+            config: Dodatna Tesseract konfiguracija (npr. '--psm 6')
+        
+        Returns:
+            Tuple (tekst, confidence 0-100)
+        """
+        data = self._tesseract_data(image, lang, config)
+        return self._text_from_data(data), self._confidence_from_data(data)
+    
+    def _tesseract_data(self, image: np.ndarray, lang: str, config: str = '') -> Dict[str, List]:
+        """Sirov image_to_data rezultat (reči, pozicije, confidence)"""
+        if self.engine is not self.fallback_engine:
+            try:
+                return self.engine.image_to_data(image, lang, config)
+            except Exception as e:
+                self.logger.warning(f"{self.engine.name} greška, koristi se pytesseract: {e}")
+        return self.fallback_engine.image_to_data(image, lang, config)
+    
+    def _text_from_data(self, data: Dict[str, List]) -> str:
+        """Rekonstruiše tekst iz image_to_data rezultata (redovi i paragrafi)"""
+        lines = []
+        current_line_key = None
+        current_par_key = None
+        current_words: List[str] = []
+        
+        for i, word in enumerate(data.get('text', [])):
+            word = (word or '').strip()
+            if not word:
+                continue
+            
+            par_key = (data['page_num'][i], data['block_num'][i], data['par_num'][i])
+            line_key = par_key + (data['line_num'][i],)
+            
+            if line_key != current_line_key:
+                if current_words:
+                    lines.append(' '.join(current_words))
+                # Prazan red između paragrafa
+                if current_par_key is not None and par_key != current_par_key:
+                    lines.append('')
+                current_words = []
+                current_line_key = line_key
+                current_par_key = par_key
+            
+            current_words.append(word)
+        
+        if current_words:
+            lines.append(' '.join(current_words))
+        
+        return '\n'.join(lines)
+    
+    def _confidence_from_data(self, data: Dict[str, List]) -> float:
+        """Računa prosečni confidence iz image_to_data rezultata"""
+        confidences = []
+        for conf in data.get('conf', []):
+            try:
+                value = float(conf)
+            except (TypeError, ValueError):
+                continue
+            if value > 0:
+                confidences.append(value)
+        
+        if confidences:
+            return sum(confidences) / len(confidences)
+        return 0.0
+    
+    def _boxes_from_data(self, data: Dict[str, List], image_height: int) -> str:
+        """
+        Bounding boxes reči iz image_to_data rezultata u image_to_boxes formatu
+        ("tekst levo dole desno gore strana", y osa od donje ivice slike)
+        """
+        lines = []
+        for i, word in enumerate(data.get('text', [])):
+            word = (word or '').strip()
+            if not word:
+                continue
+            left, top = int(data['left'][i]), int(data['top'][i])
+            right, bottom = left + int(data['width'][i]), top + int(data['height'][i])
+            lines.append(f"{word} {left} {image_height - bottom} {right} {image_height - top} {data['page_num'][i]}")
+        return '\n'.join(lines)
+    
     def _post_process_text(self, text: str) -> str:
         """Post-processing teksta za bolje rezultate"""
         try:
@@ -489,25 +1365,17 @@ class OCRService:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Vraća cache statistike"""
         try:
-            cache_size = 0
-            cache_count = 0
-            
-            if os.path.exists(self.cache_dir):
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith('.json'):
-                        filepath = os.path.join(self.cache_dir, filename)
-                        cache_size += os.path.getsize(filepath)
-                        cache_count += 1
+            store_stats = self.cache_store.get_stats() if self.cache_store else {}
+            total_lookups = self.stats['cache_hits'] + self.stats['cache_misses']
             
             return {
-                'cache_size_mb': cache_size / (1024 * 1024),
-                'cache_count': cache_count,
+                **store_stats,
                 'cache_hits': self.stats['cache_hits'],
                 'cache_misses': self.stats['cache_misses'],
+                'hash_lookups': self.stats['hash_lookups'],
                 'hit_rate': (
-                    self.stats['cache_hits'] / 
-                    (self.stats['cache_hits'] + self.stats['cache_misses'])
-                    if (self.stats['cache_hits'] + self.stats['cache_misses']) > 0 else 0
+                    self.stats['cache_hits'] / total_lookups
+                    if total_lookups > 0 else 0
                 )
             }
         except Exception as e:
@@ -517,20 +1385,11 @@ class OCRService:
     def clear_cache(self, older_than_hours: int = 24):
         """Briše stari cache"""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=older_than_hours)
-            cleared_count = 0
-            
-            if os.path.exists(self.cache_dir):
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith('.json'):
-                        filepath = os.path.join(self.cache_dir, filename)
-                        file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                        
-                        if file_time < cutoff_time:
-                            os.remove(filepath)
-                            cleared_count += 1
+            if not self.cache_store:
+                return 0
             
-            self.logger.info(f"Obrisano {cleared_count} cache fajlova")
+            cleared_count = self.cache_store.clear_older_than(older_than_hours * 3600)
+            self.logger.info(f"Obrisano {cleared_count} cache unosa")
             return cleared_count
             
         except Exception as e:
@@ -595,21 +1454,15 @@ class OCRService:
             # Kombinuj jezike za Tesseract
             lang_string = '+'.join(languages)
             
-            # OCR ekstrakcija
+            # OCR ekstrakcija (tekst, confidence i bounding boxes iz jednog poziva)
             try:
-                text = pytesseract.image_to_string(processed_image, lang=lang_string)
+                data = self._tesseract_data(processed_image, lang_string)
+                text, confidence = self._text_from_data(data), self._confidence_from_data(data)
             except Exception as e:
                 raise OCRError(f"Greška pri OCR ekstrakciji: {str(e)}", "OCR_EXTRACTION_FAILED")
             
-            # Dobavi confidence score
-            confidence = self._get_confidence(processed_image, lang_string)
-            
-            # Dobavi bounding boxes za debugging
-            try:
-                boxes = pytesseract.image_to_boxes(processed_image, lang=lang_string)
-            except Exception as e:
-                self.logger.warning(f"Greška pri dobavljanju bounding boxes: {e}")
-                boxes = ""
+            # Bounding boxes za debugging (bez dodatnog Tesseract poziva)
+            boxes = self._boxes_from_data(data, processed_image.shape[0])
             
             return {
                 'status': 'success',
@@ -679,10 +1532,9 @@ class OCRService:
             
             lang_string = '+'.join(languages)
             
-            # OCR ekstrakcija
+            # OCR ekstrakcija (tekst i confidence iz jednog poziva)
             try:
-                text = pytesseract.image_to_string(processed_image, lang=lang_string)
-                confidence = self._get_confidence(processed_image, lang_string)
+                text, confidence = self._run_tesseract(processed_image, lang_string)
             except Exception as e:
                 raise OCRError(f"Greška pri OCR ekstrakciji: {str(e)}", "OCR_EXTRACTION_FAILED")
             
@@ -738,25 +1590,21 @@ class OCRService:
             # Vrati original ako preprocessing ne uspe
             return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    def _get_confidence(self, image: np.ndarray, lang: str) -> float:
+    def _get_confidence(self, image: np.ndarray, lang: str, config: str = '') -> float:
         """
         Računa prosečni confidence score za OCR
         
         Args:
             image: Preprocessed slika
             lang: Jezik za OCR
+            config: Dodatna Tesseract konfiguracija (opciono)
         
         Returns:
             Prosečni confidence score (0-100)
         """
         try:
-            data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            
-            if confidences:
-                return sum(confidences) / len(confidences)
-            else:
-                return 0.0
+            data = self._tesseract_data(image, lang, config)
+            return self._confidence_from_data(data)
                 
         except Exception as e:
             self.logger.error(f"Confidence greška: {str(e)}")
@@ -806,6 +1654,7 @@ class OCRService:
                 'status': 'success',
                 'tesseract_version': str(version),
                 'tesseract_path': pytesseract.pytesseract.tesseract_cmd,
+                'engine': self.engine.get_info(),
                 'supported_formats': self.supported_formats,
                 'supported_languages': self.supported_languages,
                 'available_languages': pytesseract.get_languages()
@@ -819,7 +1668,7 @@ class OCRService:
     
     def extract_text_batch(self, image_paths: List[str], languages: List[str] = None) -> List[Dict[str, Any]]:
         """
-        Ekstraktuje tekst iz više slika odjednom
+        Ekstraktuje tekst iz više slika odjednom (paralelno, redosled se čuva)
         
         Args:
             image_paths: Lista putanja do slika
@@ -828,25 +1677,22 @@ class OCRService:
         Returns:
             Lista rezultata OCR-a za svaku sliku
         """
-        results = []
-        
-        for image_path in image_paths:
+        def process(image_path: str) -> Dict[str, Any]:
             try:
                 result = self.extract_text(image_path, languages)
-                results.append({
-                    'image_path': image_path,
-                    'result': result
-                })
             except Exception as e:
-                results.append({
-                    'image_path': image_path,
-                    'result': {
-                        'status': 'error',
-                        'message': str(e)
-                    }
-                })
+                result = {
+                    'status': 'error',
+                    'message': str(e)
+                }
+            return {
+                'image_path': image_path,
+                'result': result
+            }
         
-        return results
+        # Poseban pool - ova metoda može biti pozvana i iz OCR executor-a
+        with ThreadPoolExecutor(max_workers=Config.OCR_BATCH_CONCURRENCY) as pool:
+            return list(pool.map(process, image_paths))
     
     def extract_text_with_confidence_filter(self, image_path: str, min_confidence: float = 50.0, 
                                           languages: List[str] = None) -> Dict[str, Any]:
@@ -908,9 +1754,8 @@ class OCRService:
             
             lang_string = '+'.join(languages)
             
-            # OCR ekstrakcija
-            text = pytesseract.image_to_string(processed_image, lang=lang_string)
-            confidence = self._get_confidence(processed_image, lang_string)
+            # OCR ekstrakcija (tekst i confidence iz jednog poziva)
+            text, confidence = self._run_tesseract(processed_image, lang_string)
             
             return {
                 'status': 'success',
@@ -980,26 +1825,23 @@ class OCRService:
             self.logger.error(f"Custom preprocessing greška: {str(e)}")
             return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    def _deskew_image(self, image: np.ndarray) -> np.ndarray:
+    def _deskew_image(self, image: np.ndarray, angle: Optional[float] = None) -> np.ndarray:
         """
         Rotira sliku da ispravi nagnutost teksta
         
         Args:
             image: Input slika
+            angle: Izmeren nagib u stepenima (ako nije prosleđen, meri se na thumbnail-u)
         
         Returns:
             Deskewed slika
         """
         try:
-            # Detektuj ugao rotacije
-            coords = np.column_stack(np.where(image > 0))
-            angle = cv2.minAreaRect(coords)[-1]
-            
-            # Ako je ugao manji od -45, rotiraj za 90 stepeni
-            if angle < -45:
-                angle = -(90 + angle)
-            else:
-                angle = -angle
+            if angle is None:
+                thumbnail, scale = self._make_thumbnail(image)
+                angle = self._detect_skew_angle(thumbnail, hough_threshold=max(30, int(100 * scale)))
+            if abs(angle) < 0.1:
+                return image
             
             # Rotiraj sliku
             (h, w) = image.shape[:2]
@@ -1034,7 +1876,8 @@ class OCRService:
                     'confidence_filtering': True,
                     'custom_preprocessing': True,
                     'deskew': True,
-                    'image_resize': True
+                    'image_resize': True,
+                    'tiled_ocr': self.tiling_enabled
                 }
             }
         except Exception as e:
@@ -3,11 +3,10 @@ OpenAI Service
 Upravlja komunikacijom sa OpenAI API-jem
 """
 
-import os
-import asyncio
 import logging
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, APITimeoutError
 from .config import Config
 from .error_handler import ExternalServiceError, ErrorCategory, ErrorSeverity
 
@@ -19,32 +18,109 @@ class OpenAIService:
     def __init__(self):
         """Inicijalizuj OpenAI servis"""
         self.api_key = Config.OPENAI_API_KEY
+        self.base_url = Config.OPENAI_BASE_URL
         self.model = Config.OPENAI_MODEL
         self.max_tokens = Config.OPENAI_MAX_TOKENS
         self.temperature = Config.OPENAI_TEMPERATURE
+        self.timeout = Config.OPENAI_TIMEOUT
+        
+        self.stats = {
+            'requests': 0,
+            'in_flight': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'streams_cancelled': 0
+        }
+        # Otvoreni stream-ovi - broje se u in_flight dok ih close_stream ne zatvori
+        self._open_streams = set()
         
         if not self.api_key:
             logger.warning("OpenAI API ključ nije postavljen")
             self.client = None
         else:
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                # Async klijent na deljenom connection pool-u - pozivi ne zauzimaju
+                # thread-ove executor-a, a konekcije se ponovo koriste (keep-alive)
+                self.client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=self._create_http_client(),
+                    timeout=self._timeout(self.timeout),
+                    max_retries=Config.OPENAI_MAX_RETRIES
+                )
                 logger.info(f"OpenAI servis inicijalizovan sa modelom: {self.model}")
+                if self.base_url:
+                    logger.info(f"OpenAI API adresa: {self.base_url}")
             except Exception as e:
                 logger.error(f"Greška pri inicijalizaciji OpenAI klijenta: {e}")
                 self.client = None
     
+    @staticmethod
+    def _timeout(read_timeout: float) -> httpx.Timeout:
+        """Timeout-i zahteva (read = najduža pauza između bajtova odgovora)"""
+        return httpx.Timeout(
+            read_timeout,
+            connect=Config.OPENAI_CONNECT_TIMEOUT,
+            pool=Config.OPENAI_POOL_TIMEOUT
+        )
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Deljeni HTTP pool za sve OpenAI pozive"""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.OPENAI_MAX_KEEPALIVE,
+                keepalive_expiry=Config.OPENAI_KEEPALIVE_EXPIRY
+            ),
+            timeout=self._timeout(self.timeout),
+            follow_redirects=True
+        )
+    
     def is_available(self) -> bool:
         """Proveri da li je OpenAI servis dostupan"""
         return self.client is not None and self.api_key is not None
     
+    async def close(self):
+        """Zatvori connection pool (pri gašenju aplikacije)"""
+        if self.client is not None:
+            await self.client.close()
+    
+    async def close_stream(self, stream, cancelled: bool = False):
+        """
+        Zatvori streaming odgovor - ako generisanje nije završeno, zatvaranje
+        HTTP odgovora prekida upstream zahtev (OpenAI prestaje da generiše)
+        """
+        if cancelled:
+            self.stats['streams_cancelled'] += 1
+        if id(stream) in self._open_streams:
+            self._open_streams.discard(id(stream))
+            self.stats['in_flight'] -= 1
+        try:
+            if hasattr(stream, "close"):
+                await stream.close()
+            elif hasattr(stream, "response"):
+                await stream.response.aclose()
+        except Exception as e:
+            logger.warning(f"Greška pri zatvaranju OpenAI stream-a: {e}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistike poziva i podešavanja pool-a"""
+        return {
+            **self.stats,
+            'base_url': self.base_url or "https://api.openai.com/v1",
+            'max_connections': Config.OPENAI_MAX_CONNECTIONS,
+            'max_keepalive_connections': Config.OPENAI_MAX_KEEPALIVE,
+            'timeout': self.timeout
+        }
+    
     async def chat_completion(
         self, 
         messages: List[Dict[str, str]], 
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
-        stream: bool = False
+        stream: bool = False,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Pošalji chat completion zahtev ka OpenAI API-ju
@@ -55,9 +131,10 @@ class OpenAIService:
             max_tokens: Maksimalan broj tokena (opciono)
             temperature: Temperatura za kreativnost (opciono)
             stream: Da li da koristi streaming (opciono)
+            timeout: Read timeout za ovaj poziv u sekundama (opciono)
         
         Returns:
-            Dict sa odgovorom od OpenAI-a
+            Dict sa odgovorom od OpenAI-a (za stream=True async iterator chunk-ova)
         """
         try:
             if not self.is_available():
@@ -73,21 +150,27 @@ class OpenAIService:
             
             logger.info(f"Slanje zahteva ka OpenAI sa modelom: {model}")
             
-            # Pošalji zahtev ka OpenAI (asinhrono poziv)
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
+            self.stats['requests'] += 1
+            self.stats['in_flight'] += 1
+            response = None
+            try:
+                response = await self.client.chat.completions.create(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    stream=stream
+                    stream=stream,
+                    timeout=self._timeout(timeout or self.timeout)
                 )
-            )
+            finally:
+                # Stream je u toku sve dok ga close_stream ne zatvori
+                if stream and response is not None:
+                    self._open_streams.add(id(response))
+                else:
+                    self.stats['in_flight'] -= 1
             
             if stream:
-                # Za streaming, vraćamo generator
+                # Za streaming, vraćamo async iterator (AsyncStream)
                 return response
             else:
                 # Za obične zahteve, vraćamo sadržaj
@@ -105,7 +188,18 @@ class OpenAIService:
                     "model": model
                 }
                 
+        except ExternalServiceError:
+            raise
+        except APITimeoutError as e:
+            self.stats['errors'] += 1
+            self.stats['timeouts'] += 1
+            logger.error(f"OpenAI zahtev je istekao: {e}")
+            raise ExternalServiceError(
+                f"OpenAI zahtev je istekao: {str(e)}",
+                "OPENAI_TIMEOUT"
+            )
         except Exception as e:
+            self.stats['errors'] += 1
             logger.error(f"Greška pri komunikaciji sa OpenAI: {e}")
             raise ExternalServiceError(
                 f"Greška pri komunikaciji sa OpenAI: {str(e)}",
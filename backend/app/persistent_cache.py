@@ -0,0 +1,186 @@
+"""
+Persistent Cache
+SQLite L2 nivo ispod Redis-a za skupe artefakte (AI odgovori, embeddings,
+rezultati pretrage) - preživljava restart i radi i bez Redis-a
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+class PersistentCacheTier:
+    """
+    L2 cache nad `cache` tabelom DatabaseManager-a
+
+    Upisi se skupljaju u bafer i upisuju u batch-evima (jedna transakcija),
+    a pozadinski sweeper briše istekle redove i drži tabelu ispod budžeta.
+    Vrednosti su već enkodirani bajtovi (CacheCodec). Sve SQLite operacije
+    idu kroz jedan worker thread redom kojim su zadate, pa brisanje zadato
+    posle flush-a ne može da se izvrši pre batch upisa (i obrnuto).
+    """
+
+    def __init__(self, db: DatabaseManager, namespaces: Iterable[str], max_bytes: int,
+                 flush_interval: float = 1.0, batch_size: int = 200, sweep_interval: float = 300.0):
+        self.db = db
+        self.namespaces = set(namespaces)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.sweep_interval = sweep_interval
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-l2")
+        # key -> (data, cache_type, expires_at) - čeka na batch upis
+        self._pending: Dict[str, Tuple[bytes, str, float]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._last_sweep = time.time()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'batches': 0,
+            'swept_expired': 0,
+            'evicted_budget': 0,
+            'errors': 0
+        }
+
+    def handles(self, key: str) -> bool:
+        """Da li se ključ čuva u L2 (po namespace-u)"""
+        return key.split(":", 1)[0] in self.namespaces
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        """
+        Dohvati enkodiranu vrednost
+
+        Returns:
+            Tuple (bajtovi, preostali TTL u sekundama) ili None
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            remaining = pending[2] - time.time()
+            if remaining > 0:
+                self.stats['hits'] += 1
+                return pending[0], remaining
+            del self._pending[key]
+
+        try:
+            entry = await self._run(self.db.get_cache_entry, key)
+        except Exception as e:
+            logger.warning(f"Greška pri čitanju L2 cache-a: {e}")
+            self.stats['errors'] += 1
+            return None
+
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        data, remaining = entry
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return data, remaining
+
+    def put(self, key: str, data: bytes, ttl: int):
+        """Dodaj upis u bafer (upisuje se u sledećem batch-u)"""
+        self._pending[key] = (data, key.split(":", 1)[0], time.time() + ttl)
+        if len(self._pending) >= self.batch_size and (self._flush_task is None or self._flush_task.done()):
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                pass
+
+    async def flush(self) -> int:
+        """Upiši bafer u jednoj transakciji"""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        now = time.time()
+        # TTL se računa od put(), ne od trenutka upisa bafera
+        entries = [
+            (key, data, cache_type, max(1, int(expires_at - now)))
+            for key, (data, cache_type, expires_at) in pending.items()
+            if expires_at > now
+        ]
+        try:
+            written = await self._run(self.db.set_cache_many, entries)
+        except Exception as e:
+            logger.warning(f"Greška pri batch upisu L2 cache-a: {e}")
+            self.stats['errors'] += 1
+            return 0
+        self.stats['writes'] += written
+        self.stats['batches'] += 1
+        return written
+
+    async def delete(self, keys: Iterable[str]):
+        keys = [key for key in keys if self.handles(key)]
+        if not keys:
+            return
+        for key in keys:
+            self._pending.pop(key, None)
+        await self._run(lambda: self.db.delete_cache_keys(keys=keys))
+
+    async def clear(self, prefix: str = "") -> int:
+        """Obriši ključeve sa prefiksom (prazan prefiks = sve)"""
+        for key in [key for key in self._pending if key.startswith(prefix)]:
+            del self._pending[key]
+        return await self._run(lambda: self.db.delete_cache_keys(prefix=prefix))
+
+    async def sweep(self):
+        """Obriši istekle redove i primeni budžet veličine"""
+        expired = await self._run(self.db.delete_expired_cache)
+        evicted = await self._run(self.db.enforce_cache_budget, self.max_bytes)
+        self.stats['swept_expired'] += expired
+        self.stats['evicted_budget'] += evicted
+        self._last_sweep = time.time()
+        if expired or evicted:
+            logger.info(f"L2 cache sweep: {expired} isteklih, {evicted} izbačenih zbog budžeta")
+
+    async def _worker(self):
+        """Periodični flush bafera i sweep"""
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+                if time.time() - self._last_sweep >= self.sweep_interval:
+                    await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Greška u L2 cache worker-u: {e}")
+                self.stats['errors'] += 1
+
+    async def start(self):
+        if self._worker_task is None:
+            await self.sweep()
+            self._worker_task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'namespaces': sorted(self.namespaces),
+            'max_bytes': self.max_bytes,
+            'pending_writes': len(self._pending),
+            'hit_rate': round(self.stats['hits'] / lookups * 100, 2) if lookups else 0.0,
+            'worker_running': self._worker_task is not None and not self._worker_task.done(),
+            **self.stats
+        }
@@ -25,6 +25,11 @@ class RAGService:
         self.vector_index = None
         self.documents = []
         self.document_embeddings = []
+        # Generacija indeksa - menja se pri svakom dodavanju/brisanju, pa
+        # cache ključevi RAG odgovora vezani za staru generaciju zastarevaju
+        self.generation = 0
+        # chunk ID -> pozicija u self.documents (= pozicija u FAISS indeksu)
+        self._positions: Dict[str, int] = {}
         
         # Lokalni storage putanje
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'vector_index')
@@ -36,6 +41,7 @@ class RAGService:
         
         # Učitaj postojeće dokumente
         self._load_documents()
+        self._load_metadata()
         
         # Inicijalizuj embedding model
         self._init_embedding_model()
@@ -66,6 +72,33 @@ class RAGService:
         except Exception as e:
             logger.error(f"Greška pri čuvanju dokumenata: {e}")
     
+    def _load_metadata(self):
+        """Učitaj metapodatke indeksa (generaciju)"""
+        try:
+            if os.path.exists(self.metadata_file):
+                with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                    self.generation = int(json.load(f).get('generation', 0))
+        except Exception as e:
+            logger.error(f"Greška pri učitavanju metapodataka indeksa: {e}")
+    
+    def _save_metadata(self):
+        """Sačuvaj metapodatke indeksa"""
+        try:
+            with open(self.metadata_file, 'w', encoding='utf-8') as f:
+                json.dump({'generation': self.generation, 'updated_at': datetime.now().isoformat()}, f)
+        except Exception as e:
+            logger.error(f"Greška pri čuvanju metapodataka indeksa: {e}")
+    
+    def _bump_generation(self):
+        """Nova generacija indeksa (posle izmene skupa dokumenata)"""
+        self.generation += 1
+        self._save_metadata()
+        logger.info(f"RAG indeks generacija: {self.generation}")
+    
+    def get_generation(self) -> int:
+        """Trenutna generacija indeksa (deo cache ključa RAG odgovora)"""
+        return self.generation
+    
     def _init_embedding_model(self):
         """Inicijalizuj embedding model"""
         try:
@@ -82,6 +115,8 @@ class RAGService:
                 logger.error("Embedding model nije inicijalizovan")
                 return
             
+            self._positions = {doc['id']: i for i, doc in enumerate(self.documents)}
+            
             # Kreiraj FAISS index
             embedding_dim = self.embedding_model.get_sentence_embedding_dimension()
             self.vector_index = faiss.IndexFlatIP(embedding_dim)
@@ -170,6 +205,7 @@ class RAGService:
                 }
                 
                 # Dodaj u listu dokumenata
+                self._positions[chunk_doc['id']] = len(self.documents)
                 self.documents.append(chunk_doc)
                 
                 # Dodaj u vector index
@@ -179,6 +215,7 @@ class RAGService:
             
             # Sačuvaj u lokalni storage
             self._save_documents()
+            self._bump_generation()
             
             logger.info(f"Dokument {doc_id} uspešno dodat u RAG sistem sa {len(chunks)} chunks")
             return doc_id
@@ -214,6 +251,24 @@ class RAGService:
             logger.error(f"Greška pri pretraživanju: {e}")
             return []
     
+    def get_chunks(self, hits: List[List[Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rekonstruiši rezultate pretrage iz keširanih [chunk_id, score] parova
+        
+        Returns:
+            Rezultati u istom obliku kao search(), ili None ako neki chunk više ne postoji
+        """
+        results = []
+        for rank, (chunk_id, score) in enumerate(hits, start=1):
+            position = self._positions.get(chunk_id)
+            if position is None:
+                return None
+            doc = self.documents[position].copy()
+            doc['score'] = float(score)
+            doc['rank'] = rank
+            results.append(doc)
+        return results
+    
     def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Dohvati dokument po ID-u"""
         for doc in self.documents:
@@ -222,27 +277,27 @@ class RAGService:
         return None
     
     def delete_document(self, doc_id: str) -> bool:
-        """Obriši dokument"""
+        """Obriši dokument (chunk po ID-u ili sve chunk-ove originalnog dokumenta)"""
         try:
             # Pronađi dokument
-            doc_index = None
-            for i, doc in enumerate(self.documents):
-                if doc['id'] == doc_id:
-                    doc_index = i
-                    break
+            remaining = [
+                doc for doc in self.documents
+                if doc['id'] != doc_id and doc.get('metadata', {}).get('original_doc_id') != doc_id
+            ]
             
-            if doc_index is None:
+            if len(remaining) == len(self.documents):
                 logger.warning(f"Dokument {doc_id} nije pronađen")
                 return False
             
             # Ukloni iz liste
-            removed_doc = self.documents.pop(doc_index)
+            self.documents = remaining
             
             # Rekreiraj vector index (FAISS ne podržava brisanje)
             self._init_vector_index()
             
             # Sačuvaj u lokalni storage
             self._save_documents()
+            self._bump_generation()
             
             logger.info(f"Dokument {doc_id} uspešno obrisan")
             return True
@@ -257,6 +312,7 @@ class RAGService:
             'total_documents': len(self.documents),
             'vector_index_size': self.vector_index.ntotal if self.vector_index else 0,
             'embedding_model': 'all-MiniLM-L6-v2' if self.embedding_model else None,
+            'generation': self.generation,
             'storage_type': 'local',
             'last_updated': datetime.now().isoformat()
         }
@@ -0,0 +1,210 @@
+"""
+Semantic Cache
+FAISS indeks embedding-a upita za keširane AI odgovore - parafrazirano
+ponovljeno pitanje pronalazi postojeći odgovor bez poziva modela
+"""
+
+import time
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import faiss
+
+logger = logging.getLogger(__name__)
+
+class SemanticCacheIndex:
+    """
+    ANN indeks (kosinusna sličnost) nad upitima keširanih odgovora
+
+    Sam odgovor ostaje u Redis-u; indeks čuva samo embedding upita i
+    Redis ključ. Unosi ističu zajedno sa Redis TTL-om, a unos čiji ključ
+    više ne postoji u Redis-u se uklanja pri prvom pogotku.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 10000,
+                 top_k: int = 5, purge_interval: float = 60.0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.top_k = top_k
+        self.purge_interval = purge_interval
+
+        self.encoder = None
+        self.dimension: Optional[int] = None
+        self.index = None
+
+        self._lock = threading.Lock()
+        self._next_id = 1
+        # id -> {'key', 'namespace', 'query', 'expires_at'}
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._ids_by_key: Dict[str, int] = {}
+        self._last_purge = time.time()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'stale_hits': 0,
+            'added': 0,
+            'expired': 0,
+            'evicted': 0,
+            'total_lookup_time': 0.0
+        }
+
+    def attach_encoder(self, encoder):
+        """
+        Postavi embedding model (SentenceTransformer ili objekat sa encode metodom)
+
+        Model se deli sa RAG servisom, pa se ne učitava dva puta.
+        """
+        if encoder is None:
+            return
+        with self._lock:
+            self.encoder = encoder
+            self.dimension = encoder.get_sentence_embedding_dimension()
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+            self._entries.clear()
+            self._ids_by_key.clear()
+        logger.info(f"Semantic cache indeks inicijalizovan (dim={self.dimension}, prag={self.threshold})")
+
+    def is_ready(self) -> bool:
+        return self.encoder is not None and self.index is not None
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Normalizovan embedding (inner product = kosinusna sličnost)"""
+        vector = np.asarray(self.encoder.encode(text), dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def add(self, query: str, key: str, ttl: float, namespace: str = "default"):
+        """Dodaj upit sa Redis ključem odgovora (blokirajuće - poziva se iz executor-a)"""
+        if not self.is_ready() or not query:
+            return
+
+        vector = self._embed(query)
+        now = time.time()
+
+        with self._lock:
+            # Isti ključ se prepisuje
+            old_id = self._ids_by_key.get(key)
+            if old_id is not None:
+                self._remove_ids_locked([old_id])
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = {
+                'key': key,
+                'namespace': namespace,
+                'query': query,
+                'expires_at': now + ttl
+            }
+            self._ids_by_key[key] = entry_id
+            self.stats['added'] += 1
+
+            if now - self._last_purge > self.purge_interval:
+                self._purge_expired_locked(now)
+            self._evict_locked()
+
+    def search(self, query: str, namespace: str = "default",
+               threshold: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """
+        Najbliži keširani upit iznad praga sličnosti
+
+        Returns:
+            Tuple (Redis ključ, sličnost) ili None
+        """
+        if not self.is_ready() or not query:
+            return None
+
+        start = time.perf_counter()
+        threshold = self.threshold if threshold is None else threshold
+        vector = self._embed(query)
+        now = time.time()
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            match = None
+            if self.index.ntotal > 0:
+                scores, ids = self.index.search(vector, min(self.top_k, self.index.ntotal))
+                for score, entry_id in zip(scores[0], ids[0]):
+                    if entry_id < 0 or score < threshold:
+                        continue
+                    entry = self._entries.get(int(entry_id))
+                    if entry is None or entry['namespace'] != namespace:
+                        continue
+                    if entry['expires_at'] <= now:
+                        continue
+                    match = (entry['key'], float(score))
+                    break
+
+            self.stats['hits' if match else 'misses'] += 1
+            self.stats['total_lookup_time'] += time.perf_counter() - start
+            return match
+
+    def remove_key(self, key: str, stale: bool = False) -> bool:
+        """Ukloni unos po Redis ključu (npr. ključ je istekao ili obrisan)"""
+        with self._lock:
+            entry_id = self._ids_by_key.get(key)
+            if entry_id is None:
+                return False
+            self._remove_ids_locked([entry_id])
+            if stale:
+                self.stats['stale_hits'] += 1
+            return True
+
+    def clear(self, key_prefix: str = "") -> int:
+        """Obriši unose čiji ključ počinje prefiksom (prazan prefiks = sve)"""
+        with self._lock:
+            ids = [entry_id for entry_id, entry in self._entries.items() if entry['key'].startswith(key_prefix)]
+            self._remove_ids_locked(ids)
+            return len(ids)
+
+    def purge_expired(self) -> int:
+        """Ukloni istekle unose"""
+        with self._lock:
+            return self._purge_expired_locked(time.time())
+
+    def _purge_expired_locked(self, now: float) -> int:
+        expired = [entry_id for entry_id, entry in self._entries.items() if entry['expires_at'] <= now]
+        self._remove_ids_locked(expired)
+        self.stats['expired'] += len(expired)
+        self._last_purge = now
+        return len(expired)
+
+    def _evict_locked(self):
+        """Izbaci unose koji najranije ističu kada se pređe max_entries"""
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+        victims = sorted(self._entries, key=lambda entry_id: self._entries[entry_id]['expires_at'])[:overflow]
+        self._remove_ids_locked(victims)
+        self.stats['evicted'] += len(victims)
+
+    def _remove_ids_locked(self, ids: List[int]):
+        if not ids:
+            return
+        self.index.remove_ids(np.array(ids, dtype=np.int64))
+        for entry_id in ids:
+            entry = self._entries.pop(entry_id, None)
+            if entry and self._ids_by_key.get(entry['key']) == entry_id:
+                del self._ids_by_key[entry['key']]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistike semantic cache-a"""
+        lookups = self.stats['lookups']
+        return {
+            'enabled': self.is_ready(),
+            'entries': len(self._entries),
+            'threshold': self.threshold,
+            'lookups': lookups,
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'hit_rate': round(self.stats['hits'] / lookups * 100, 2) if lookups else 0.0,
+            'stale_hits': self.stats['stale_hits'],
+            'added': self.stats['added'],
+            'expired': self.stats['expired'],
+            'evicted': self.stats['evicted'],
+            'avg_lookup_ms': round(self.stats['total_lookup_time'] / lookups * 1000, 3) if lookups else 0.0
+        }
@@ -0,0 +1,88 @@
+"""
+Single Flight
+Spajanje istovremenih identičnih zahteva - svi čekaju jedno zajedničko
+izračunavanje umesto da svaki poziva skupi servis (npr. LLM)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Najviše jedno izračunavanje u toku po ključu
+
+    Izračunavanje radi u zasebnom task-u, pa prekid zahteva koji ga je
+    pokrenuo (npr. klijent zatvori konekciju) ne prekida ostale koji čekaju.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0,
+            'refreshes': 0,
+            'refresh_skipped': 0,
+            'errors': 0
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Izvrši fn za ključ ili se pridruži izvršavanju koje je već u toku
+
+        Returns:
+            Tuple (rezultat, shared) - shared je True ako je rezultat deljen
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            task = self._start(key, fn)
+            self.stats['leaders'] += 1
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(task), shared
+
+    def refresh(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Pokreni osvežavanje u pozadini (stale-while-revalidate)
+
+        Returns:
+            True ako je osvežavanje pokrenuto, False ako je već u toku
+        """
+        if key in self._calls:
+            self.stats['refresh_skipped'] += 1
+            return False
+        task = self._start(key, fn)
+        task.add_done_callback(self._log_refresh_error)
+        self.stats['refreshes'] += 1
+        return True
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    def _start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = asyncio.create_task(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats['errors'] += 1
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Greška pri osvežavanju cache-a u pozadini: {task.exception()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistike spajanja zahteva"""
+        total = self.stats['leaders'] + self.stats['coalesced']
+        return {
+            'in_flight': len(self._calls),
+            **self.stats,
+            'coalesced_ratio': round(self.stats['coalesced'] / total * 100, 2) if total else 0.0
+        }
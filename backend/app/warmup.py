@@ -0,0 +1,143 @@
+"""
+Warm-up
+Zagrevanje instance pri startup-u: embedding model, vector indeks i cache
+se pune najčešćim nedavnim upitima pre nego što se instanca označi kao spremna
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class WarmupManager:
+    """
+    Warm-up faza i readiness stanje instance
+
+    Izvori upita: `analytics` tabela (rag_query događaji) i dnevni
+    query_metrics fajlovi RAGAnalytics-a. Upiti prolaze kroz encode i
+    pretragu (puni retrieval cache), a opciono se dohvataju i keširani
+    odgovori (L2 -> Redis -> L1).
+    """
+
+    def __init__(self, db_manager, rag_service, top_n: int = 50, timeout: float = 120.0,
+                 analytics_dir: str = "data/analytics"):
+        self.db_manager = db_manager
+        self.rag_service = rag_service
+        self.top_n = top_n
+        self.timeout = timeout
+        self.analytics_dir = analytics_dir
+
+        self.state = "pending"  # pending | warming | ready
+        self.stats: Dict[str, Any] = {
+            'queries_found': 0,
+            'queries_warmed': 0,
+            'answers_warmed': 0,
+            'errors': 0,
+            'duration': None,
+            'timed_out': False
+        }
+
+    def is_ready(self) -> bool:
+        return self.state == "ready"
+
+    def log_query(self, query: str, event_type: str = "rag_query", session_id: Optional[str] = None):
+        """Zabeleži upit u analytics tabelu (izvor za sledeći warm-up)"""
+        try:
+            self.db_manager.log_event(event_type, {"query": query}, session_id=session_id)
+        except Exception as e:
+            logger.warning(f"Greška pri logovanju upita za warm-up: {e}")
+
+    def collect_queries(self) -> List[str]:
+        """Najčešći nedavni upiti (normalizovani) iz analytics izvora"""
+        counter: Counter = Counter()
+        originals: Dict[str, str] = {}
+
+        def add(query: Any):
+            if not isinstance(query, str) or not query.strip():
+                return
+            normalized = " ".join(query.lower().split())
+            counter[normalized] += 1
+            originals.setdefault(normalized, query)
+
+        for row in self.db_manager.get_analytics(event_type="rag_query", limit=self.top_n * 20):
+            try:
+                add(json.loads(row.get('event_data') or "{}").get('query'))
+            except ValueError:
+                continue
+
+        # RAGAnalytics dnevni fajlovi (poslednja 3 dana)
+        files = sorted(glob.glob(os.path.join(self.analytics_dir, "query_metrics_*.json")))[-3:]
+        for path in files:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for metrics in json.load(f):
+                        add(metrics.get('query_text'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Greška pri čitanju {path}: {e}")
+
+        return [originals[normalized] for normalized, _ in counter.most_common(self.top_n)]
+
+    def _touch_index(self):
+        """Model i indeks u memoriju: jedan encode i pretraga preko celog indeksa"""
+        model = self.rag_service.embedding_model
+        index = self.rag_service.vector_index
+        if model is None:
+            return
+        vector = np.asarray(model.encode("warm-up"), dtype=np.float32).reshape(1, -1)
+        if index is not None and index.ntotal > 0:
+            # Flat indeks pri pretrazi čita sve vektore - stranice su posle toga u memoriji
+            index.search(vector, min(10, index.ntotal))
+
+    async def run(self, retrieve: Callable[[str], Awaitable[Any]],
+                  warm_answer: Optional[Callable[[str], Awaitable[bool]]] = None):
+        """
+        Izvrši warm-up i označi instancu kao spremnu
+
+        Args:
+            retrieve: Pretraga sa retrieval cache-om (npr. main.retrieve_chunks)
+            warm_answer: Dohvatanje keširanog odgovora za upit (opciono)
+        """
+        self.state = "warming"
+        start = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._warm(loop, retrieve, warm_answer), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timed_out'] = True
+            logger.warning(f"Warm-up prekinut posle {self.timeout}s")
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Greška pri warm-up-u: {e}")
+        finally:
+            # Instanca je spremna i ako warm-up nije uspeo - samo je hladnija
+            self.stats['duration'] = round(time.time() - start, 2)
+            self.state = "ready"
+            logger.info(f"Warm-up završen za {self.stats['duration']}s: "
+                        f"{self.stats['queries_warmed']} upita, {self.stats['answers_warmed']} odgovora")
+
+    async def _warm(self, loop, retrieve, warm_answer):
+        await loop.run_in_executor(None, self._touch_index)
+
+        queries = await loop.run_in_executor(None, self.collect_queries)
+        self.stats['queries_found'] = len(queries)
+
+        for query in queries:
+            try:
+                await retrieve(query)
+                self.stats['queries_warmed'] += 1
+                if warm_answer is not None and await warm_answer(query):
+                    self.stats['answers_warmed'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"Warm-up upita nije uspeo: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {'state': self.state, 'ready': self.is_ready(), **self.stats}
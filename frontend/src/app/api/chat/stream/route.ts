@@ -10,7 +10,9 @@ export async function POST(request: NextRequest) {
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(body)
+      body: JSON.stringify(body),
+      // Prekid klijenta prekida i backend stream (i generisanje)
+      signal: request.signal
     });
 
     if (!response.ok) {
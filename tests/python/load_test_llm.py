@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Load test chat endpoint-a uz mock LLM server
+
+Meri latenciju /chat, /chat/stream i /chat/rag pri zadatoj konkurentnosti.
+Kada backend koristi mock LLM (OPENAI_BASE_URL), razlika između izmerene
+latencije i podešenog TTFT + tokena/s je overhead samog backend-a.
+
+Pokretanje:
+    python tests/python/mock_llm_server.py --ttft 0.3 --tokens-per-second 50 &
+    OPENAI_BASE_URL=http://localhost:8090/v1 OPENAI_API_KEY=mock \\
+        python -m uvicorn app.main:app --port 8001 &
+    python tests/python/load_test_llm.py --endpoint /chat/stream --concurrency 100 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+import aiohttp
+
+BASE_URL = "http://localhost:8001"
+MOCK_URL = "http://localhost:8090"
+
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+class LoadTester:
+    def __init__(self, base_url: str, endpoint: str, unique: bool):
+        self.base_url = base_url
+        self.endpoint = endpoint
+        self.unique = unique
+        self.results = []
+
+    def payload(self, i: int) -> dict:
+        # Jedinstven sadržaj zaobilazi cache - meri se ceo put do LLM-a
+        content = "Objasni fotosintezu"
+        if self.unique:
+            content += f" ({i}-{uuid.uuid4().hex[:8]})"
+        if self.endpoint == "/chat/rag":
+            return {"query": content}
+        return {"content": content, "user_id": "load_test"}
+
+    async def request(self, session: aiohttp.ClientSession, i: int):
+        start = time.perf_counter()
+        first_chunk = None
+        chunks = 0
+        try:
+            async with session.post(f"{self.base_url}{self.endpoint}", json=self.payload(i)) as response:
+                if self.endpoint == "/chat/stream":
+                    async for line in response.content:
+                        if line.startswith(b"data: ") and b'"chunk"' in line:
+                            if first_chunk is None:
+                                first_chunk = time.perf_counter() - start
+                            chunks += 1
+                        elif b'"error"' in line:
+                            raise RuntimeError(line.decode().strip())
+                else:
+                    await response.read()
+                ok = response.status < 400
+                status = response.status
+        except Exception as e:
+            ok, status = False, 0
+            print(f"❌ Zahtev {i}: {e}")
+
+        self.results.append({
+            "success": ok,
+            "status_code": status,
+            "latency": time.perf_counter() - start,
+            "ttft": first_chunk,
+            "chunks": chunks
+        })
+
+    async def run(self, total: int, concurrency: int) -> float:
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        timeout = aiohttp.ClientTimeout(total=300)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def limited(i: int):
+                async with semaphore:
+                    await self.request(session, i)
+
+            start = time.perf_counter()
+            await asyncio.gather(*[limited(i) for i in range(total)])
+            return time.perf_counter() - start
+
+    def summary(self, duration: float) -> dict:
+        latencies = [r["latency"] for r in self.results if r["success"]]
+        ttfts = [r["ttft"] for r in self.results if r["ttft"] is not None]
+        successful = len(latencies)
+        return {
+            "endpoint": self.endpoint,
+            "requests": len(self.results),
+            "successful": successful,
+            "errors": len(self.results) - successful,
+            "duration": round(duration, 2),
+            "throughput_rps": round(successful / duration, 2) if duration else 0.0,
+            "latency_p50": round(percentile(latencies, 50), 3),
+            "latency_p95": round(percentile(latencies, 95), 3),
+            "latency_p99": round(percentile(latencies, 99), 3),
+            "ttft_p50": round(percentile(ttfts, 50), 3) if ttfts else None,
+            "ttft_p95": round(percentile(ttfts, 95), 3) if ttfts else None
+        }
+
+async def fetch_json(url: str):
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            async with session.get(url) as response:
+                return await response.json()
+    except Exception:
+        return None
+
+async def main(args):
+    print("🚀 AcAIA LLM Load Test")
+    print("=" * 50)
+    print(f"🎯 Target: {args.base_url}{args.endpoint}")
+    print(f"⚙️ Zahteva: {args.requests}, konkurentnost: {args.concurrency}")
+
+    mock = await fetch_json(f"{args.mock_url}/mock/stats")
+    if mock:
+        print(f"🤖 Mock LLM: {mock['settings']}")
+    print()
+
+    tester = LoadTester(args.base_url, args.endpoint, unique=not args.cached)
+    duration = await tester.run(args.requests, args.concurrency)
+    summary = tester.summary(duration)
+
+    print("📊 Rezultati:")
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+
+    overview = await fetch_json(f"{args.base_url}/performance/overview")
+    mock = await fetch_json(f"{args.mock_url}/mock/stats")
+    if mock:
+        print(f"🤖 Mock LLM statistike: {mock['stats']}")
+
+    filename = f"llm_load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(filename, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "summary": summary,
+            "backend": overview.get("data") if overview else None,
+            "mock_llm": mock,
+            "results": tester.results
+        }, f, indent=2)
+    print(f"\n💾 Rezultati sačuvani u: {filename}")
+
+    return summary["errors"] == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test chat endpoint-a")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--mock-url", default=MOCK_URL)
+    parser.add_argument("--endpoint", default="/chat", choices=["/chat", "/chat/stream", "/chat/rag"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cached", action="store_true", help="Isti upit za sve zahteve (meri cache put)")
+
+    try:
+        success = asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("\n⏹️ Test prekinut od strane korisnika")
+        success = False
+
+    raise SystemExit(0 if success else 1)
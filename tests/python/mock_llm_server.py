@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Mock LLM server - lokalna zamena za OpenAI chat-completions API
+
+Služi za merenje overhead-a i granica konkurentnosti backend-a bez mreže i
+bez troška. Podržava streaming (SSE) i obične odgovore, podesiv
+time-to-first-token, brzinu generisanja (tokena/s) i ubacivanje grešaka.
+
+Pokretanje:
+    python tests/python/mock_llm_server.py --port 8090 --ttft 0.3 --tokens-per-second 50
+
+Backend usmeren na mock server:
+    OPENAI_BASE_URL=http://localhost:8090/v1 OPENAI_API_KEY=mock \\
+        python -m uvicorn app.main:app --port 8001
+
+Parametri se mogu menjati i u toku rada preko POST /mock/config, a
+statistike (zahtevi, maksimalna konkurentnost, prekinuti stream-ovi) su na
+GET /mock/stats.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import Body, FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Podrazumevana podešavanja (env promenljive ili argumenti komandne linije)
+settings = {
+    "ttft": float(os.getenv("MOCK_LLM_TTFT", "0.3")),  # Sekunde do prvog tokena
+    "tokens_per_second": float(os.getenv("MOCK_LLM_TOKENS_PER_SECOND", "50")),
+    "response_tokens": int(os.getenv("MOCK_LLM_RESPONSE_TOKENS", "200")),
+    "error_rate": float(os.getenv("MOCK_LLM_ERROR_RATE", "0")),  # Udeo zahteva koji vraćaju grešku
+    "error_status": int(os.getenv("MOCK_LLM_ERROR_STATUS", "500")),  # 500, 429, 503...
+    "stream_error_rate": float(os.getenv("MOCK_LLM_STREAM_ERROR_RATE", "0")),  # Prekid usred stream-a
+    "jitter": float(os.getenv("MOCK_LLM_JITTER", "0.1"))  # Relativno odstupanje kašnjenja
+}
+
+stats = {
+    "requests": 0,
+    "streaming_requests": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "injected_errors": 0,
+    "injected_stream_errors": 0,
+    "cancelled_streams": 0,
+    "completed": 0,
+    "tokens_generated": 0
+}
+
+WORDS = (
+    "fotosinteza je proces u kojem biljke koriste svetlost da bi od ugljen dioksida "
+    "i vode stvorile glukozu i kiseonik ovaj proces se odvija u hloroplastima a "
+    "hlorofil apsorbuje svetlost potrebnu za reakcije"
+).split()
+
+app = FastAPI(title="Mock LLM Server")
+
+def delay(seconds: float) -> float:
+    """Kašnjenje sa nasumičnim odstupanjem (jitter)"""
+    jitter = settings["jitter"]
+    return max(0.0, seconds * random.uniform(1 - jitter, 1 + jitter))
+
+def response_tokens(max_tokens) -> list:
+    count = settings["response_tokens"]
+    if max_tokens:
+        count = min(count, int(max_tokens))
+    return [WORDS[i % len(WORDS)] + " " for i in range(count)]
+
+def token_interval() -> float:
+    tps = settings["tokens_per_second"]
+    return 1.0 / tps if tps > 0 else 0.0
+
+def error_response(status: int) -> JSONResponse:
+    """Greška u formatu OpenAI API-ja"""
+    error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": "Mock LLM: ubačena greška", "type": error_type, "code": error_type}}
+    )
+
+class InFlight:
+    """Brojač istovremenih zahteva"""
+
+    def __enter__(self):
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+    def __exit__(self, *exc):
+        stats["in_flight"] -= 1
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "settings": settings}
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "gpt-4", "object": "model", "owned_by": "mock"}]}
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request, payload: dict = Body(...)):
+    stats["requests"] += 1
+    model = payload.get("model", "gpt-4")
+
+    if random.random() < settings["error_rate"]:
+        stats["injected_errors"] += 1
+        await asyncio.sleep(delay(settings["ttft"]))
+        return error_response(settings["error_status"])
+
+    tokens = response_tokens(payload.get("max_tokens"))
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+
+    if payload.get("stream"):
+        stats["streaming_requests"] += 1
+        return StreamingResponse(
+            stream_completion(completion_id, created, model, tokens),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+
+    with InFlight():
+        await asyncio.sleep(delay(settings["ttft"]) + delay(token_interval() * len(tokens)))
+
+    stats["completed"] += 1
+    stats["tokens_generated"] += len(tokens)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(tokens).strip()},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens)
+        }
+    }
+
+async def stream_completion(completion_id: str, created: int, model: str, tokens: list):
+    """SSE chunk-ovi u formatu chat.completion.chunk, završetak sa [DONE]"""
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        return f"data: {json.dumps(data)}\n\n"
+
+    # Prekid usred stream-a (posle nasumičnog broja tokena)
+    fail_at = random.randint(1, max(1, len(tokens) - 1)) if random.random() < settings["stream_error_rate"] else None
+
+    with InFlight():
+        try:
+            await asyncio.sleep(delay(settings["ttft"]))
+            yield chunk({"role": "assistant", "content": ""})
+
+            for i, token in enumerate(tokens):
+                if fail_at is not None and i == fail_at:
+                    stats["injected_stream_errors"] += 1
+                    raise RuntimeError("Mock LLM: ubačen prekid stream-a")
+                if i:
+                    await asyncio.sleep(delay(token_interval()))
+                stats["tokens_generated"] += 1
+                yield chunk({"content": token})
+
+            yield chunk({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+            stats["completed"] += 1
+        except asyncio.CancelledError:
+            # Klijent (backend) je zatvorio konekciju pre kraja
+            stats["cancelled_streams"] += 1
+            raise
+
+@app.get("/mock/stats")
+async def get_stats():
+    return {"stats": stats, "settings": settings}
+
+@app.post("/mock/config")
+async def update_config(values: dict = Body(...)):
+    """Izmeni podešavanja u toku rada (npr. {"ttft": 1.0, "error_rate": 0.1})"""
+    for key, value in values.items():
+        if key in settings:
+            settings[key] = type(settings[key])(value)
+    return {"settings": settings}
+
+@app.post("/mock/reset")
+async def reset_stats():
+    for key in stats:
+        stats[key] = 0
+    return {"stats": stats}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mock LLM server (OpenAI chat-completions)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--ttft", type=float, help="Sekunde do prvog tokena")
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--response-tokens", type=int)
+    parser.add_argument("--error-rate", type=float, help="Udeo zahteva sa greškom (0-1)")
+    parser.add_argument("--error-status", type=int, help="HTTP status ubačene greške")
+    parser.add_argument("--stream-error-rate", type=float, help="Udeo stream-ova prekinutih usred odgovora")
+    parser.add_argument("--jitter", type=float)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    for key in settings:
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+
+    print(f"🤖 Mock LLM server na http://{args.host}:{args.port}/v1")
+    print(f"⚙️ Podešavanja: {settings}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test skripta za admission control (upload/OCR ograničenja)
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from app.admission_control import AdmissionController
+from app.error_handler import RateLimitError
+
+async def test_global_limit():
+    """Test globalnog ograničenja istovremenih operacija"""
+    print("🧪 Testiranje globalnog ograničenja...")
+
+    controller = AdmissionController(max_concurrent=2, max_per_user=10, max_queue=10, queue_timeout=5)
+    peak = 0
+
+    async def work(user_id: str):
+        nonlocal peak
+        async with controller.slot(user_id):
+            peak = max(peak, controller.get_stats()['active'])
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*[work(f"user_{i}") for i in range(6)])
+
+    print(f"✅ Maksimalno istovremeno: {peak} ({'PRAVILNO' if peak <= 2 else 'GREŠKA'})")
+    stats = controller.get_stats()
+    print(f"   Propušteno: {stats['admitted']}, max dubina reda: {stats['max_queue_depth']}")
+    print()
+    return peak <= 2
+
+async def test_per_user_limit():
+    """Test ograničenja po korisniku"""
+    print("🧪 Testiranje ograničenja po korisniku...")
+
+    controller = AdmissionController(max_concurrent=10, max_per_user=1, max_queue=10, queue_timeout=5)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with controller.slot("isti_korisnik"):
+            peak = max(peak, controller.get_stats()['active'])
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*[work() for _ in range(3)])
+
+    print(f"✅ Maksimalno istovremeno za korisnika: {peak} ({'PRAVILNO' if peak == 1 else 'GREŠKA'})")
+    print()
+    return peak == 1
+
+async def test_queue_full_rejection():
+    """Test odbijanja kada je red čekanja pun"""
+    print("🧪 Testiranje odbijanja pri punom redu...")
+
+    controller = AdmissionController(max_concurrent=1, max_per_user=1, max_queue=1, queue_timeout=5)
+    rejected = []
+
+    async def work(user_id: str):
+        try:
+            async with controller.slot(user_id):
+                await asyncio.sleep(0.1)
+        except RateLimitError as e:
+            rejected.append(e.retry_after)
+
+    await asyncio.gather(*[work(f"user_{i}") for i in range(4)])
+
+    success = len(rejected) == 2 and all(r >= 1 for r in rejected)
+    print(f"✅ Odbijeno zahteva: {len(rejected)} ({'PRAVILNO' if success else 'GREŠKA'})")
+    print(f"   Retry-After vrednosti: {rejected}")
+    print()
+    return success
+
+async def test_queue_timeout():
+    """Test isteka vremena čekanja u redu"""
+    print("🧪 Testiranje isteka vremena čekanja...")
+
+    controller = AdmissionController(max_concurrent=1, max_per_user=1, max_queue=5, queue_timeout=0.05)
+
+    async def slow():
+        async with controller.slot("user_a"):
+            await asyncio.sleep(0.3)
+
+    async def waiting():
+        await asyncio.sleep(0.01)
+        try:
+            async with controller.slot("user_b"):
+                return False
+        except RateLimitError:
+            return True
+
+    start = time.time()
+    _, timed_out = await asyncio.gather(slow(), waiting())
+
+    stats = controller.get_stats()
+    print(f"✅ Timeout zahteva u redu: {'PRAVILNO' if timed_out else 'GREŠKA'} ({time.time() - start:.2f}s)")
+    print(f"   rejected_timeout: {stats['rejected_timeout']}, queue_depth: {stats['queue_depth']}")
+    print()
+    return timed_out and stats['queue_depth'] == 0
+
+async def main():
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE ADMISSION CONTROL TESTOVA")
+    print("=" * 50)
+
+    results = [
+        await test_global_limit(),
+        await test_per_user_limit(),
+        await test_queue_full_rejection(),
+        await test_queue_timeout()
+    ]
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+
+    if success:
+        print("✅ Admission control testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ Admission control testovi su neuspešni!")
+        sys.exit(1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test skripta za binarni format cache vrednosti (CacheCodec)
+"""
+
+import json
+import os
+import sys
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from app.cache_codec import (
+    CacheCodec, FORMAT_VERSION, MSGPACK_AVAILABLE, ZSTD_AVAILABLE,
+    SERIALIZER_JSON, SERIALIZER_MSGPACK, COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_ZSTD
+)
+
+VALUE = {
+    "response": "Fotosinteza je proces u kojem biljke koriste svetlost. " * 60,
+    "sources": [{"title": "Biologija", "score": 0.87}, {"title": "Hemija", "score": 0.42}],
+    "cached": True,
+    "tokens": 1234,
+    "metadata": None
+}
+
+EXPECTED_SERIALIZER = {
+    "json": SERIALIZER_JSON,
+    "msgpack": SERIALIZER_MSGPACK if MSGPACK_AVAILABLE else SERIALIZER_JSON
+}
+EXPECTED_COMPRESSION = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD if ZSTD_AVAILABLE else COMPRESSION_ZLIB
+}
+
+def test_round_trip() -> bool:
+    """Svaka kombinacija serializer x kompresija vraća istu vrednost"""
+    print("🧪 Testiranje round trip-a (msgpack/JSON x zstd/zlib/none)...")
+    if not MSGPACK_AVAILABLE:
+        print("⚠️ msgpack nije instaliran - proverava se fallback na JSON")
+    if not ZSTD_AVAILABLE:
+        print("⚠️ zstandard nije instaliran - proverava se fallback na zlib")
+
+    # Čitač sa drugačijim podešavanjima - format mora da se prepozna iz zaglavlja
+    reader = CacheCodec(serializer="json", compression="none")
+    ok = True
+    for serializer in ("msgpack", "json"):
+        for compression in ("zstd", "zlib", "none"):
+            codec = CacheCodec(serializer=serializer, compression=compression, threshold=64)
+            data = codec.encode(VALUE, "ai_response")
+            flags = data[1]
+            header_ok = (
+                data[0] == FORMAT_VERSION
+                and flags >> 4 == EXPECTED_SERIALIZER[serializer]
+                and flags & 0x0F == EXPECTED_COMPRESSION[compression]
+            )
+            case_ok = header_ok and codec.decode(data) == VALUE and reader.decode(data) == VALUE
+            ok = ok and case_ok
+            print(f"  {serializer}/{compression}: {len(data)} bajtova ({'PRAVILNO' if case_ok else 'GREŠKA'})")
+
+    print(f"✅ Round trip: {'PRAVILNO' if ok else 'GREŠKA'}")
+    print()
+    return ok
+
+def test_legacy_json() -> bool:
+    """Stari JSON unosi bez zaglavlja (str i bytes) se i dalje čitaju"""
+    print("🧪 Testiranje starih JSON unosa bez zaglavlja...")
+
+    codec = CacheCodec()
+    legacy = json.dumps(VALUE)
+    ok = (
+        codec.decode(legacy) == VALUE
+        and codec.decode(legacy.encode("utf-8")) == VALUE
+        and codec.decode(b'"tekst"') == "tekst"
+        and codec.decode(b"[1, 2, 3]") == [1, 2, 3]
+    )
+    print(f"✅ Stari JSON unosi: {'PRAVILNO' if ok else 'GREŠKA'}")
+    print()
+    return ok
+
+def test_below_threshold() -> bool:
+    """Vrednosti ispod praga se ne kompresuju"""
+    print("🧪 Testiranje vrednosti ispod praga kompresije...")
+
+    ok = True
+    for compression in ("zstd", "zlib"):
+        codec = CacheCodec(compression=compression, threshold=1024)
+        small = {"response": "Kratak odgovor"}
+        data = codec.encode(small, "ai_response")
+        stats = codec.get_stats()['namespaces']['ai_response']
+        case_ok = data[1] & 0x0F == COMPRESSION_NONE and codec.decode(data) == small and stats['compressed_writes'] == 0
+        ok = ok and case_ok
+        print(f"  {compression}: {len(data)} bajtova, nekompresovano ({'PRAVILNO' if case_ok else 'GREŠKA'})")
+
+    print(f"✅ Ispod praga: {'PRAVILNO' if ok else 'GREŠKA'}")
+    print()
+    return ok
+
+def main() -> bool:
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE CACHE CODEC TESTOVA")
+    print("=" * 50)
+
+    results = [
+        test_round_trip(),
+        test_legacy_json(),
+        test_below_threshold()
+    ]
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = main()
+
+    if success:
+        print("✅ Cache codec testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ Cache codec testovi su neuspešni!")
+        sys.exit(1)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Test skripta za circuit breaker i lokalni (in-memory) cache backend
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+# Bez SQLite L2 nivoa u testu
+os.environ.setdefault("CACHE_L2_ENABLED", "false")
+
+from app.circuit_breaker import CircuitBreaker
+from app.cache_backends import InMemoryRedis, ResilientRedis
+from app.cache_manager import CacheManager
+
+class DownRedis:
+    """Redis koji ne odgovara (svaki poziv traje do timeout-a)"""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.calls = 0
+        self.down = True
+        self.hang = False
+        self.pipeline_error = False
+
+    async def ping(self):
+        if self.down:
+            raise ConnectionError("Connection refused")
+        return True
+
+    async def get(self, key):
+        self.calls += 1
+        if self.hang:
+            await asyncio.sleep(10)
+        if self.down:
+            await asyncio.sleep(self.delay)
+            raise ConnectionError("Connection refused")
+        return "iz-redis-a"
+
+    async def setex(self, key, ttl, value):
+        self.calls += 1
+        if self.down:
+            await asyncio.sleep(self.delay)
+            raise ConnectionError("Connection refused")
+        return True
+
+async def test_memory_backend():
+    """Test osnovnih komandi in-memory backend-a"""
+    print("🧪 Testiranje in-memory backend-a...")
+
+    backend = InMemoryRedis(max_keys=10)
+    await backend.setex("a", 10, "1")
+    await backend.set("b", "2")
+    await backend.setex("kratko", 0.05, "3")
+    values = await backend.mget(["a", "b", "nema"])
+
+    async with backend.pipeline(transaction=False) as pipe:
+        pipe.setex("c", 10, "4")
+        pipe.get("a")
+        results = await pipe.execute()
+
+    await asyncio.sleep(0.1)
+    expired = await backend.get("kratko")
+
+    keys = []
+    cursor = 0
+    while True:
+        cursor, batch = await backend.scan(cursor=cursor, match="*", count=1)
+        keys.extend(batch)
+        if cursor == 0:
+            break
+
+    ok = values == ["1", "2", None] and results == [True, "1"] and expired is None and sorted(keys) == ["a", "b", "c"]
+    print(f"✅ MGET/pipeline/TTL/SCAN: {'PRAVILNO' if ok else 'GREŠKA'} (ključevi: {sorted(keys)})")
+    print()
+    return ok
+
+async def test_breaker_fails_fast():
+    """Test da otvoren breaker preskače Redis i koristi lokalni backend"""
+    print("🧪 Testiranje fail-fast ponašanja...")
+
+    primary = DownRedis(delay=0.2)
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    client = ResilientRedis(primary, InMemoryRedis(), breaker)
+
+    for _ in range(2):
+        await client.setex("kljuc", 10, "vrednost")
+
+    start = time.time()
+    value = await client.get("kljuc")
+    elapsed = time.time() - start
+
+    ok = breaker.get_state()['state'] == "open" and value == "vrednost" and elapsed < 0.05 and primary.calls == 2
+    print(f"✅ Breaker: {breaker.get_state()['state']}, vrednost iz fallback-a: {value}, vreme: {elapsed * 1000:.1f}ms")
+    print(f"   Pozivi ka Redis-u: {primary.calls} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_breaker_recovery():
+    """Test oporavka (half-open probni poziv zatvara breaker)"""
+    print("🧪 Testiranje oporavka Redis-a...")
+
+    primary = DownRedis(delay=0.0)
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.1)
+    client = ResilientRedis(primary, InMemoryRedis(), breaker)
+
+    await client.get("x")
+    opened = breaker.get_state()['state'] == "open"
+
+    primary.down = False
+    await asyncio.sleep(0.15)
+    value = await client.get("x")
+
+    ok = opened and breaker.get_state()['state'] == "closed" and value == "iz-redis-a"
+    print(f"✅ Stanje posle oporavka: {breaker.get_state()['state']} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+def pipeline_factory(primary: DownRedis):
+    """Pipeline čiji execute baca grešku komande (ne konekcije)"""
+    class Pipeline:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def get(self, key):
+            return self
+
+        async def execute(self):
+            raise ValueError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+    return lambda transaction=False: Pipeline()
+
+async def test_cancelled_probe():
+    """Test da prekinut probni poziv ne ostavlja breaker zauvek u half_open stanju"""
+    print("🧪 Testiranje prekinutog probnog poziva...")
+
+    primary = DownRedis(delay=0.0)
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    client = ResilientRedis(primary, InMemoryRedis(), breaker)
+
+    await client.get("x")
+    await asyncio.sleep(0.1)
+
+    # Probni poziv visi i biva otkazan (npr. klijent prekinuo zahtev)
+    primary.down = False
+    primary.hang = True
+    probe = asyncio.create_task(client.get("x"))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    try:
+        await probe
+    except asyncio.CancelledError:
+        pass
+
+    primary.hang = False
+    value = await client.get("x")
+
+    ok = value == "iz-redis-a" and breaker.get_state()['state'] == "closed"
+    print(f"✅ Vrednost: {value}, stanje: {breaker.get_state()['state']} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_pipeline_command_error_probe():
+    """Test da greška komande u probnom pipeline-u ne blokira sledeće probe"""
+    print("🧪 Testiranje greške komande u probnom pipeline-u...")
+
+    primary = DownRedis(delay=0.0)
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    client = ResilientRedis(primary, InMemoryRedis(), breaker)
+
+    await client.get("x")
+    await asyncio.sleep(0.1)
+    primary.down = False
+    primary.pipeline = pipeline_factory(primary)
+
+    raised = False
+    try:
+        async with client.pipeline() as pipe:
+            pipe.get("x")
+            await pipe.execute()
+    except ValueError:
+        raised = True
+
+    value = await client.get("x")
+    ok = raised and value == "iz-redis-a" and breaker.get_state()['state'] == "closed"
+    print(f"✅ Greška prosleđena: {raised}, stanje: {breaker.get_state()['state']} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_startup_ping():
+    """Test da neuspeo ping pri startup-u odmah prebacuje na lokalni backend"""
+    print("🧪 Testiranje ping-a kada Redis ne radi...")
+
+    manager = CacheManager()
+    manager.backend = "redis"
+    manager.redis.primary = DownRedis(delay=0.0)
+
+    available = await manager.ping()
+    ok = available is False and not manager.is_available() and manager.breaker.get_state()['state'] == "open"
+    print(f"✅ ping: {available}, breaker: {manager.breaker.get_state()['state']} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def main():
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE CACHE FALLBACK TESTOVA")
+    print("=" * 50)
+
+    results = [
+        await test_memory_backend(),
+        await test_breaker_fails_fast(),
+        await test_breaker_recovery(),
+        await test_cancelled_probe(),
+        await test_pipeline_command_error_probe(),
+        await test_startup_ping()
+    ]
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+
+    if success:
+        print("✅ Cache fallback testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ Cache fallback testovi su neuspešni!")
+        sys.exit(1)
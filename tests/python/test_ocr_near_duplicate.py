@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test skripta za približna poklapanja u OCR cache-u (perceptualni heševi)
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from app.ocr_service import OCRService
+
+WORDS = "analiza sistem funkcija integral granica vektor matrica izvod jednacina teorema dokaz skup broj".split()
+LANGUAGES = ['srp', 'eng']
+
+def create_page(seed: int) -> np.ndarray:
+    """Stranica sa istim rasporedom (naslov + 30 redova), različitim tekstom"""
+    rng = random.Random(seed)
+    page = np.full((1400, 1000), 255, np.uint8)
+    cv2.putText(page, "Poglavlje 3", (80, 120), cv2.FONT_HERSHEY_SIMPLEX, 1.6, 0, 3)
+    y = 200
+    for _ in range(30):
+        x = 80
+        while True:
+            word = rng.choice(WORDS)
+            (width, _), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)
+            if x + width > 920:
+                break
+            cv2.putText(page, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+            x += width + 14
+        y += 38
+    return page
+
+def encode(image: np.ndarray, ext: str = ".png", quality: int = 95) -> bytes:
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality] if ext == ".jpg" else []
+    return cv2.imencode(ext, image, params)[1].tobytes()
+
+def store_page(ocr: OCRService, image_bytes: bytes, text: str):
+    cache_key = ocr._get_cache_key(image_bytes, LANGUAGES)
+    hashes = ocr._compute_perceptual_hashes(image_bytes)
+    ocr._save_to_cache(cache_key, {'text': text, 'success': True}, hashes, LANGUAGES)
+
+def lookup(ocr: OCRService, image_bytes: bytes):
+    cache_key = ocr._get_cache_key(image_bytes, LANGUAGES)
+    result, _ = ocr._lookup_cache(image_bytes, cache_key, LANGUAGES)
+    return result
+
+def test_distinct_pages_do_not_match(ocr: OCRService, pages: list) -> bool:
+    """Različite stranice istog rasporeda ne smeju da dele OCR tekst"""
+    print("🧪 Testiranje različitih stranica istog rasporeda...")
+
+    # U cache idu parne stranice, traže se neparne
+    for i in range(0, len(pages), 2):
+        store_page(ocr, encode(pages[i]), f"stranica {i}")
+
+    wrong = []
+    for i in range(1, len(pages), 2):
+        result = lookup(ocr, encode(pages[i]))
+        if result is not None:
+            wrong.append((i, result.get('text')))
+
+    ok = not wrong
+    rejected = ocr.stats['hash_lookups']['perceptual']['rejected']
+    print(f"✅ Pogrešnih poklapanja: {len(wrong)}, odbijenih kandidata: {rejected} "
+          f"({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+def test_resaved_page_matches(ocr: OCRService, pages: list) -> bool:
+    """Ista stranica sačuvana kao JPEG treba da vrati keširan tekst"""
+    print("🧪 Testiranje ponovo sačuvane iste stranice...")
+
+    hits = 0
+    checked = 0
+    for i in range(0, len(pages), 2):
+        result = lookup(ocr, encode(pages[i], ".jpg", 80))
+        checked += 1
+        if result is not None and result.get('text') == f"stranica {i}":
+            hits += 1
+
+    ok = hits == checked
+    print(f"✅ Pogođeno: {hits}/{checked} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+def test_different_dimensions_do_not_match(ocr: OCRService, pages: list) -> bool:
+    """Isečena stranica (drugi odnos stranica) ne koristi keširan tekst"""
+    print("🧪 Testiranje stranice drugih dimenzija...")
+
+    cropped = pages[0][:1000, :]
+    result = lookup(ocr, encode(cropped))
+    ok = result is None
+    print(f"✅ Poklapanje za isečenu stranicu: {result is not None} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+def main() -> bool:
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE OCR NEAR-DUPLICATE TESTOVA")
+    print("=" * 50)
+
+    cache_dir = tempfile.mkdtemp(prefix="ocr_near_dup_")
+    try:
+        ocr = OCRService(cache_dir=cache_dir)
+        pages = [create_page(seed) for seed in range(20)]
+
+        results = [
+            test_distinct_pages_do_not_match(ocr, pages),
+            test_resaved_page_matches(ocr, pages),
+            test_different_dimensions_do_not_match(ocr, pages)
+        ]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = main()
+
+    if success:
+        print("✅ OCR near-duplicate testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ OCR near-duplicate testovi su neuspešni!")
+        sys.exit(1)
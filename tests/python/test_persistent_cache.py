@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test skripta za SQLite L2 cache nivo (PersistentCacheTier)
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from app.database_manager import DatabaseManager
+from app.persistent_cache import PersistentCacheTier
+
+NAMESPACES = ["ai_response", "embedding"]
+
+class SlowDatabase(DatabaseManager):
+    """Baza kod koje batch upis traje (širi prozor za trku flush/delete)"""
+
+    def set_cache_many(self, entries):
+        time.sleep(0.2)
+        return super().set_cache_many(entries)
+
+def create_tier(db: DatabaseManager, max_bytes: int = 10 * 1024 * 1024) -> PersistentCacheTier:
+    return PersistentCacheTier(db, NAMESPACES, max_bytes=max_bytes, flush_interval=60, batch_size=1000)
+
+async def test_restart_survival(db_path: str) -> bool:
+    """Upisane vrednosti su dostupne novoj instanci nad istom bazom"""
+    print("🧪 Testiranje opstanka posle restarta...")
+
+    tier = create_tier(DatabaseManager(db_path))
+    tier.put("ai_response:pitanje", b"odgovor", 3600)
+    await tier.stop()
+
+    restarted = create_tier(DatabaseManager(db_path))
+    entry = await restarted.get("ai_response:pitanje")
+    ok = entry is not None and entry[0] == b"odgovor" and 3500 < entry[1] <= 3600
+    print(f"✅ Posle restarta: {entry[0] if entry else None} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_budget_eviction(db_path: str) -> bool:
+    """Sweep drži tabelu ispod budžeta, prvo izbacuje ono što najranije ističe"""
+    print("🧪 Testiranje budžeta veličine...")
+
+    db = DatabaseManager(db_path)
+    tier = create_tier(db, max_bytes=5000)
+    for i in range(10):
+        tier.put(f"embedding:{i}", bytes(1000), 1000 + i * 100)
+    await tier.flush()
+    await tier.sweep()
+
+    remaining = [i for i in range(10) if await tier.get(f"embedding:{i}") is not None]
+    with db.get_connection() as conn:
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM cache").fetchone()[0]
+
+    ok = total <= 5000 and tier.stats['evicted_budget'] > 0 and remaining == list(range(10 - len(remaining), 10))
+    print(f"✅ Ukupno bajtova: {total}, preostali ključevi: {remaining} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_delete(db_path: str) -> bool:
+    """Obrisan ključ ostaje obrisan i kada je brisanje zadato usred flush-a"""
+    print("🧪 Testiranje brisanja...")
+
+    tier = create_tier(SlowDatabase(db_path))
+
+    # Brisanje ključa iz bafera
+    tier.put("ai_response:bafer", b"1", 3600)
+    await tier.delete(["ai_response:bafer"])
+    buffered = await tier.get("ai_response:bafer")
+
+    # Brisanje dok batch upis traje
+    tier.put("ai_response:trka", b"2", 3600)
+    flush = asyncio.create_task(tier.flush())
+    await asyncio.sleep(0)
+    await tier.delete(["ai_response:trka"])
+    await flush
+    raced = await tier.get("ai_response:trka")
+
+    # Brisanje po prefiksu
+    tier.put("ai_response:prefiks", b"3", 3600)
+    flush = asyncio.create_task(tier.flush())
+    await asyncio.sleep(0)
+    await tier.clear("ai_response:")
+    await flush
+    cleared = await tier.get("ai_response:prefiks")
+
+    ok = buffered is None and raced is None and cleared is None
+    print(f"✅ Posle brisanja - bafer: {buffered}, usred flush-a: {raced}, clear: {cleared} "
+          f"({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_buffered_ttl(db_path: str) -> bool:
+    """Vrednost iz bafera vraća preostali, a ne pun TTL"""
+    print("🧪 Testiranje TTL-a vrednosti u baferu...")
+
+    tier = create_tier(DatabaseManager(db_path))
+    tier.put("ai_response:ttl", b"x", 10)
+    tier.put("ai_response:kratko", b"y", 1)
+    await asyncio.sleep(1.1)
+
+    entry = await tier.get("ai_response:ttl")
+    expired = await tier.get("ai_response:kratko")
+    remaining = round(entry[1], 2) if entry else None
+    ok = remaining is not None and 7.5 < remaining < 9 and expired is None
+    print(f"✅ Preostali TTL: {remaining}s, istekla vrednost: {expired} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def main():
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE L2 CACHE TESTOVA")
+    print("=" * 50)
+
+    data_dir = tempfile.mkdtemp(prefix="cache_l2_")
+    try:
+        results = [
+            await test_restart_survival(os.path.join(data_dir, "restart.db")),
+            await test_budget_eviction(os.path.join(data_dir, "budget.db")),
+            await test_delete(os.path.join(data_dir, "delete.db")),
+            await test_buffered_ttl(os.path.join(data_dir, "ttl.db"))
+        ]
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+
+    if success:
+        print("✅ L2 cache testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ L2 cache testovi su neuspešni!")
+        sys.exit(1)
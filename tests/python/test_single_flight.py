@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test skripta za spajanje istovremenih identičnih zahteva (single-flight)
+"""
+
+import asyncio
+import sys
+import os
+
+# Dodaj backend direktorijum u path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from app.single_flight import SingleFlight
+
+async def test_coalescing():
+    """Test da 20 istovremenih zahteva izazove jedan poziv"""
+    print("🧪 Testiranje spajanja istovremenih zahteva...")
+
+    flights = SingleFlight()
+    calls = 0
+
+    async def expensive():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "odgovor"
+
+    results = await asyncio.gather(*[flights.do("chat:isto", expensive) for _ in range(20)])
+    shared = sum(1 for _, was_shared in results if was_shared)
+
+    ok = calls == 1 and all(value == "odgovor" for value, _ in results) and shared == 19
+    print(f"✅ Poziva: {calls}, deljenih rezultata: {shared} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_leader_cancellation():
+    """Test da prekid prvog zahteva ne prekida ostale"""
+    print("🧪 Testiranje prekida zahteva koji je pokrenuo izračunavanje...")
+
+    flights = SingleFlight()
+
+    async def expensive():
+        await asyncio.sleep(0.05)
+        return 42
+
+    leader = asyncio.create_task(flights.do("k", expensive))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("k", expensive))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    value, shared = await follower
+    ok = value == 42 and shared
+    print(f"✅ Rezultat za preostali zahtev: {value} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def test_background_refresh():
+    """Test da se osvežavanje u pozadini ne pokreće dvaput"""
+    print("🧪 Testiranje stale-while-revalidate osvežavanja...")
+
+    flights = SingleFlight()
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+
+    started = [flights.refresh("k", refresh) for _ in range(5)]
+    await asyncio.sleep(0.05)
+
+    ok = started.count(True) == 1 and calls == 1 and not flights.in_flight("k")
+    print(f"✅ Pokrenuto osvežavanja: {started.count(True)} ({'PRAVILNO' if ok else 'GREŠKA'})")
+    print()
+    return ok
+
+async def main():
+    """Glavna test funkcija"""
+    print("🚀 POKRETANJE SINGLE-FLIGHT TESTOVA")
+    print("=" * 50)
+
+    results = [
+        await test_coalescing(),
+        await test_leader_cancellation(),
+        await test_background_refresh()
+    ]
+
+    print("=" * 50)
+    print(f"📊 Uspešno: {sum(results)}/{len(results)}")
+    return all(results)
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+
+    if success:
+        print("✅ Single-flight testovi su uspešno završeni!")
+        sys.exit(0)
+    else:
+        print("❌ Single-flight testovi su neuspešni!")
+        sys.exit(1)